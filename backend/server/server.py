@@ -18,6 +18,8 @@ from backend.server.server_utils import (
 )
 
 
+from gpt_researcher.config import Config
+from gpt_researcher.scraper.governor import get_scrape_governor
 from gpt_researcher.utils.logging_config import setup_research_logging
 
 import logging
@@ -103,6 +105,13 @@ def startup_event():
 def health_check():
     return {"status": "healthy", "message": "The API is up and running."}
 
+
+@app.get("/scraper/stats")
+def scraper_stats():
+    """Queue depth and utilization of the scraping budget shared by all research tasks"""
+    # Sized from the environment if no research has created the governor yet
+    return get_scrape_governor(Config()).stats()
+
 @app.get("/")
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request, "report": None})
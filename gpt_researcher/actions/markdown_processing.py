@@ -2,6 +2,8 @@ import re
 import markdown
 from typing import List, Dict
 
+from ..utils.urls import VisitedUrls
+
 def extract_headers(markdown_text: str) -> List[Dict]:
     """
     Extract headers from markdown text.
@@ -97,12 +99,15 @@ def add_references(report_markdown: str, visited_urls: set) -> str:
 
     Args:
         report_markdown (str): The existing markdown report.
-        visited_urls (set): A set of URLs that have been visited during research.
+        visited_urls (set): A set of URLs that have been visited during research. The first
+            original URL of every page is referenced when it is a VisitedUrls.
 
     Returns:
         str: The updated markdown report with added references.
     """
     try:
+        if isinstance(visited_urls, VisitedUrls):
+            visited_urls = visited_urls.originals()
         url_markdown = "\n\n\n## References\n\n"
         url_markdown += "".join(f"- [{url}]({url})\n" for url in visited_urls)
         updated_markdown_report = report_markdown + url_markdown
@@ -1,25 +1,143 @@
+import asyncio
+import time
 import json_repair
 from ..utils.llm import create_chat_completion
 from ..prompts import generate_search_queries_prompt
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 from ..config import Config
+from ..retrievers.cache import SearchCache
+from ..utils.urls import canonicalize_url
 import logging
 
 logger = logging.getLogger(__name__)
 
-async def get_search_results(query: str, retriever: Any) -> List[Dict[str, Any]]:
+# Rank damping of reciprocal rank fusion, as in the original paper by Cormack et al.
+RRF_K = 60
+
+async def get_search_results(
+    query: str, retriever: Any, max_results: Optional[int] = None, cache: Optional[SearchCache] = None
+) -> List[Dict[str, Any]]:
     """
-    Get web search results for a given query.
+    Get web search results for a given query without blocking the event loop.
     
     Args:
         query: The search query
         retriever: The retriever instance
+        max_results: Maximum number of results, the retriever default when not set
+        cache: The search cache to serve the results from, if any
     
     Returns:
         A list of search results
     """
+    if cache:
+        return await cache.search(retriever, query, max_results)
     search_retriever = retriever(query)
-    return search_retriever.search()
+    if max_results is None:
+        return await search_retriever.asearch()
+    return await search_retriever.asearch(max_results=max_results)
+
+async def _search_retriever(
+    query: str, retriever: Any, max_results: int, timeout: float, cache: Optional[SearchCache]
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    results, status = [], "ok"
+    try:
+        search = get_search_results(query, retriever, max_results, cache)
+        results = (await asyncio.wait_for(search, timeout) if timeout else await search) or []
+    except asyncio.TimeoutError:
+        status = "timeout"
+        logger.warning(f"Retriever {retriever.__name__} timed out after {timeout}s for query: {query}")
+    except Exception as e:
+        status = "error"
+        logger.warning(f"Retriever {retriever.__name__} failed for query {query}: {e}")
+    return {
+        "retriever": retriever.__name__,
+        "results": results,
+        "status": status,
+        "latency": round(time.perf_counter() - start, 3),
+    }
+
+async def search_retrievers(
+    query: str, retrievers: List[Any], max_results: int, timeout: float = 0, cache: Optional[SearchCache] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run a search on all retrievers concurrently. A retriever that fails or does not answer
+    within the timeout contributes no results instead of holding up the others.
+
+    Args:
+        query: The search query
+        retrievers: The retriever classes
+        max_results: Maximum number of results per retriever
+        timeout: Seconds to wait for each retriever, 0 waits indefinitely
+        cache: The search cache to serve the results from, if any
+
+    Returns:
+        For every retriever in order, a dict with its name, results, status
+        ("ok", "timeout" or "error") and latency in seconds
+    """
+    return await asyncio.gather(
+        *[_search_retriever(query, retriever, max_results, timeout, cache) for retriever in retrievers]
+    )
+
+def fuse_search_results(
+    searches: List[Dict[str, Any]], weights: Optional[Dict[str, float]] = None, k: int = RRF_K
+) -> List[Dict[str, Any]]:
+    """
+    Merge the ranked results of several retrievers into one ranking with reciprocal rank
+    fusion: a result scores weight / (k + rank) in every retriever that returned it, and
+    results found by several retrievers add up. Results are deduplicated by canonical URL.
+
+    Args:
+        searches: The searches returned by `search_retrievers`
+        weights: Weight of each retriever by name, 1 for retrievers not listed
+        k: Damping of the rank, higher values flatten the difference between ranks
+
+    Returns:
+        The results ordered by decreasing fused score, each with its `score` and the
+        `retrievers` that returned it
+    """
+    weights = weights or {}
+    fused = {}
+    for search in searches:
+        weight = weights.get(search["retriever"], 1.0)
+        for rank, result in enumerate(search["results"], start=1):
+            href = result.get("href")
+            if not href:
+                continue
+            key = canonicalize_url(href)
+            if key not in fused:
+                fused[key] = {**result, "score": 0.0, "retrievers": []}
+            fused[key]["score"] += weight / (k + rank)
+            fused[key]["retrievers"].append(search["retriever"])
+    # sorted is stable: ties keep the order in which the retrievers were configured
+    return sorted(fused.values(), key=lambda result: result["score"], reverse=True)
+
+
+def fuse_snippet_scores(results: List[Dict[str, Any]], k: int = RRF_K) -> List[Dict[str, Any]]:
+    """
+    Add the ranking of fused results by snippet similarity to the reciprocal rank fusion, as
+    one more ranked list: a result with a `snippet_score` gains 1 / (k + rank) for the rank
+    of its snippet. Results without a snippet score keep their fused score.
+
+    Args:
+        results: The fused results, as returned by `fuse_search_results` and scored by `SnippetPrefilter`
+        k: Damping of the rank, higher values flatten the difference between ranks
+
+    Returns:
+        The results ordered by decreasing fused score
+    """
+    scored = sorted(
+        (result for result in results if "snippet_score" in result),
+        key=lambda result: result["snippet_score"],
+        reverse=True,
+    )
+    snippet_ranks = {id(result): rank for rank, result in enumerate(scored, start=1)}
+    reranked = [
+        {**result, "score": result["score"] + 1 / (k + snippet_ranks[id(result)])}
+        if id(result) in snippet_ranks else result
+        for result in results
+    ]
+    return sorted(reranked, key=lambda result: result["score"], reverse=True)
 
 async def generate_sub_queries(
     query: str,
@@ -103,6 +103,31 @@ def get_retrievers(headers, cfg):
     return [get_retriever(r) or get_default_retriever() for r in retrievers]
 
 
+def get_retriever_weights(cfg):
+    """
+    Parse the per-retriever weights of the search result fusion, e.g. `tavily:1,arxiv:0.5`.
+
+    Args:
+        cfg (Config): The configuration object
+
+    Returns:
+        dict: The weights by retriever class name
+    """
+    weights = {}
+    for entry in (getattr(cfg, "retriever_weights", "") or "").split(","):
+        if not entry.strip():
+            continue
+        name, _, weight = entry.partition(":")
+        retriever = get_retriever(name.strip())
+        if retriever is None:
+            raise ValueError(f"Unknown retriever in RETRIEVER_WEIGHTS: {name.strip()}")
+        try:
+            weights[retriever.__name__] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight in RETRIEVER_WEIGHTS: {entry.strip()}")
+    return weights
+
+
 def get_default_retriever(retriever):
     from gpt_researcher.retrievers import TavilySearch
 
@@ -1,4 +1,5 @@
-from typing import List, Dict, Any, Tuple
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Any, Tuple
 from colorama import Fore, Style
 from ..scraper import Scraper
 from ..config.config import Config
@@ -6,7 +7,7 @@ from ..utils.logger import get_formatted_logger
 
 logger = get_formatted_logger()
 
-def scrape_urls(urls, cfg=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+async def scrape_urls(urls, cfg=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Scrapes the urls
     Args:
@@ -26,8 +27,8 @@ def scrape_urls(urls, cfg=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, An
     )
 
     try:
-        scraper = Scraper(urls, user_agent, cfg.scraper)
-        scraped_data = scraper.run()
+        scraper = Scraper(urls, user_agent, cfg.scraper, cfg)
+        scraped_data = await scraper.scrape()
         for item in scraped_data:
             if 'image_urls' in item:
                 images.extend([img for img in item['image_urls']])
@@ -36,6 +37,42 @@ def scrape_urls(urls, cfg=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, An
 
     return scraped_data, images
 
+async def stream_scrape_urls(
+    urls, cfg=None, deadline=None, min_pages=0, abandoned_callback=None, tenant=None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Scrapes the urls, yielding every page as soon as it is scraped
+    Args:
+        urls: List of urls
+        cfg: Config (optional)
+        deadline: Seconds after which the scrapes still in flight are abandoned (optional)
+        min_pages: Pages to scrape before the deadline may abandon the others
+        abandoned_callback: Called with the list of abandoned urls, if any (optional)
+        tenant: Key of the research task, scraping slots are shared fairly between tasks (optional)
+
+    Yields:
+        Dict[str, Any]: The scraped content of a page, including its image urls
+
+    """
+    user_agent = (
+        cfg.user_agent
+        if cfg
+        else "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+    )
+
+    scraper = None
+    try:
+        scraper = Scraper(urls, user_agent, cfg.scraper, cfg, tenant)
+        async with aclosing(scraper.stream(deadline=deadline, min_pages=min_pages)) as pages:
+            async for page in pages:
+                yield page
+    except Exception as e:
+        logger.error(f"Error in stream_scrape_urls: {e}", exc_info=True)
+    finally:
+        # Also reports the urls abandoned when the consumer stops early or the stream fails
+        if scraper is not None and scraper.abandoned_urls and abandoned_callback is not None:
+            abandoned_callback(scraper.abandoned_urls)
+
 async def filter_urls(urls: List[str], config: Config) -> List[str]:
     """
     Filter URLs based on configuration settings.
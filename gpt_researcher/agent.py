@@ -4,6 +4,7 @@ import json
 from .config import Config
 from .memory import Memory
 from .utils.enum import ReportSource, ReportType, Tone
+from .utils.urls import VisitedUrls
 from .llm_provider import GenericLLMProvider
 from .vector_store import VectorStoreWrapper
 
@@ -72,7 +73,8 @@ class GPTResearcher:
         self.role = role
         self.parent_query = parent_query
         self.subtopics = subtopics
-        self.visited_urls = visited_urls
+        # Shared as is when it already is a VisitedUrls, e.g. across the subtopics of a detailed report
+        self.visited_urls = visited_urls if isinstance(visited_urls, VisitedUrls) else VisitedUrls(visited_urls)
         self.verbose = verbose
         self.context = context
         self.headers = headers or {}
@@ -218,7 +220,7 @@ class GPTResearcher:
         return table_of_contents(markdown_text)
 
     def get_source_urls(self) -> list:
-        return list(self.visited_urls)
+        return self.visited_urls.originals()
 
     def get_research_context(self) -> list:
         return self.context
@@ -18,6 +18,13 @@ class BaseConfig(TypedDict):
     LLM_TEMPERATURE: float
     USER_AGENT: str
     MAX_SEARCH_RESULTS_PER_QUERY: int
+    RETRIEVER_TIMEOUT: float
+    RETRIEVER_WEIGHTS: str
+    MAX_SCRAPE_PER_QUERY: int
+    SNIPPET_SIMILARITY_THRESHOLD: float
+    SNIPPET_TOP_K: int
+    SEARCH_CACHE_TTL: int
+    SEARCH_CACHE_MAX_ENTRIES: int
     MEMORY_BACKEND: str
     TOTAL_WORDS: int
     REPORT_FORMAT: str
@@ -26,6 +33,33 @@ class BaseConfig(TypedDict):
     LANGUAGE: str
     AGENT_ROLE: Union[str, None]
     SCRAPER: str
+    SCRAPER_FALLBACK: str
+    SCRAPER_HTML_EXTRACTOR: str
+    SCRAPER_MAX_CONNECTIONS: int
+    SCRAPER_MAX_PER_HOST: int
+    SCRAPER_MAX_THREADS: int
+    SCRAPER_BROWSER_POOL_SIZE: int
+    SCRAPER_BROWSER_MAX_PAGES: int
+    SCRAPER_BROWSER_LEAN: bool
+    SCRAPER_BROWSER_PAGE_TIMEOUT: int
+    SCRAPER_CACHE_TTL: int
+    SCRAPER_CACHE_MAX_MB: int
+    SCRAPER_PARSE_WORKERS: int
+    SCRAPER_PARSE_MAX_MB: int
+    SCRAPER_MAX_PAGE_BYTES: int
+    SCRAPER_MAX_PAGE_CHARS: int
+    SCRAPER_MAX_PDF_BYTES: int
+    SCRAPER_MAX_PDF_PAGES: int
+    SCRAPER_NEGATIVE_CACHE: bool
+    SCRAPER_BREAKER_THRESHOLD: int
+    SCRAPER_BREAKER_COOLDOWN: int
+    SCRAPER_TIMEOUT_FLOOR: float
+    SCRAPER_TIMEOUT_CEILING: float
+    SCRAPE_DEADLINE_SECONDS: float
+    SCRAPE_MIN_PAGES: int
+    CACHE_DIR: Union[str, None]
+    ENOUGH_CONTENT_CHUNKS: int
+    DEDUP_SIMILARITY_THRESHOLD: float
     MAX_SUBTOPICS: int
     REPORT_SOURCE: Union[str, None]
     DOC_PATH: str
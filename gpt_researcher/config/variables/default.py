@@ -17,12 +17,46 @@ DEFAULT_CONFIG: BaseConfig = {
     "LLM_TEMPERATURE": 0.55,
     "USER_AGENT": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0",
     "MAX_SEARCH_RESULTS_PER_QUERY": 5,
+    "RETRIEVER_TIMEOUT": 10.0,
+    "RETRIEVER_WEIGHTS": "",
+    "MAX_SCRAPE_PER_QUERY": 10,
+    "SNIPPET_SIMILARITY_THRESHOLD": 0.0,
+    "SNIPPET_TOP_K": 0,
+    "SEARCH_CACHE_TTL": 3600,
+    "SEARCH_CACHE_MAX_ENTRIES": 1000,
     "MEMORY_BACKEND": "local",
     "TOTAL_WORDS": 1000,
     "REPORT_FORMAT": "APA",
     "MAX_ITERATIONS": 4,
     "AGENT_ROLE": None,
     "SCRAPER": "bs",
+    "SCRAPER_FALLBACK": "browser",
+    "SCRAPER_HTML_EXTRACTOR": "bs",
+    "SCRAPER_MAX_CONNECTIONS": 20,
+    "SCRAPER_MAX_PER_HOST": 2,
+    "SCRAPER_MAX_THREADS": 8,
+    "SCRAPER_BROWSER_POOL_SIZE": 2,
+    "SCRAPER_BROWSER_MAX_PAGES": 50,
+    "SCRAPER_BROWSER_LEAN": True,
+    "SCRAPER_BROWSER_PAGE_TIMEOUT": 15,
+    "SCRAPER_CACHE_TTL": 86400,
+    "SCRAPER_CACHE_MAX_MB": 512,
+    "SCRAPER_PARSE_WORKERS": 0,
+    "SCRAPER_PARSE_MAX_MB": 5,
+    "SCRAPER_MAX_PAGE_BYTES": 5242880,
+    "SCRAPER_MAX_PAGE_CHARS": 100000,
+    "SCRAPER_MAX_PDF_BYTES": 20971520,
+    "SCRAPER_MAX_PDF_PAGES": 200,
+    "SCRAPER_NEGATIVE_CACHE": True,
+    "SCRAPER_BREAKER_THRESHOLD": 5,
+    "SCRAPER_BREAKER_COOLDOWN": 60,
+    "SCRAPER_TIMEOUT_FLOOR": 2.0,
+    "SCRAPER_TIMEOUT_CEILING": 20.0,
+    "SCRAPE_DEADLINE_SECONDS": 0,
+    "SCRAPE_MIN_PAGES": 1,
+    "CACHE_DIR": None,
+    "ENOUGH_CONTENT_CHUNKS": 0,
+    "DEDUP_SIMILARITY_THRESHOLD": 0.8,
     "MAX_SUBTOPICS": 3,
     "LANGUAGE": "english",
     "REPORT_SOURCE": "web",
@@ -1,7 +1,9 @@
 import os
 import asyncio
-from typing import Optional
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Optional
 from .retriever import SearchAPIRetriever, SectionRetriever
+from .deduplication import DuplicateChunkFilter, deduplicate_pages, near_duplicate_filter
 from langchain.retrievers import (
     ContextualCompressionRetriever,
 )
@@ -9,7 +11,9 @@ from langchain.retrievers.document_compressors import (
     DocumentCompressorPipeline,
     EmbeddingsFilter,
 )
+from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.utils.math import cosine_similarity
 from ..vector_store import VectorStoreWrapper
 from ..utils.costs import estimate_embedding_cost
 from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
@@ -35,20 +39,33 @@ class VectorstoreCompressor:
         return self.__pretty_print_docs(results)
 
 
+def _dedup_stats(page_duplicates, chunk_duplicates):
+    if page_duplicates is None:
+        return None
+    return {"pages": page_duplicates.stats(), "chunks": chunk_duplicates.stats()}
+
+
 class ContextCompressor:
-    def __init__(self, documents, embeddings, max_results=5, **kwargs):
+    def __init__(self, documents, embeddings, max_results=5, dedup_threshold=0, page_duplicates=None, **kwargs):
         self.max_results = max_results
         self.documents = documents
         self.kwargs = kwargs
         self.embeddings = embeddings
         self.similarity_threshold = os.environ.get("SIMILARITY_THRESHOLD", 0.35)
+        # Near-duplicate pages and chunks are dropped before being embedded. The page filter is
+        # passed in when it is shared with the other sub-queries of the research
+        self.page_duplicates = page_duplicates or near_duplicate_filter(dedup_threshold)
+        self.chunk_duplicates = near_duplicate_filter(dedup_threshold)
 
     def __get_contextual_retriever(self):
         splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
         relevance_filter = EmbeddingsFilter(embeddings=self.embeddings,
                                             similarity_threshold=self.similarity_threshold)
+        transformers = [splitter, relevance_filter]
+        if self.chunk_duplicates is not None:
+            transformers.insert(1, DuplicateChunkFilter(self.chunk_duplicates))
         pipeline_compressor = DocumentCompressorPipeline(
-            transformers=[splitter, relevance_filter]
+            transformers=transformers
         )
         base_retriever = SearchAPIRetriever(
             pages=self.documents
@@ -65,12 +82,89 @@ class ContextCompressor:
                           for i, d in enumerate(docs) if i < top_n)
 
     async def async_get_context(self, query, max_results=5, cost_callback=None):
+        if self.page_duplicates is not None:
+            self.documents = await asyncio.to_thread(deduplicate_pages, self.documents, self.page_duplicates)
         compressed_docs = self.__get_contextual_retriever()
         if cost_callback:
             cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
         relevant_docs = await asyncio.to_thread(compressed_docs.invoke, query)
         return self.__pretty_print_docs(relevant_docs, max_results)
 
+    def dedup_stats(self):
+        """Pages and chunks seen and dropped as near-duplicates, None when deduplication is disabled"""
+        return _dedup_stats(self.page_duplicates, self.chunk_duplicates)
+
+
+class StreamingContextCompressor:
+    """
+    Compresses scraped pages into context as they arrive, instead of waiting for the whole
+    batch: every page is split and embedded as soon as it is yielded, while the remaining
+    pages are still being scraped. Chunks are kept under the same similarity threshold as
+    ContextCompressor. Scraping stops early once `enough_chunks` relevant chunks are found.
+    """
+
+    def __init__(self, embeddings, enough_chunks: int = 0, dedup_threshold=0, page_duplicates=None, **kwargs):
+        self.embeddings = embeddings
+        self.enough_chunks = enough_chunks
+        self.kwargs = kwargs
+        self.similarity_threshold = float(os.environ.get("SIMILARITY_THRESHOLD", 0.35))
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+        # Near-duplicate pages and chunks are dropped before being embedded. The page filter is
+        # passed in when it is shared with the other sub-queries of the research
+        self.page_duplicates = page_duplicates or near_duplicate_filter(dedup_threshold)
+        self.chunk_duplicates = near_duplicate_filter(dedup_threshold)
+        # Pages consumed from the stream
+        self.documents = []
+
+    def __get_relevant_chunks(self, page, embedded_query):
+        if self.page_duplicates is not None and self.page_duplicates.is_duplicate(page.get("raw_content", "")):
+            return []
+        chunks = self.splitter.split_documents([
+            Document(
+                page_content=page.get("raw_content", ""),
+                metadata={"title": page.get("title", ""), "source": page.get("url", "")},
+            )
+        ])
+        if self.chunk_duplicates is not None:
+            chunks = DuplicateChunkFilter(self.chunk_duplicates).transform_documents(chunks)
+        if not chunks:
+            return []
+        embedded_chunks = self.embeddings.embed_documents([chunk.page_content for chunk in chunks])
+        similarity = cosine_similarity([embedded_query], embedded_chunks)[0]
+        return [chunk for chunk, score in zip(chunks, similarity) if score > self.similarity_threshold]
+
+    def __pretty_print_docs(self, docs, top_n):
+        return "\n".join(f"Source: {d.metadata.get('source')}\n"
+                         f"Title: {d.metadata.get('title')}\n"
+                         f"Content: {d.page_content}\n"
+                         for i, d in enumerate(docs) if i < top_n)
+
+    async def async_get_context(self, query, pages: AsyncIterator[Dict], max_results=5, cost_callback=None, embedded_query=None):
+        # Embed the query while the first pages are scraped, unless its embedding is shared with the caller
+        owns_embedding = embedded_query is None
+        if owns_embedding:
+            embedded_query = asyncio.create_task(asyncio.to_thread(self.embeddings.embed_query, query))
+        relevant_docs = []
+        try:
+            async with aclosing(pages) as stream:
+                async for page in stream:
+                    self.documents.append(page)
+                    relevant_docs += await asyncio.to_thread(
+                        self.__get_relevant_chunks, page, await embedded_query
+                    )
+                    if self.enough_chunks and len(relevant_docs) >= self.enough_chunks:
+                        break
+        finally:
+            if owns_embedding:
+                embedded_query.cancel()
+        if cost_callback:
+            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
+        return self.__pretty_print_docs(relevant_docs, max_results)
+
+    def dedup_stats(self):
+        """Pages and chunks seen and dropped as near-duplicates, None when deduplication is disabled"""
+        return _dedup_stats(self.page_duplicates, self.chunk_duplicates)
+
 
 class WrittenContentCompressor:
     def __init__(self, documents, embeddings, similarity_threshold, **kwargs):
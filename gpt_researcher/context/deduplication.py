@@ -0,0 +1,147 @@
+import hashlib
+import re
+import threading
+from typing import List, Sequence
+
+import numpy as np
+from langchain.schema import Document
+from langchain_core.documents import BaseDocumentTransformer
+
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed, so that signatures are comparable across filters and processes
+_PERMUTATIONS = np.random.RandomState(1).randint(1, (1 << 32) - 1, size=(2, NUM_PERMUTATIONS), dtype=np.uint64)
+
+
+def minhash(text: str) -> np.ndarray:
+    """
+    Compute the MinHash signature of a text from its word shingles. The share of equal
+    values in the signatures of two texts estimates the Jaccard similarity of their shingles.
+
+    Args:
+      text (str): The text to fingerprint.
+
+    Returns:
+      np.ndarray: The signature, NUM_PERMUTATIONS hash values.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) > SHINGLE_SIZE:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = {" ".join(words)}
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles],
+        dtype=np.uint64,
+    )
+    a, b = _PERMUTATIONS
+    permuted = (hashes[:, None] * a + b) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0)
+
+
+def _lsh_rows(threshold: float) -> int:
+    """
+    Number of signature rows per LSH band. Texts share a bucket with a probability rising
+    steeply around (1 / bands) ** (1 / rows); the most selective split whose rise lies at or
+    below the threshold is used, so that near-duplicates are not missed.
+    """
+    rows = 1
+    for candidate in range(1, NUM_PERMUTATIONS + 1):
+        if (1 / (NUM_PERMUTATIONS // candidate)) ** (1 / candidate) <= threshold:
+            rows = candidate
+    return rows
+
+
+class NearDuplicateFilter:
+    """
+    Detects near-duplicate texts with MinHash signatures indexed by LSH bucketing.
+
+    Two texts are near-duplicates when the estimated Jaccard similarity of their word
+    shingles reaches the threshold. Signatures are split into bands hashed into buckets, so
+    only texts sharing a bucket with the new one have to be compared. A filter may be shared
+    by the sub-queries of a research, which check their pages from worker threads.
+    """
+
+    def __init__(self, threshold: float = 0.8):
+        """
+        Initialize the filter.
+
+        Args:
+          threshold (float): Similarity, between 0 and 1, from which texts are considered duplicates.
+        """
+        self.threshold = threshold
+        rows = _lsh_rows(threshold)
+        self._bands = [slice(start, start + rows) for start in range(0, NUM_PERMUTATIONS - rows + 1, rows)]
+        self._buckets = [{} for _ in self._bands]
+        self._signatures = []
+        self.seen = 0
+        self.dropped = 0
+        self.dropped_chars = 0
+        self._lock = threading.Lock()
+
+    def is_duplicate(self, text: str) -> bool:
+        """
+        Check whether a text is a near-duplicate of one seen before, remembering it otherwise.
+
+        Args:
+          text (str): The text to check.
+
+        Returns:
+          bool: True if the text should be dropped.
+        """
+        signature = minhash(text)
+        keys = [signature[band].tobytes() for band in self._bands]
+        with self._lock:
+            self.seen += 1
+            candidates = {index for buckets, key in zip(self._buckets, keys) for index in buckets.get(key, ())}
+            for index in candidates:
+                if np.mean(self._signatures[index] == signature) >= self.threshold:
+                    self.dropped += 1
+                    self.dropped_chars += len(text)
+                    return True
+
+            self._signatures.append(signature)
+            for buckets, key in zip(self._buckets, keys):
+                buckets.setdefault(key, []).append(len(self._signatures) - 1)
+            return False
+
+    def stats(self) -> dict:
+        """Get the number of texts seen and dropped, and the characters saved"""
+        with self._lock:
+            return {"seen": self.seen, "dropped": self.dropped, "dropped_chars": self.dropped_chars}
+
+
+def near_duplicate_filter(threshold: float):
+    """Near-duplicate filter for the given similarity threshold, None when deduplication is disabled"""
+    return NearDuplicateFilter(threshold) if threshold else None
+
+
+class DuplicateChunkFilter(BaseDocumentTransformer):
+    """
+    Document transformer dropping near-duplicate chunks, to run between the text splitter
+    and the embeddings filter of a compression pipeline.
+    """
+
+    def __init__(self, near_duplicates: NearDuplicateFilter):
+        self.near_duplicates = near_duplicates
+
+    def transform_documents(self, documents: Sequence[Document], **kwargs) -> List[Document]:
+        return [doc for doc in documents if not self.near_duplicates.is_duplicate(doc.page_content)]
+
+
+def deduplicate_pages(pages: list, near_duplicates: NearDuplicateFilter) -> list:
+    """
+    Drop the scraped pages whose content nearly duplicates an earlier page.
+
+    Args:
+      pages (list): The scraped pages, with their `raw_content`.
+      near_duplicates (NearDuplicateFilter): The filter remembering the pages seen so far.
+
+    Returns:
+      list: The pages to keep.
+    """
+    return [page for page in pages if not near_duplicates.is_duplicate(page.get("raw_content", ""))]
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Awaitable, Dict, List, Optional
+
+from langchain_community.utils.math import cosine_similarity
+
+from ..utils.costs import estimate_embedding_cost
+from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
+
+
+class SnippetPrefilter:
+    """
+    Relevance prefilter of search results before scraping.
+
+    Retrievers return a snippet with every result. The snippets are embedded in one batch
+    and scored against the query, and results scoring below the similarity threshold, or
+    beyond the `top_k` best snippets, are dropped, so weakly relevant pages never cost a
+    download, a parse or the embedding of their chunks. Results without a snippet cannot be
+    judged and are kept.
+
+    Similarity values depend on the embedding model, a threshold tuned for one model may keep
+    everything or nothing with another. The top-k cut only depends on the ranking.
+    """
+
+    def __init__(self, embeddings, similarity_threshold: float = 0.0, top_k: int = 0):
+        """
+        Initialize the prefilter.
+
+        Args:
+          embeddings: The embeddings used for the context, to score snippets the same way as chunks.
+          similarity_threshold (float): Minimum cosine similarity between a snippet and the query, 0 for none.
+          top_k (int): Number of best scoring snippets kept, 0 for no limit.
+        """
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.top_k = top_k
+
+    async def filter(
+        self,
+        query: str,
+        results: List[Dict],
+        embedded_query: Optional[Awaitable[List[float]]] = None,
+        cost_callback=None,
+    ) -> List[Dict]:
+        """
+        Score the snippets of search results against the query and drop the irrelevant ones.
+
+        Args:
+          query (str): The search query.
+          results (list): The search results, with their snippet in `body`.
+          embedded_query (Awaitable, optional): The embedding of the query when it is already
+            being computed, so that it is shared with the context compression.
+          cost_callback (callable, optional): Called with the cost of embedding the snippets.
+
+        Returns:
+          list: The kept results in their original order, scored ones with their `snippet_score`.
+        """
+        snippets = [
+            (i, result["body"]) for i, result in enumerate(results)
+            if isinstance(result.get("body"), str) and result["body"].strip()
+        ]
+        if not snippets:
+            return results
+        if embedded_query is None:
+            embedded_query = asyncio.to_thread(self.embeddings.embed_query, query)
+        else:
+            # The embedding is shared, cancelling the prefilter must not cancel it
+            embedded_query = asyncio.shield(embedded_query)
+        embedded_snippets, query_embedding = await asyncio.gather(
+            asyncio.to_thread(self.embeddings.embed_documents, [snippet for _, snippet in snippets]),
+            embedded_query,
+        )
+        if cost_callback:
+            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=[snippet for _, snippet in snippets]))
+
+        scores = dict(zip((i for i, _ in snippets), cosine_similarity([query_embedding], embedded_snippets)[0]))
+        relevant = [i for i in scores if scores[i] >= self.similarity_threshold]
+        if self.top_k:
+            relevant = sorted(relevant, key=lambda i: scores[i], reverse=True)[:self.top_k]
+        relevant = set(relevant)
+        kept = []
+        for i, result in enumerate(results):
+            if i not in scores:
+                kept.append(result)
+            elif i in relevant:
+                kept.append({**result, "snippet_score": float(scores[i])})
+        return kept
@@ -11,11 +11,15 @@ from langchain_community.document_loaders import (
     UnstructuredWordDocumentLoader
 )
 
+from ..scraper.latency import get_client_timeout, get_latency_profile
+
 
 class OnlineDocumentLoader:
 
-    def __init__(self, urls):
+    def __init__(self, urls, cfg=None):
         self.urls = urls
+        # Config providing the latency profile settings, see get_latency_profile
+        self.cfg = cfg
 
     async def load(self) -> list:
         docs = []
@@ -35,8 +39,9 @@ class OnlineDocumentLoader:
 
     async def _download_and_process(self, url: str) -> list:
         try:
+            timeout = get_latency_profile(self.cfg).timeout_for(url)
             async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=6) as response:
+                async with session.get(url, timeout=get_client_timeout(timeout)) as response:
                     if response.status != 200:
                         print(f"Failed to download {url}: HTTP {response.status}")
                         return []
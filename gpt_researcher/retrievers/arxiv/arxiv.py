@@ -1,3 +1,5 @@
+import asyncio
+
 import arxiv
 
 
@@ -37,4 +39,13 @@ class ArxivSearch:
                 "body": result.summary,
             })
         
-        return search_result
\ No newline at end of file
+        return search_result
+
+    async def asearch(self, max_results=5):
+        """
+        Performs the search without blocking the event loop. The arxiv client is
+        synchronous, so the search runs in a thread.
+        :param max_results:
+        :return:
+        """
+        return await asyncio.to_thread(self.search, max_results=max_results)
\ No newline at end of file
@@ -2,10 +2,11 @@
 
 # libraries
 import os
-import requests
 import json
 import logging
 
+from ..client import get_http_client, run_sync
+
 
 class BingSearch():
     """
@@ -40,6 +41,14 @@ class BingSearch():
         Searches the query
         Returns:
 
+        """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results=7) -> list[dict[str]]:
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
         """
         print("Searching with query {0}...".format(self.query))
         """Useful for general internet search queries using the Bing API."""
@@ -56,18 +65,17 @@ class BingSearch():
             "q": self.query,
             "count": max_results,
             "setLang": "en-GB",
-            "textDecorations": False,
+            "textDecorations": "false",
             "textFormat": "HTML",
             "safeSearch": "Strict"
         }
 
-        resp = requests.get(url, headers=headers, params=params)
+        async with get_http_client().get(url, headers=headers, params=params) as resp:
+            text = await resp.text()
 
         # Preprocess the results
-        if resp is None:
-            return []
         try:
-            search_results = json.loads(resp.text)
+            search_results = json.loads(text)
             results = search_results["webPages"]["value"]
         except Exception as e:
             self.logger.error(
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def get_search_key(retriever: str, query: str, max_results: int | None) -> str:
+    """Get the key a search is cached under: retriever, case- and whitespace-normalized query, max_results"""
+    normalized = " ".join(query.lower().split())
+    return json.dumps([retriever, normalized, max_results])
+
+
+class SearchCache:
+    """
+    Cache of retriever search results.
+
+    Results are kept in an in-memory LRU for `ttl` seconds and, when a path is given,
+    also in SQLite so that they survive restarts. Concurrent identical searches are
+    coalesced: the first one calls the retriever and the others wait for its results
+    instead of sending the same request upstream. Empty results are not cached, since
+    most retrievers return an empty list when their API fails.
+    """
+
+    def __init__(self, ttl: int = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES, path: str | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+          ttl (int): Seconds a search result is reused.
+          max_entries (int): Maximum number of searches kept in memory.
+          path (str, optional): Path of the SQLite database file, the cache is memory only when not set.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.logger = logging.getLogger(__name__)
+        self._entries = OrderedDict()
+        self._loop = None
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS searches (key TEXT PRIMARY KEY, results TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+
+    def _bind_loop(self) -> None:
+        """Futures are bound to one event loop, forget the searches in flight on a previous loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._inflight = {}
+            self._loop = loop
+
+    async def search(self, retriever, query: str, max_results: int | None = None) -> list:
+        """
+        Search a query with a retriever, serving the results from the cache when possible.
+
+        Args:
+          retriever: The retriever class.
+          query (str): The search query.
+          max_results (int, optional): Maximum number of results, the retriever default when not set.
+
+        Returns:
+          list: The search results.
+        """
+        self._bind_loop()
+        key = get_search_key(retriever.__name__, query, max_results)
+        results = await self._get(key)
+        if results is not None:
+            self.hits += 1
+            return results
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            # The search we joined was cancelled by its caller, run it ourselves
+            self.coalesced -= 1
+            return await self.search(retriever, query, max_results)
+
+        self.misses += 1
+        future = self._loop.create_future()
+        self._inflight[key] = future
+        try:
+            search_retriever = retriever(query)
+            if max_results is None:
+                results = await search_retriever.asearch()
+            else:
+                results = await search_retriever.asearch(max_results=max_results)
+            if results:
+                await self._put(key, results)
+            future.set_result(results)
+            return results
+        except BaseException as e:
+            # Followers see the error of the search they joined, or run it again if it was cancelled
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Retrieved by no one when there are no followers
+                future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _get(self, key: str) -> list | None:
+        entry = self._entries.get(key)
+        if entry is None and self._conn is not None:
+            entry = await asyncio.to_thread(self._load, key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.time() - stored_at >= self.ttl:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return results
+
+    async def _put(self, key: str, results: list) -> None:
+        entry = (time.time(), results)
+        self._remember(key, entry)
+        if self._conn is not None:
+            await asyncio.to_thread(self._store, key, entry)
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> tuple | None:
+        with self._lock:
+            row = self._conn.execute("SELECT stored_at, results FROM searches WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _store(self, key: str, entry: tuple) -> None:
+        stored_at, results = entry
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO searches VALUES (?, ?, ?)", (key, json.dumps(results), stored_at)
+                )
+                self._conn.execute("DELETE FROM searches WHERE stored_at < ?", (time.time() - self.ttl,))
+        except (TypeError, ValueError) as e:
+            # Results that are not JSON serializable are only cached in memory
+            self.logger.debug(f"Search results not stored on disk: {e}")
+
+    def stats(self) -> dict:
+        """Get the hit, miss and coalescing counters of the cache"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+_search_caches = {}
+
+
+def get_search_cache(cfg=None) -> SearchCache | None:
+    """
+    Get the process-wide SearchCache, stored on disk when a cache directory is configured.
+
+    Args:
+      cfg (Config, optional): The config providing `cache_dir` and the search cache settings.
+
+    Returns:
+      SearchCache | None: The shared cache, or None when `search_cache_ttl` is 0.
+    """
+    ttl = getattr(cfg, "search_cache_ttl", DEFAULT_TTL)
+    if not ttl:
+        return None
+    cache_dir = getattr(cfg, "cache_dir", None)
+    path = os.path.join(cache_dir, "searches.sqlite") if cache_dir else None
+    if path not in _search_caches:
+        _search_caches[path] = SearchCache(
+            ttl=ttl,
+            max_entries=getattr(cfg, "search_cache_max_entries", DEFAULT_MAX_ENTRIES),
+            path=path,
+        )
+    return _search_caches[path]
@@ -0,0 +1,93 @@
+import asyncio
+import atexit
+import threading
+
+import aiohttp
+
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_MAX_PER_HOST = 10
+DNS_CACHE_TTL = 300
+# Seconds a request may take when its retriever does not set a timeout of its own
+DEFAULT_TIMEOUT = 30
+# Seconds the background loop of `run_sync` is given to close its client at exit
+CLOSE_TIMEOUT = 5
+
+# Shared client of every running event loop, and the task closing it when the loop shuts down
+_clients = {}
+_sync_loop = None
+_sync_lock = threading.Lock()
+
+
+def get_http_client() -> aiohttp.ClientSession:
+    """
+    Get the pooled HTTP client shared by all retrievers. Connections and TLS sessions to the
+    search APIs are kept alive and reused across sub-queries and research tasks instead of
+    being opened for every search. aiohttp sessions are bound to an event loop, so there is
+    one client per running loop, closed when the loop shuts down.
+
+    Returns:
+      aiohttp.ClientSession: The shared client of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client, closer = _clients.get(loop, (None, None))
+    if client is None or client.closed:
+        if closer is not None:
+            closer.cancel()
+        connector = aiohttp.TCPConnector(
+            limit=DEFAULT_MAX_CONNECTIONS, limit_per_host=DEFAULT_MAX_PER_HOST, ttl_dns_cache=DNS_CACHE_TTL
+        )
+        client = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT))
+        _clients[loop] = (client, loop.create_task(_close_at_shutdown(loop, client)))
+    return client
+
+
+async def _close_at_shutdown(loop, client: aiohttp.ClientSession) -> None:
+    """
+    Wait until the event loop shuts down, which cancels its remaining tasks as `asyncio.run`
+    does, and close its client
+    """
+    try:
+        await loop.create_future()
+    finally:
+        if _clients.get(loop, (None,))[0] is client:
+            del _clients[loop]
+        await client.close()
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client of the running event loop, if any"""
+    client, closer = _clients.pop(asyncio.get_running_loop(), (None, None))
+    if closer is not None:
+        closer.cancel()
+    if client is not None:
+        await client.close()
+
+
+def run_sync(coro):
+    """
+    Run a coroutine of the async retriever API from synchronous code and wait for its result.
+    Coroutines run on a single background event loop, so that synchronous callers from any
+    thread share one pooled HTTP client as well.
+
+    Args:
+      coro: The coroutine to run.
+
+    Returns:
+      The result of the coroutine.
+    """
+    global _sync_loop
+    with _sync_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="retrievers", daemon=True).start()
+            atexit.register(_close_sync_loop)
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
+
+def _close_sync_loop() -> None:
+    """Close the client of the background loop of `run_sync` at exit, the loop never shuts down"""
+    try:
+        asyncio.run_coroutine_threadsafe(close_http_client(), _sync_loop).result(timeout=CLOSE_TIMEOUT)
+    except Exception:
+        pass
+    _sync_loop.call_soon_threadsafe(_sync_loop.stop)
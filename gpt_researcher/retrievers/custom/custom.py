@@ -1,7 +1,10 @@
+import asyncio
 from typing import Any, Dict, List, Optional
-import requests
+import aiohttp
 import os
 
+from ..client import get_http_client, run_sync
+
 
 class CustomRetriever:
     """
@@ -43,10 +46,19 @@ class CustomRetriever:
               }
             ]
         """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """
+        Performs the search using the custom retriever endpoint without blocking the event loop.
+
+        :param max_results: Maximum number of results to return (not currently used)
+        :return: JSON response in the same format as `search`
+        """
         try:
-            response = requests.get(self.endpoint, params={**self.params, 'query': self.query})
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            async with get_http_client().get(self.endpoint, params={**self.params, 'query': self.query}) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Failed to retrieve search results: {e}")
             return None
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from ..utils import check_pkg
 
@@ -63,6 +64,22 @@ class ExaSearch:
         ]
         return search_response
 
+    async def asearch(self, max_results=10, use_autoprompt=False, search_type="neural", **filters):
+        """
+        Searches the query using the Exa API without blocking the event loop. The Exa
+        client is synchronous, so the search runs in a thread.
+        Args:
+            max_results: The maximum number of results to return.
+            use_autoprompt: Whether to use autoprompting.
+            search_type: The type of search (e.g., "neural", "keyword").
+            **filters: Additional filters (e.g., date range, domains).
+        Returns:
+            A list of search results.
+        """
+        return await asyncio.to_thread(
+            self.search, max_results=max_results, use_autoprompt=use_autoprompt, search_type=search_type, **filters
+        )
+
     def find_similar(self, url, exclude_source_domain=False, **filters):
         """
         Finds similar documents to the provided URL using the Exa API.
@@ -2,9 +2,10 @@
 
 # libraries
 import os
-import requests
 import json
 
+from ..client import get_http_client, run_sync
+
 
 class GoogleSearch:
     """
@@ -54,19 +55,26 @@ class GoogleSearch:
         Searches the query
         Returns:
 
+        """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
         """
         """Useful for general internet search queries using the Google API."""
         print("Searching with query {0}...".format(self.query))
-        url = f"https://www.googleapis.com/customsearch/v1?key={self.api_key}&cx={self.cx_key}&q={self.query}&start=1"
-        resp = requests.get(url)
+        url = "https://www.googleapis.com/customsearch/v1"
+        params = {"key": self.api_key, "cx": self.cx_key, "q": self.query, "start": 1}
+        async with get_http_client().get(url, params=params) as resp:
+            if resp.status < 200 or resp.status >= 300:
+                print("Google search: unexpected response status: ", resp.status)
+            text = await resp.text()
 
-        if resp.status_code < 200 or resp.status_code >= 300:
-            print("Google search: unexpected response status: ", resp.status_code)
-
-        if resp is None:
-            return
         try:
-            search_results = json.loads(resp.text)
+            search_results = json.loads(text)
         except Exception:
             return
         if search_results is None:
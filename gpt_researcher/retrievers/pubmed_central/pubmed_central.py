@@ -1,7 +1,16 @@
+import asyncio
 import os
 import xml.etree.ElementTree as ET
 
-import requests
+from ..client import get_http_client, run_sync
+
+# Article IDs per efetch request, and characters of body text kept per article
+BATCH_SIZE = 10
+SNIPPET_CHARS = 500
+CHUNK_SIZE = 64 * 1024
+
+# Elements cleared once parsed, so that a batch of full-text articles is never held in memory
+_CLEARED_TAGS = {"p", "sec", "table-wrap", "fig", "ref-list", "back"}
 
 
 class PubMedCentralSearch:
@@ -9,6 +18,9 @@ class PubMedCentralSearch:
     PubMed Central API Retriever
     """
 
+    ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+    EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+
     def __init__(self, query):
         """
         Initializes the PubMedCentralSearch object.
@@ -43,7 +55,16 @@ class PubMedCentralSearch:
         Returns:
             A list of search results.
         """
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results=10):
+        """
+        Searches the query using the PubMed Central API without blocking the event loop.
+        Args:
+            max_results: The maximum number of results to return.
+        Returns:
+            A list of search results.
+        """
         params = {
             "db": "pmc",
             "term": f"{self.query} AND free fulltext[filter]",
@@ -53,28 +74,31 @@ class PubMedCentralSearch:
             "retmode": "json",
             "sort": "relevance"
         }
-        response = requests.get(base_url, params=params)
+        async with get_http_client().get(self.ESEARCH_URL, params=params) as response:
+            if response.status != 200:
+                raise Exception(
+                    f"Failed to retrieve data: {response.status} - {await response.text()}"
+                )
+            results = await response.json(content_type=None)
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to retrieve data: {response.status_code} - {response.text}"
-            )
-
-        results = response.json()
         ids = results["esearchresult"]["idlist"]
 
+        # Fetch the articles in a few batches, concurrently
+        batches = [ids[i:i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
+        articles = {}
+        for batch in await asyncio.gather(*[self.afetch(batch) for batch in batches]):
+            articles.update(batch)
+
         search_response = []
         for article_id in ids:
-            xml_content = self.fetch([article_id])
-            if self.has_body_content(xml_content):
-                article_data = self.parse_xml(xml_content)
-                if article_data:
-                    search_response.append(
-                        {
-                            "href": f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{article_id}/",
-                            "body": f"{article_data['title']}\n\n{article_data['abstract']}\n\n{article_data['body'][:500]}...",
-                        }
-                    )
+            article_data = articles.get(article_id)
+            if article_data and article_data["has_body"]:
+                search_response.append(
+                    {
+                        "href": f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{article_id}/",
+                        "body": f"{article_data['title']}\n\n{article_data['abstract']}\n\n{article_data['body'][:SNIPPET_CHARS]}...",
+                    }
+                )
 
             if len(search_response) >= max_results:
                 break
@@ -83,92 +107,122 @@ class PubMedCentralSearch:
 
     def fetch(self, ids):
         """
-        Fetches the full text content for given article IDs.
+        Fetches and parses the full text of the given articles.
         Args:
             ids: List of article IDs.
         Returns:
-            XML content of the articles.
+            Dictionary of the parsed articles by article ID, see `parse_articles`.
         """
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-        params = {
-            "db": "pmc",
-            "id": ",".join(ids),
-            "retmode": "xml",
-            "api_key": self.api_key,
-        }
-        response = requests.get(base_url, params=params)
-
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to retrieve data: {response.status_code} - {response.text}"
-            )
+        return run_sync(self.afetch(ids))
 
-        return response.text
-
-    def has_body_content(self, xml_content):
+    async def afetch(self, ids):
         """
-        Checks if the XML content has a body section.
+        Fetches the full text of the given articles in a single request without blocking the
+        event loop. The XML is parsed while it is downloaded.
         Args:
-            xml_content: XML content of the article.
+            ids: List of article IDs.
         Returns:
-            Boolean indicating presence of body content.
+            Dictionary of the parsed articles by article ID, see `parse_articles`.
         """
-        root = ET.fromstring(xml_content)
-        ns = {
-            "mml": "http://www.w3.org/1998/Math/MathML",
-            "xlink": "http://www.w3.org/1999/xlink",
+        params = {
+            "db": "pmc",
+            "id": ",".join(ids),
+            "retmode": "xml",
+            "api_key": self.api_key,
         }
-        article = root.find("article", ns)
-        if article is None:
-            return False
-
-        body_elem = article.find(".//body", namespaces=ns)
-        if body_elem is not None:
-            return True
-        else:
-            for sec in article.findall(".//sec", namespaces=ns):
-                for p in sec.findall(".//p", namespaces=ns):
-                    if p.text:
-                        return True
-        return False
-
-    def parse_xml(self, xml_content):
+        parser = _ArticleParser(ids)
+        async with get_http_client().get(self.EFETCH_URL, params=params) as response:
+            if response.status != 200:
+                raise Exception(
+                    f"Failed to retrieve data: {response.status} - {await response.text()}"
+                )
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                parser.feed(chunk)
+
+        return parser.close()
+
+    def parse_articles(self, xml_content, ids=()):
         """
-        Parses the XML content to extract title, abstract, and body.
+        Parses the XML content of fetched articles in a single streaming pass.
         Args:
-            xml_content: XML content of the article.
+            xml_content: XML content of the articles.
+            ids: The requested article IDs, used for articles without a PMC ID in their metadata.
         Returns:
-            Dictionary containing title, abstract, and body text.
+            Dictionary by article ID of the title, abstract, the first `SNIPPET_CHARS`
+            characters of body text and whether the article has body content.
         """
-        root = ET.fromstring(xml_content)
-        ns = {
-            "mml": "http://www.w3.org/1998/Math/MathML",
-            "xlink": "http://www.w3.org/1999/xlink",
+        parser = _ArticleParser(ids)
+        parser.feed(xml_content)
+        return parser.close()
+
+
+class _ArticleParser:
+    """
+    Incremental parser of an efetch article set. Only the title, the abstract and the
+    beginning of the body of every article are kept: body paragraphs beyond the snippet
+    budget are skipped and parsed elements are cleared as the parse goes.
+    """
+
+    def __init__(self, ids=()):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._ids = list(ids)
+        self._stack = []
+        self._article = None
+        self._articles = {}
+
+    def feed(self, data):
+        self._parser.feed(data)
+        for event, elem in self._parser.read_events():
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                self._stack.append(tag)
+                if tag == "article" and self._article is None:
+                    self._article = {
+                        "id": None, "title": None, "abstract": None,
+                        "body": [], "sec": [], "has_body": False, "depth": len(self._stack),
+                    }
+                continue
+            self._stack.pop()
+            if self._article is not None:
+                self._end(tag, elem)
+
+    def _end(self, tag, elem):
+        article = self._article
+        if tag == "article" and len(self._stack) < article["depth"]:
+            self._finish(article)
+            elem.clear()
+            return
+        if tag == "article-id" and article["id"] is None and elem.get("pub-id-type") in ("pmc", "pmcid"):
+            article["id"] = (elem.text or "").strip().removeprefix("PMC")
+        elif tag == "article-title" and article["title"] is None and self._stack[-1:] == ["title-group"]:
+            article["title"] = elem.text or ""
+        elif tag == "abstract" and article["abstract"] is None:
+            article["abstract"] = "".join(elem.itertext()).strip()
+        elif tag == "body":
+            article["has_body"] = True
+        elif tag == "p":
+            # Paragraphs of the body, or of any section when the article has no body, including
+            # the sections of a structured abstract
+            paragraphs = article["body"] if "body" in self._stack else article["sec"] if "sec" in self._stack else None
+            if paragraphs is not None and elem.text and sum(len(p) + 1 for p in paragraphs) < SNIPPET_CHARS:
+                paragraphs.append(elem.text.strip())
+        if tag in _CLEARED_TAGS and "abstract" not in self._stack:
+            elem.clear()
+
+    def _finish(self, article):
+        if article["id"] is None:
+            # Fall back on the position of the article in the request
+            position = len(self._articles)
+            article["id"] = self._ids[position] if position < len(self._ids) else str(position)
+        body = article["body"] if article["has_body"] else article["sec"]
+        self._articles[article["id"]] = {
+            "title": article["title"] or "",
+            "abstract": article["abstract"] or "",
+            "body": "\n".join(body)[:SNIPPET_CHARS],
+            "has_body": article["has_body"] or bool(article["sec"]),
         }
+        self._article = None
 
-        article = root.find("article", ns)
-        if article is None:
-            return None
-
-        title = article.findtext(
-            ".//title-group/article-title", default="", namespaces=ns
-        )
-
-        abstract = article.find(".//abstract", namespaces=ns)
-        abstract_text = (
-            "".join(abstract.itertext()).strip() if abstract is not None else ""
-        )
-
-        body = []
-        body_elem = article.find(".//body", namespaces=ns)
-        if body_elem is not None:
-            for p in body_elem.findall(".//p", namespaces=ns):
-                if p.text:
-                    body.append(p.text.strip())
-        else:
-            for sec in article.findall(".//sec", namespaces=ns):
-                for p in sec.findall(".//p", namespaces=ns):
-                    if p.text:
-                        body.append(p.text.strip())
-
-        return {"title": title, "abstract": abstract_text, "body": "\n".join(body)}
+    def close(self):
+        self._parser.close()
+        return self._articles
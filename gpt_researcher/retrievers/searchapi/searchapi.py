@@ -2,9 +2,11 @@
 
 # libraries
 import os
-import requests
+import aiohttp
 import urllib.parse
 
+from ..client import get_http_client, run_sync
+
 
 class SearchApiSearch():
     """
@@ -37,6 +39,14 @@ class SearchApiSearch():
         Searches the query
         Returns:
 
+        """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
         """
         print("SearchApiSearch: Searching with query {0}...".format(self.query))
         """Useful for general internet search queries using SearchApi."""
@@ -58,25 +68,26 @@ class SearchApiSearch():
         search_response = []
 
         try:
-            response = requests.get(encoded_url, headers=headers, timeout=20)
-            if response.status_code == 200:
-                search_results = response.json()
-                if search_results:
-                    results = search_results["organic_results"]
-                    results_processed = 0
-                    for result in results:
-                        # skip youtube results
-                        if "youtube.com" in result["link"]:
-                            continue
-                        if results_processed >= max_results:
-                            break
-                        search_result = {
-                            "title": result["title"],
-                            "href": result["link"],
-                            "body": result["snippet"],
-                        }
-                        search_response.append(search_result)
-                        results_processed += 1
+            async with get_http_client().get(
+                encoded_url, headers=headers, timeout=aiohttp.ClientTimeout(total=20)
+            ) as response:
+                search_results = await response.json(content_type=None) if response.status == 200 else None
+            if search_results:
+                results = search_results["organic_results"]
+                results_processed = 0
+                for result in results:
+                    # skip youtube results
+                    if "youtube.com" in result["link"]:
+                        continue
+                    if results_processed >= max_results:
+                        break
+                    search_result = {
+                        "title": result["title"],
+                        "href": result["link"],
+                        "body": result["snippet"],
+                    }
+                    search_response.append(search_result)
+                    results_processed += 1
         except Exception as e:
             print(f"Error: {e}. Failed fetching sources. Resulting in empty response.")
             search_response = []
@@ -1,9 +1,12 @@
+import asyncio
 import os
 import json
-import requests
+import aiohttp
 from typing import List, Dict
 from urllib.parse import urljoin
 
+from ..client import get_http_client, run_sync
+
 
 class SearxSearch():
     """
@@ -43,6 +46,16 @@ class SearxSearch():
         Returns:
             List of dictionaries containing search results
         """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results: int = 10) -> List[Dict[str, str]]:
+        """
+        Searches the query using SearxNG API without blocking the event loop
+        Args:
+            max_results: Maximum number of results to return
+        Returns:
+            List of dictionaries containing search results
+        """
         search_url = urljoin(self.base_url, "search")
         
         params = {
@@ -53,13 +66,13 @@ class SearxSearch():
         }
 
         try:
-            response = requests.get(
+            async with get_http_client().get(
                 search_url,
                 params=params,
                 headers={'Accept': 'application/json'}
-            )
-            response.raise_for_status()
-            results = response.json()
+            ) as response:
+                response.raise_for_status()
+                results = json.loads(await response.text())
 
             # Normalize results to match the expected format
             search_response = []
@@ -71,7 +84,7 @@ class SearxSearch():
 
             return search_response
 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise Exception(f"Error querying SearxNG: {str(e)}")
         except json.JSONDecodeError:
             raise Exception("Error parsing SearxNG response")
@@ -1,6 +1,9 @@
+import asyncio
 from typing import Dict, List
 
-import requests
+import aiohttp
+
+from ..client import get_http_client, run_sync
 
 
 class SemanticScholarSearch:
@@ -26,6 +29,15 @@ class SemanticScholarSearch:
         """
         Perform the search on Semantic Scholar and return results.
 
+        :param max_results: Maximum number of results to retrieve
+        :return: List of dictionaries containing title, href, and body of each paper
+        """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results: int = 20) -> List[Dict[str, str]]:
+        """
+        Perform the search on Semantic Scholar without blocking the event loop.
+
         :param max_results: Maximum number of results to retrieve
         :return: List of dictionaries containing title, href, and body of each paper
         """
@@ -37,13 +49,14 @@ class SemanticScholarSearch:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-        except requests.RequestException as e:
+            async with get_http_client().get(self.BASE_URL, params=params) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"An error occurred while accessing Semantic Scholar API: {e}")
             return []
 
-        results = response.json().get("data", [])
+        results = data.get("data", [])
         search_result = []
 
         for result in results:
@@ -2,9 +2,11 @@
 
 # libraries
 import os
-import requests
+import aiohttp
 import json
 
+from ..client import get_http_client, run_sync
+
 
 class SerperSearch():
     """
@@ -37,6 +39,14 @@ class SerperSearch():
         Searches the query
         Returns:
 
+        """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
         """
         print("Searching with query {0}...".format(self.query))
         """Useful for general internet search queries using the Serp API."""
@@ -51,13 +61,14 @@ class SerperSearch():
         }
         data = json.dumps({"q": self.query, "num": max_results})
 
-        resp = requests.request("POST", url, timeout=10, headers=headers, data=data)
+        async with get_http_client().post(
+            url, timeout=aiohttp.ClientTimeout(total=10), headers=headers, data=data
+        ) as resp:
+            text = await resp.text()
 
         # Preprocess the results
-        if resp is None:
-            return
         try:
-            search_results = json.loads(resp.text)
+            search_results = json.loads(text)
         except Exception:
             return
         if search_results is None:
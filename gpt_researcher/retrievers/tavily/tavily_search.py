@@ -3,9 +3,11 @@
 # libraries
 import os
 from typing import Literal, Sequence, Optional
-import requests
+import aiohttp
 import json
 
+from ..client import get_http_client, run_sync
+
 
 class TavilySearch():
     """
@@ -43,7 +45,7 @@ class TavilySearch():
                 return ""
         return api_key
 
-    def _search(self,
+    async def _search(self,
                 query: str,
                 search_depth: Literal["basic", "advanced"] = "basic",
                 topic: str = "general",
@@ -75,24 +77,30 @@ class TavilySearch():
             "use_cache": use_cache,
         }
 
-        response = requests.post(self.base_url, data=json.dumps(
-            data), headers=self.headers, timeout=100)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            # Raises a HTTPError if the HTTP request returned an unsuccessful status code
+        async with get_http_client().post(
+            self.base_url, data=json.dumps(data), headers=self.headers, timeout=aiohttp.ClientTimeout(total=100)
+        ) as response:
+            # Raises a ClientResponseError if the HTTP request returned an unsuccessful status code
             response.raise_for_status()
+            return await response.json(content_type=None)
 
     def search(self, max_results=7):
         """
         Searches the query
         Returns:
 
+        """
+        return run_sync(self.asearch(max_results=max_results))
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
         """
         try:
             # Search the query
-            results = self._search(
+            results = await self._search(
                 self.query, search_depth="basic", max_results=max_results, topic=self.topic)
             sources = results.get("results", [])
             if not sources:
@@ -1,5 +1,6 @@
 
 from .beautiful_soup.beautiful_soup import BeautifulSoupScraper
+from .lxml_html.lxml_html import LxmlScraper
 from .web_base_loader.web_base_loader import WebBaseLoaderScraper
 from .arxiv.arxiv import ArxivScraper
 from .pymupdf.pymupdf import PyMuPDFScraper
@@ -9,6 +10,7 @@ from .scraper import Scraper
 
 __all__ = [
     "BeautifulSoupScraper",
+    "LxmlScraper",
     "WebBaseLoaderScraper",
     "ArxivScraper",
     "PyMuPDFScraper",
@@ -1,7 +1,8 @@
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
-from ..utils import get_relevant_images, extract_title, get_text_from_soup, clean_soup
+from ..latency import get_latency_profile
+from ..utils import get_relevant_images, extract_title, get_text_from_soup, clean_soup, read_limited
 
 class BeautifulSoupScraper:
 
@@ -21,22 +22,38 @@ class BeautifulSoupScraper:
         occurs during the process, an error message is printed and an empty string is returned.
         """
         try:
-            response = self.session.get(self.link, timeout=4)
-            soup = BeautifulSoup(
-                response.content, "lxml", from_encoding=response.encoding
-            )
+            # The body is streamed and cut at DEFAULT_MAX_PAGE_BYTES
+            latency = get_latency_profile()
+            response = self.session.get(self.link, timeout=latency.timeout_for(self.link), stream=True)
+            latency.record(self.link, response.elapsed.total_seconds())
+            content, _ = read_limited(response)
+            return self.parse(content, response.encoding)
 
-            soup = clean_soup(soup)
+        except Exception as e:
+            print("Error! : " + str(e))
+            return "", [], ""
 
-            content = get_text_from_soup(soup)
+    def parse(self, content, encoding=None) -> tuple:
+        """
+        Parses already fetched HTML into the scraped content. This lets the async ScrapeEngine
+        download the page once and hand the body to this scraper as a post-processor.
 
-            image_urls = get_relevant_images(soup, self.link)
-            
-            # Extract the title using the utility function
-            title = extract_title(soup)
+        Args:
+          content (bytes): The raw HTML of the page.
+          encoding (str, optional): The charset announced by the response, if any.
 
-            return content, image_urls, title
+        Returns:
+          tuple: The cleaned text content, the list of relevant image URLs and the page title.
+        """
+        soup = BeautifulSoup(content, "lxml", from_encoding=encoding)
 
-        except Exception as e:
-            print("Error! : " + str(e))
-            return "", [], ""
\ No newline at end of file
+        soup = clean_soup(soup)
+
+        content = get_text_from_soup(soup)
+
+        image_urls = get_relevant_images(soup, self.link)
+
+        # Extract the title using the utility function
+        title = extract_title(soup)
+
+        return content, image_urls, title
@@ -1,13 +1,10 @@
 from __future__ import annotations
 
 import traceback
-import pickle
 from pathlib import Path
 from sys import platform
+import logging
 import time
-import random
-import string
-import os
 
 from bs4 import BeautifulSoup
 from typing import Iterable, cast
@@ -17,46 +14,78 @@ from .processing.scrape_skills import (scrape_pdf_with_pymupdf,
 
 from urllib.parse import urljoin
 
+from .driver_pool import PooledDriver, get_driver_pool
 from ..utils import get_relevant_images, extract_title, get_text_from_soup, clean_soup
 
 FILE_DIR = Path(__file__).parent.parent
 
+# Quiet period after which a page is considered settled in lean mode
+DOM_QUIET_MS = 500
+# Script resolving once the DOM has been quiet, run after every scroll step in lean mode
+DOM_QUIET_SCRIPT = (FILE_DIR / "browser" / "js" / "dom_quiet.js").read_text()
+# URL patterns of the resources not downloaded in lean mode (Chrome)
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css", "*.mp4", "*.webm", "*.mp3",
+]
+
 class BrowserScraper:
     def __init__(self, url: str, session=None):
         self.url = url
         self.session = session
         self.selenium_web_browser = "chrome"
-        self.headless = False
+        # Pooled drivers stay open between scrapes, so they run without a window
+        self.headless = True
         self.user_agent = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
                            "AppleWebKit/537.36 (KHTML, like Gecko) "
                            "Chrome/128.0.0.0 Safari/537.36")
         self.driver = None
         self.use_browser_cookies = False
+        pool = get_driver_pool()
+        self.lean = pool.lean
+        self.page_timeout = pool.page_timeout
+        self.timings = {}
+        self.logger = logging.getLogger(__name__)
         self._import_selenium()  # Import only if used to avoid unnecessary dependencies
-        self.cookie_filename = f"{self._generate_random_string(8)}.pkl"
 
     def scrape(self) -> tuple:
         if not self.url:
             print("URL not specified")
             return "A URL was not specified, cancelling request to browse website.", [], ""
 
+        # Warm drivers are checked out from the shared pool instead of launching a browser per page
+        pool = get_driver_pool()
+        pool_key = (self.selenium_web_browser, self.headless, self.user_agent, self.use_browser_cookies, self.lean)
+        member = None
+        crashed = False
         try:
-            self.setup_driver()
-            self._visit_google_and_save_cookies()
-            self._load_saved_cookies()
+            member = pool.acquire(pool_key, self._start_pooled_driver)
+            self.driver = member.driver
             self._add_header()
 
             text, image_urls, title = self.scrape_text_with_selenium()
             return text, image_urls, title
         except Exception as e:
+            crashed = True
             print(f"An error occurred during scraping: {str(e)}")
             print("Full stack trace:")
             print(traceback.format_exc())
-            return f"An error occurred: {str(e)}\n\nStack trace:\n{traceback.format_exc()}", [], ""
+            # No content, like the other scrapers, so the error is not mistaken for the page
+            return "", [], ""
         finally:
-            if self.driver:
-                self.driver.quit()
-            self._cleanup_cookie_file()
+            if member is not None:
+                pool.release(pool_key, member, crashed=crashed)
+            self.driver = None
+
+    def _start_pooled_driver(self) -> PooledDriver:
+        """
+        Start a new driver for the pool. Its cookies are set once by visiting Google and stay in
+        the driver's cookie jar for every page it loads afterwards.
+        """
+        self.setup_driver()
+        self._visit_google_for_cookies()
+        return PooledDriver(self.driver)
 
     def _import_selenium(self):
         try:
@@ -94,6 +123,11 @@ class BrowserScraper:
         if self.headless:
             options.add_argument("--headless")
         options.add_argument("--enable-javascript")
+        if self.lean:
+            # Return from get() once the DOM is ready instead of waiting for every subresource
+            options.page_load_strategy = "eager"
+            if self.selenium_web_browser == "firefox":
+                options.set_preference("permissions.default.image", 2)
 
         try:
             if self.selenium_web_browser == "firefox":
@@ -103,10 +137,20 @@ class BrowserScraper:
             else:  # chrome
                 if platform == "linux" or platform == "linux2":
                     options.add_argument("--disable-dev-shm-usage")
-                    options.add_argument("--remote-debugging-port=9222")
+                    # Let Chrome pick a free port so several pooled drivers can run side by side
+                    options.add_argument("--remote-debugging-port=0")
                 options.add_argument("--no-sandbox")
-                options.add_experimental_option("prefs", {"download_restrictions": 3})
+                prefs = {"download_restrictions": 3}
+                if self.lean:
+                    prefs["profile.managed_default_content_settings.images"] = 2
+                options.add_experimental_option("prefs", prefs)
                 self.driver = webdriver.Chrome(options=options)
+                if self.lean:
+                    self.driver.execute_cdp_cmd("Network.enable", {})
+                    self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_PATTERNS})
+
+            if self.lean:
+                self.driver.set_page_load_timeout(self.page_timeout)
 
             if self.use_browser_cookies:
                 self._load_browser_cookies()
@@ -118,16 +162,6 @@ class BrowserScraper:
             print(traceback.format_exc())
             raise
 
-    def _load_saved_cookies(self):
-        """Load saved cookies before visiting the target URL"""
-        cookie_file = Path(self.cookie_filename)
-        if cookie_file.exists():
-            cookies = pickle.load(open(self.cookie_filename, "rb"))
-            for cookie in cookies:
-                self.driver.add_cookie(cookie)
-        else:
-            print("No saved cookies found.")
-
     def _load_browser_cookies(self):
         """Load cookies directly from the browser"""
         try:
@@ -149,21 +183,6 @@ class BrowserScraper:
         for cookie in cookies:
             self.driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain})
 
-    def _cleanup_cookie_file(self):
-        """Remove the cookie file"""
-        cookie_file = Path(self.cookie_filename)
-        if cookie_file.exists():
-            try:
-                os.remove(self.cookie_filename)
-            except Exception as e:
-                print(f"Failed to remove cookie file: {str(e)}")
-        else:
-            print("No cookie file found to remove.")
-
-    def _generate_random_string(self, length):
-        """Generate a random string of specified length"""
-        return "".join(random.choices(string.ascii_letters + string.digits, k=length))
-
     def _get_domain(self):
         """Extract domain from URL"""
         from urllib.parse import urlparse
@@ -172,35 +191,45 @@ class BrowserScraper:
         domain = urlparse(self.url).netloc
         return domain[4:] if domain.startswith("www.") else domain
 
-    def _visit_google_and_save_cookies(self):
-        """Visit Google and save cookies before navigating to the target URL"""
+    def _visit_google_for_cookies(self) -> None:
+        """Visit Google so that its cookies are set before navigating to the target URLs"""
         try:
             self.driver.get("https://www.google.com")
-            time.sleep(2)  # Wait for cookies to be set
-
-            # Save cookies to a file
-            cookies = self.driver.get_cookies()
-            pickle.dump(cookies, open(self.cookie_filename, "wb"))
-
-            # print("Google cookies saved successfully.")
+            # Wait for the page, and its cookies, to be set
+            WebDriverWait(self.driver, 2).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
         except Exception as e:
-            print(f"Failed to visit Google and save cookies: {str(e)}")
+            print(f"Failed to visit Google and set cookies: {str(e)}")
             print("Full stack trace:")
             print(traceback.format_exc())
 
     def scrape_text_with_selenium(self) -> tuple:
-        self.driver.get(self.url)
-
+        start = time.monotonic()
+        deadline = start + self.page_timeout
         try:
-            WebDriverWait(self.driver, 20).until(
+            self.driver.get(self.url)
+        except TimeoutException:
+            if not self.lean:
+                raise
+            # Keep whatever loaded before the deadline
+            self.driver.execute_script("window.stop();")
+            print(f"Page load deadline reached for {self.url}, using partial content")
+
+        # In lean mode waiting for the body is bounded by what is left of the page deadline
+        body_timeout = max(0, deadline - time.monotonic()) if self.lean else 20
+        try:
+            WebDriverWait(self.driver, body_timeout).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
         except TimeoutException as e:
             print("Timed out waiting for page to load")
             print(f"Full stack trace:\n{traceback.format_exc()}")
-            return "Page load timed out", [], ""
+            return "", [], ""
+        loaded = time.monotonic()
 
-        self._scroll_to_bottom()
+        self._scroll_to_bottom(deadline)
+        settled = time.monotonic()
 
         if self.url.endswith(".pdf"):
             text = scrape_pdf_with_pymupdf(self.url)
@@ -221,19 +250,46 @@ class BrowserScraper:
             image_urls = get_relevant_images(soup, self.url)
             title = extract_title(soup)
 
+        end = time.monotonic()
+        self.timings = {
+            "load": round(loaded - start, 2),
+            "settle": round(settled - loaded, 2),
+            "extract": round(end - settled, 2),
+            "total": round(end - start, 2),
+        }
+        self.logger.info(f"Browser timings for {self.url}: {self.timings}")
         return text, image_urls, title
 
-    def _scroll_to_bottom(self):
-        """Scroll to the bottom of the page to load all content"""
+    def _scroll_to_bottom(self, deadline: float | None = None):
+        """
+        Scroll to the bottom of the page to load all content. In lean mode each scroll step
+        waits for the DOM to stop changing rather than sleeping, bounded by the page deadline.
+        """
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         while True:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Wait for content to load
+            if self.lean:
+                remaining = deadline - time.monotonic() if deadline else self.page_timeout
+                if remaining <= 0:
+                    break
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                self._wait_for_dom_quiet(remaining)
+            else:
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(2)  # Wait for content to load
             new_height = self.driver.execute_script("return document.body.scrollHeight")
             if new_height == last_height:
                 break
             last_height = new_height
 
+    def _wait_for_dom_quiet(self, max_seconds: float) -> None:
+        """Wait until the DOM has been quiet for DOM_QUIET_MS, at most `max_seconds`"""
+        self.driver.set_script_timeout(max_seconds + 1)
+        self.driver.execute_async_script(
+            DOM_QUIET_SCRIPT,
+            DOM_QUIET_MS,
+            int(max_seconds * 1000),
+        )
+
     def _scroll_to_percentage(self, ratio: float) -> None:
         """Scroll to a percentage of the page"""
         if ratio < 0 or ratio > 1:
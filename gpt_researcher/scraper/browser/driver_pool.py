@@ -0,0 +1,156 @@
+import atexit
+import logging
+import threading
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES = 50
+DEFAULT_PAGE_TIMEOUT = 15
+
+
+class PooledDriver:
+    """
+    A warm webdriver checked out from the DriverPool, with the number of pages it has
+    loaded so far.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Bounded pool of reusable webdrivers.
+
+    Starting a browser costs several seconds and hundreds of MB, so drivers are kept warm
+    and shared between scrapes instead of being launched and quit for every page. A driver
+    is recycled after `max_pages` pages, or as soon as a scrape reports it crashed.
+    BrowserScraper runs in worker threads, so checkout blocks the calling thread until a
+    driver is available. The pool also carries the page-load settings shared by the
+    drivers it hands out.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_POOL_SIZE,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        lean: bool = True,
+        page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+          max_size (int): Maximum number of drivers alive at the same time.
+          max_pages (int): Number of pages after which a driver is replaced.
+          lean (bool): Whether drivers block non-essential resources and wait for the DOM to settle
+            instead of sleeping.
+          page_timeout (float): Hard deadline in seconds for loading and settling a page.
+        """
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.lean = lean
+        self.page_timeout = page_timeout
+        self.logger = logging.getLogger(__name__)
+        self._idle = {}
+        self._size = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, key, factory) -> PooledDriver:
+        """
+        Check out an idle driver created with the same settings, starting a new one if the
+        pool is not full, otherwise wait for one to be released.
+
+        Args:
+          key: Hashable description of the driver settings (browser, headless, user agent).
+          factory: Callable returning a new PooledDriver for these settings.
+
+        Returns:
+          PooledDriver: The checked out driver.
+        """
+        retired = None
+        with self._condition:
+            while True:
+                if self._idle.get(key):
+                    return self._idle[key].pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                if any(self._idle.values()):
+                    # Make room by retiring an idle driver started with other settings
+                    other_key = next(k for k, members in self._idle.items() if members)
+                    retired = self._idle[other_key].pop()
+                    break
+                self._condition.wait()
+
+        if retired is not None:
+            self._quit(retired)
+        try:
+            return factory()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, key, member: PooledDriver, crashed: bool = False) -> None:
+        """
+        Return a driver to the pool, recycling it if it crashed or reached its page budget.
+
+        Args:
+          key: The settings key the driver was acquired with.
+          member (PooledDriver): The driver to return.
+          crashed (bool): Whether the driver failed and must not be reused.
+        """
+        member.pages += 1
+        recycle = crashed or member.pages >= self.max_pages
+        if recycle:
+            self._quit(member)
+        with self._condition:
+            if recycle:
+                self._size -= 1
+            else:
+                self._idle.setdefault(key, []).append(member)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Quit all idle drivers"""
+        with self._condition:
+            members = [member for idle in self._idle.values() for member in idle]
+            self._idle = {}
+            self._size -= len(members)
+        for member in members:
+            self._quit(member)
+
+    def _quit(self, member: PooledDriver) -> None:
+        try:
+            member.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Failed to quit webdriver: {e}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool(cfg=None) -> DriverPool:
+    """
+    Get the process-wide DriverPool, creating it on first use.
+
+    Args:
+      cfg (Config, optional): The config providing the browser pool settings.
+
+    Returns:
+      DriverPool: The shared pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool(
+                max_size=getattr(cfg, "scraper_browser_pool_size", DEFAULT_POOL_SIZE),
+                max_pages=getattr(cfg, "scraper_browser_max_pages", DEFAULT_MAX_PAGES),
+                lean=getattr(cfg, "scraper_browser_lean", True),
+                page_timeout=getattr(cfg, "scraper_browser_page_timeout", DEFAULT_PAGE_TIMEOUT),
+            )
+            atexit.register(_pool.close)
+    return _pool
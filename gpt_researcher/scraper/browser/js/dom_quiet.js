@@ -0,0 +1,22 @@
+// Resolves once the DOM has not changed for `quietMs`, or after `maxMs` at the latest.
+// Called through execute_async_script: the last argument is the completion callback.
+const [quietMs, maxMs, done] = arguments;
+const start = Date.now();
+let quietTimer = null;
+let deadlineTimer = null;
+
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs);
+});
+
+function finish() {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(deadlineTimer);
+    done(Date.now() - start);
+}
+
+observer.observe(document, { childList: true, subtree: true, characterData: true });
+quietTimer = setTimeout(finish, quietMs);
+deadlineTimer = setTimeout(finish, maxMs);
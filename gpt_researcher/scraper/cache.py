@@ -0,0 +1,213 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from ..utils.urls import canonicalize_url
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_MB = 512
+
+
+def get_cache_key(url: str) -> str:
+    """
+    Get the key a URL is cached under: its canonical form, so that http and https, `www.`
+    and tracking parameter variants of a page share one entry
+    """
+    return canonicalize_url(url)
+
+
+class PageCache:
+    """
+    Persistent cache of scraped pages.
+
+    Pages are stored in SQLite as zlib-compressed JSON blobs together with the ETag and
+    Last-Modified validators of their response. A page younger than the TTL is served
+    locally; an older one is revalidated with a conditional GET, so an unchanged page costs
+    a 304 instead of a download and a parse. The cache is bounded in size and evicts the
+    least recently used pages first.
+    """
+
+    def __init__(self, path: str, ttl: int = DEFAULT_TTL, max_mb: int = DEFAULT_MAX_MB):
+        """
+        Initialize the cache.
+
+        Args:
+          path (str): Path of the SQLite database file.
+          ttl (int): Seconds a page is served without revalidation.
+          max_mb (int): Maximum total size of the stored pages in megabytes.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    validated_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        # Total size of the stored pages, kept up to date by put and _evict
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def get(self, url: str) -> dict | None:
+        """
+        Look up a page. Fresh lookups count as hits, stale or absent ones as misses.
+
+        Args:
+          url (str): The page URL.
+
+        Returns:
+          dict | None: The cached `raw_content`, `title`, `image_urls` and the `page_offsets` of
+          PDFs, the `etag` and `last_modified` validators and whether the page is still `fresh`,
+          or None.
+        """
+        key = get_cache_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, etag, last_modified, validated_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, key))
+            if now - row[3] < self.ttl:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        data, etag, last_modified, validated_at = row
+        page = json.loads(zlib.decompress(data))
+        page["etag"] = etag
+        page["last_modified"] = last_modified
+        page["fresh"] = now - validated_at < self.ttl
+        return page
+
+    def refresh(self, url: str) -> None:
+        """
+        Mark a cached page as fresh again after the server answered 304 Not Modified.
+
+        Args:
+          url (str): The page URL.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET validated_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, get_cache_key(url)),
+            )
+            self.revalidated += 1
+
+    def put(self, url: str, page: dict, etag: str | None = None, last_modified: str | None = None) -> None:
+        """
+        Store a scraped page, evicting the least recently used pages beyond the size bound.
+
+        Args:
+          url (str): The page URL.
+          page (dict): The scraped page with `raw_content`, `title` and `image_urls`.
+          etag (str, optional): The ETag header of the response.
+          last_modified (str, optional): The Last-Modified header of the response.
+        """
+        entry = {
+            "raw_content": page["raw_content"],
+            "title": page["title"],
+            "image_urls": page["image_urls"],
+        }
+        if page.get("page_offsets") is not None:
+            entry["page_offsets"] = page["page_offsets"]
+        data = zlib.compress(json.dumps(entry).encode("utf-8"))
+        key = get_cache_key(url)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                replaced = self._conn.execute("SELECT size FROM pages WHERE url = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, data, etag, last_modified, now, now, len(data)),
+                )
+                size = self._size + len(data) - (replaced[0] if replaced else 0)
+                size -= self._evict(size)
+            # Only counted once the transaction committed, a failed write leaves the size as is
+            self._size = size
+
+    def _evict(self, size: int) -> int:
+        """
+        Delete the least recently used pages until the cache fits its size bound.
+
+        Args:
+          size (int): The total size of the stored pages, including the page being written.
+
+        Returns:
+          int: The number of bytes freed.
+        """
+        if size <= self.max_bytes:
+            return 0
+        freed = 0
+        evicted = 0
+        for key, page_size in self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall():
+            if size - freed <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (key,))
+            freed += page_size
+            evicted += 1
+        self.logger.info(f"Page cache evicted {evicted} pages")
+        return freed
+
+    def stats(self) -> dict:
+        """Get the hit, miss and revalidation counters of the cache"""
+        with self._lock:
+            hits, misses, revalidated = self.hits, self.misses, self.revalidated
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "revalidated": revalidated,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_page_caches = {}
+
+
+def get_page_cache(cfg=None) -> PageCache | None:
+    """
+    Get the process-wide PageCache for the configured cache directory.
+
+    Args:
+      cfg (Config, optional): The config providing `cache_dir` and the page cache settings.
+
+    Returns:
+      PageCache | None: The shared cache, or None when no cache directory is configured.
+    """
+    cache_dir = getattr(cfg, "cache_dir", None)
+    if not cache_dir:
+        return None
+    path = os.path.join(cache_dir, "pages.sqlite")
+    if path not in _page_caches:
+        _page_caches[path] = PageCache(
+            path,
+            ttl=getattr(cfg, "scraper_cache_ttl", DEFAULT_TTL),
+            max_mb=getattr(cfg, "scraper_cache_max_mb", DEFAULT_MAX_MB),
+        )
+    return _page_caches[path]
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from .governor import DEFAULT_MAX_CONNECTIONS, ScrapeGovernor, get_scrape_governor
+from .latency import DEFAULT_TIMEOUT, LatencyProfile, get_client_timeout, get_latency_profile
+from .routing import PDF, SNIFF_BYTES, UNSUPPORTED, ContentTooLargeError, UnsupportedContentError, sniff_content_kind
+from .scheduler import HostScheduler
+
+DEFAULT_MAX_PER_HOST = 2
+
+
+class FetchResult:
+    """
+    The response of a single fetch made by the ScrapeEngine.
+    """
+
+    def __init__(self, url, status_code, headers, content, encoding=None, kind=None, truncated=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        # Format sniffed from the Content-Type and the first bytes: "pdf", "html" or "text"
+        self.kind = kind
+        # Whether the body was cut at the byte limit of the fetch
+        self.truncated = truncated
+
+
+class ScrapeEngine:
+    """
+    Async HTTP engine shared by the scrapers.
+
+    A single pooled aiohttp session is kept per event loop so that keep-alive connections,
+    DNS lookups and TLS sessions are reused across URLs, sub-queries and research tasks
+    instead of being rebuilt for every call. The session of a loop is closed when the loop
+    shuts down, so loops running concurrently in different threads never share one. Responses are transparently decompressed
+    (gzip/deflate, and brotli when the `Brotli` package is installed).
+    The engine also owns the HostScheduler that keeps scraping polite across all callers,
+    and times every response into a LatencyProfile from which per-domain timeouts are derived.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+        latency: LatencyProfile | None = None,
+        governor: ScrapeGovernor | None = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+          max_connections (int): Maximum number of open connections in the pool.
+          max_per_host (int): Maximum number of open connections to a single host.
+          timeout (float): Connect and read timeout in seconds when there is no latency profile.
+          latency (LatencyProfile, optional): Profile deriving the timeout of every request from
+            the response times of its domain.
+          governor (ScrapeGovernor, optional): Budget of sockets and threads shared by all callers.
+        """
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.latency = latency
+        self.scheduler = HostScheduler(max_per_host=max_per_host, max_connections=max_connections, governor=governor)
+        self.governor = self.scheduler.governor
+        # Pooled session of every running event loop, and the task closing it when the loop shuts down
+        self._sessions = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled session of the running event loop, creating it on first use.
+        Sessions are bound to the loop they were created in, so every loop using the engine
+        (e.g. successive `asyncio.run` calls, or a worker thread next to the server) gets its own.
+        """
+        loop = asyncio.get_running_loop()
+        session, closer = self._sessions.get(loop, (None, None))
+        if session is None or session.closed:
+            if closer is not None:
+                closer.cancel()
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ttl_dns_cache=300,
+            )
+            # Cookies are not shared between unrelated research tasks
+            session = aiohttp.ClientSession(
+                connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+            )
+            self._sessions[loop] = (session, loop.create_task(self._close_at_shutdown(loop, session)))
+        return session
+
+    async def _close_at_shutdown(self, loop, session: aiohttp.ClientSession) -> None:
+        """
+        Wait until the event loop shuts down, which cancels its remaining tasks as `asyncio.run`
+        does, and close its session
+        """
+        try:
+            await loop.create_future()
+        finally:
+            if self._sessions.get(loop, (None,))[0] is session:
+                del self._sessions[loop]
+            await session.close()
+
+    async def fetch(
+        self,
+        url: str,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        max_bytes: int = 0,
+        max_pdf_bytes: int = 0,
+    ) -> FetchResult:
+        """
+        Fetch a URL through the pooled session. The body is streamed and its format is
+        sniffed from the Content-Type and the first chunk, so unsupported binaries (videos,
+        archives, images...) are dropped before being downloaded. HTML and text bodies stop
+        downloading at `max_bytes` and are returned truncated; PDFs, which cannot be parsed
+        partially, are dropped when they exceed `max_pdf_bytes`.
+
+        Args:
+          url (str): The URL to fetch.
+          headers (dict, optional): Extra request headers, e.g. the User-Agent.
+          timeout (float, optional): Connect and read timeout in seconds, defaults to the timeout
+            of the URL's domain in the latency profile.
+          max_bytes (int, optional): Byte limit of HTML and text bodies, 0 for no limit.
+          max_pdf_bytes (int, optional): Byte limit of PDF bodies, 0 for no limit.
+
+        Returns:
+          FetchResult: The final URL, status code, headers, body, charset, format and truncation of the response.
+
+        Raises:
+          aiohttp.ClientResponseError: If the response status is 400 or above.
+          UnsupportedContentError: If the response is a format no scraper can extract text from.
+          ContentTooLargeError: If the response is a PDF larger than `max_pdf_bytes`.
+        """
+        if timeout is None:
+            timeout = self.latency.timeout_for(url) if self.latency is not None else self.timeout
+        client_timeout = get_client_timeout(timeout)
+        session = self._get_session()
+        try:
+            return await self._fetch(session, url, headers, client_timeout, max_bytes, max_pdf_bytes)
+        except asyncio.TimeoutError:
+            if self.latency is not None:
+                self.latency.record_timeout(url, timeout)
+            raise
+
+    async def _fetch(self, session, url, headers, client_timeout, max_bytes, max_pdf_bytes) -> FetchResult:
+        start = time.monotonic()
+        async with session.get(url, headers=headers, timeout=client_timeout, allow_redirects=True) as response:
+            if self.latency is not None:
+                self.latency.record(url, time.monotonic() - start)
+            response.raise_for_status()
+            if response.status == 304:
+                return FetchResult(str(response.url), response.status, response.headers, b"")
+
+            content_type = response.headers.get("Content-Type")
+            if content_type and sniff_content_kind(content_type, b"") == UNSUPPORTED:
+                # Declared media and archives are dropped before reading any of the body
+                response.close()
+                raise UnsupportedContentError(url, content_type)
+
+            chunks = []
+            size = 0
+            kind = None
+            limit = 0
+            truncated = False
+            async for chunk in response.content.iter_any():
+                chunks.append(chunk)
+                size += len(chunk)
+                if kind is None and size >= SNIFF_BYTES:
+                    kind = sniff_content_kind(content_type, b"".join(chunks))
+                    if kind == UNSUPPORTED:
+                        # Closing the response drops the connection instead of draining the body
+                        response.close()
+                        raise UnsupportedContentError(url, content_type)
+                    limit = max_pdf_bytes if kind == PDF else max_bytes
+                if limit and size > limit:
+                    response.close()
+                    if kind == PDF:
+                        raise ContentTooLargeError(url, content_type, limit)
+                    truncated = True
+                    break
+            content = b"".join(chunks)
+            if kind is None:
+                kind = sniff_content_kind(content_type, content)
+                if kind == UNSUPPORTED:
+                    raise UnsupportedContentError(url, content_type)
+                limit = max_pdf_bytes if kind == PDF else max_bytes
+                if limit and size > limit and kind == PDF:
+                    raise ContentTooLargeError(url, content_type, limit)
+            if limit and size > limit:
+                content = content[:limit]
+                truncated = True
+
+            return FetchResult(
+                url=str(response.url),
+                status_code=response.status,
+                headers=response.headers,
+                content=content,
+                encoding=response.charset,
+                kind=kind,
+                truncated=truncated,
+            )
+
+    async def close(self) -> None:
+        """Close the pooled session of the running event loop, the sessions of other loops are left open."""
+        session, closer = self._sessions.pop(asyncio.get_running_loop(), (None, None))
+        if closer is not None:
+            closer.cancel()
+        if session is not None:
+            await session.close()
+
+
+_engine = None
+
+
+def get_scrape_engine(cfg=None) -> ScrapeEngine:
+    """
+    Get the process-wide ScrapeEngine, creating it on first use. The connection limits
+    are read from the config of the first caller since the pool is shared by all of them.
+
+    Args:
+      cfg (Config, optional): The config providing the scraper connection limits.
+
+    Returns:
+      ScrapeEngine: The shared engine.
+    """
+    global _engine
+    if _engine is None:
+        _engine = ScrapeEngine(
+            max_connections=getattr(cfg, "scraper_max_connections", DEFAULT_MAX_CONNECTIONS),
+            max_per_host=getattr(cfg, "scraper_max_per_host", DEFAULT_MAX_PER_HOST),
+            latency=get_latency_profile(cfg),
+            governor=get_scrape_governor(cfg),
+        )
+    return _engine
@@ -0,0 +1,312 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+import aiohttp
+import requests
+
+from .cache import get_cache_key
+from .routing import UnsupportedContentError
+from .scheduler import get_host, parse_retry_after
+
+# Failure classes of a scraped URL
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+BLOCKED = "blocked"
+RATE_LIMITED = "rate_limited"
+NOT_FOUND = "not_found"
+CLIENT_ERROR = "client_error"
+SERVER_ERROR = "server_error"
+TOO_SHORT = "too_short"
+UNSUPPORTED = "unsupported"
+ERROR = "error"
+
+# Seconds during which a URL is not scraped again after a failure of each class
+FAILURE_TTLS = {
+    TIMEOUT: 10 * 60,
+    CONNECTION: 10 * 60,
+    BLOCKED: 60 * 60,
+    # Unless the server tells when to come back with Retry-After
+    RATE_LIMITED: 60,
+    NOT_FOUND: 24 * 60 * 60,
+    CLIENT_ERROR: 60 * 60,
+    SERVER_ERROR: 10 * 60,
+    TOO_SHORT: 60 * 60,
+    UNSUPPORTED: 24 * 60 * 60,
+    ERROR: 10 * 60,
+}
+
+# Failures telling that the whole domain is down or refusing us, rather than a single URL
+DOMAIN_FAILURES = {TIMEOUT, CONNECTION, BLOCKED, RATE_LIMITED, SERVER_ERROR}
+# Upper bound of the Retry-After delay a rate-limited URL is skipped for
+MAX_RETRY_AFTER = 60 * 60
+
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 60
+MAX_BREAKER_COOLDOWN = 30 * 60
+
+
+def classify_failure(error: BaseException) -> str:
+    """
+    Map an exception raised while scraping a URL to its failure class.
+
+    Args:
+      error (BaseException): The exception.
+
+    Returns:
+      str: The failure class, one of the keys of FAILURE_TTLS.
+    """
+    if isinstance(error, (asyncio.TimeoutError, requests.exceptions.Timeout)):
+        return TIMEOUT
+    if isinstance(error, aiohttp.ClientResponseError):
+        if error.status in (429, 503):
+            return RATE_LIMITED
+        if error.status in (401, 403):
+            return BLOCKED
+        if error.status in (404, 410):
+            return NOT_FOUND
+        return SERVER_ERROR if error.status >= 500 else CLIENT_ERROR
+    if isinstance(error, (aiohttp.ClientConnectionError, requests.exceptions.ConnectionError)):
+        return CONNECTION
+    if isinstance(error, UnsupportedContentError):
+        return UNSUPPORTED
+    return ERROR
+
+
+def get_failure_ttl(error: BaseException) -> float | None:
+    """
+    Get how long a URL should be skipped after a transient failure, as asked by the server.
+
+    Args:
+      error (BaseException): The exception raised while scraping the URL.
+
+    Returns:
+      float | None: The Retry-After delay of a rate-limited response, bounded by
+      MAX_RETRY_AFTER, or None to use the TTL of the failure class.
+    """
+    if not isinstance(error, aiohttp.ClientResponseError) or classify_failure(error) != RATE_LIMITED:
+        return None
+    retry_after = error.headers.get("Retry-After") if error.headers else None
+    return min(parse_retry_after(retry_after, FAILURE_TTLS[RATE_LIMITED]), MAX_RETRY_AFTER)
+
+
+class NegativeCache:
+    """
+    In-memory cache of the URLs that failed recently, so that later sub-queries and research
+    tasks do not pay the full timeout of a dead or blocking URL again. Every entry expires
+    after the TTL of its failure class. Failures are remembered per scraper, since a page
+    one scraper could not read may be read by another.
+    """
+
+    def __init__(self, ttls: dict | None = None, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+          ttls (dict, optional): Seconds a failure is remembered, per failure class.
+          max_entries (int): Maximum number of URLs remembered, oldest failures are dropped first.
+        """
+        self.ttls = {**FAILURE_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def add(self, url: str, failure: str, ttl: float | None = None, scraper: str | None = None) -> None:
+        """
+        Remember that a URL failed.
+
+        Args:
+          url (str): The scraped URL.
+          failure (str): The failure class.
+          ttl (float, optional): Seconds the failure is remembered, the TTL of its class when not set.
+          scraper (str, optional): The scraper that failed.
+        """
+        key = (scraper, get_cache_key(url))
+        if ttl is None:
+            ttl = self.ttls.get(failure, FAILURE_TTLS[ERROR])
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (failure, time.monotonic() + ttl)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, url: str, scraper: str | None = None) -> str | None:
+        """
+        Look up a URL.
+
+        Args:
+          url (str): The URL about to be scraped.
+          scraper (str, optional): The scraper about to scrape it.
+
+        Returns:
+          str | None: The class of its last failure, or None if it has not failed recently.
+        """
+        key = (scraper, get_cache_key(url))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            failure, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self.hits += 1
+            return failure
+
+    def stats(self) -> dict:
+        """Get the number of remembered failures, per class, and of URLs skipped thanks to them"""
+        with self._lock:
+            failures = {}
+            for failure, _ in self._entries.values():
+                failures[failure] = failures.get(failure, 0) + 1
+            return {"entries": len(self._entries), "failures": failures, "hits": self.hits}
+
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker. After `threshold` consecutive domain-level failures (timeouts,
+    refused connections, blocking and server errors) the circuit of the domain opens and its
+    URLs are not dispatched anymore. Once the cooldown has passed a single probe request is
+    let through: its success closes the circuit, its failure opens it again for twice as long.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+        max_cooldown: float = MAX_BREAKER_COOLDOWN,
+        max_domains: int = 10000,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+          threshold (int): Consecutive failures after which the circuit of a domain opens.
+          cooldown (float): Seconds before an open circuit is probed again.
+          max_cooldown (float): Upper bound of the cooldown, doubled after every failed probe.
+          max_domains (int): Maximum number of domains tracked, least recently seen are dropped.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_domains = max_domains
+        self._domains = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _state(self, domain: str) -> dict:
+        state = self._domains.pop(domain, None) or {
+            "failures": 0, "open_until": None, "cooldown": self.cooldown, "probing_since": None
+        }
+        self._domains[domain] = state
+        if len(self._domains) > self.max_domains:
+            self._domains.popitem(last=False)
+        return state
+
+    def allow(self, url: str) -> bool:
+        """
+        Check whether a URL may be dispatched to its domain.
+
+        Args:
+          url (str): The URL about to be scraped.
+
+        Returns:
+          bool: False if the circuit of the domain is open, or if another request is already probing it.
+        """
+        with self._lock:
+            state = self._domains.get(get_host(url))
+            if state is None or state["open_until"] is None:
+                return True
+            now = time.monotonic()
+            # A probe cancelled before reporting back must not keep the circuit open forever
+            probing = state["probing_since"] is not None and now - state["probing_since"] < state["cooldown"]
+            if now < state["open_until"] or probing:
+                self.rejected += 1
+                return False
+            state["probing_since"] = now
+            return True
+
+    def record_success(self, url: str) -> None:
+        """
+        Record that the domain of a URL answered, closing its circuit.
+
+        Args:
+          url (str): The scraped URL.
+        """
+        with self._lock:
+            self._domains.pop(get_host(url), None)
+
+    def record_failure(self, url: str) -> None:
+        """
+        Record a domain-level failure, opening the circuit of the domain after `threshold`
+        consecutive ones or when a probe fails.
+
+        Args:
+          url (str): The scraped URL.
+        """
+        with self._lock:
+            state = self._state(get_host(url))
+            state["failures"] += 1
+            if state["probing_since"] is not None:
+                state["cooldown"] = min(state["cooldown"] * 2, self.max_cooldown)
+                state["probing_since"] = None
+            elif state["failures"] < self.threshold or state["open_until"] is not None:
+                return
+            state["open_until"] = time.monotonic() + state["cooldown"]
+
+    def stats(self) -> dict:
+        """Get the open circuits with their consecutive failures, and the number of rejected URLs"""
+        with self._lock:
+            open_domains = {
+                domain: state["failures"]
+                for domain, state in self._domains.items()
+                if state["open_until"] is not None
+            }
+            return {"open": open_domains, "rejected": self.rejected}
+
+
+_negative_cache = None
+_circuit_breaker = None
+
+
+def get_negative_cache(cfg=None) -> NegativeCache | None:
+    """
+    Get the process-wide NegativeCache, shared by all concurrent research tasks.
+
+    Args:
+      cfg (Config, optional): The config providing `scraper_negative_cache`.
+
+    Returns:
+      NegativeCache | None: The shared cache, or None when it is disabled.
+    """
+    global _negative_cache
+    if not getattr(cfg, "scraper_negative_cache", True):
+        return None
+    if _negative_cache is None:
+        _negative_cache = NegativeCache()
+    return _negative_cache
+
+
+def get_circuit_breaker(cfg=None) -> CircuitBreaker | None:
+    """
+    Get the process-wide CircuitBreaker, shared by all concurrent research tasks. Its
+    settings are read from the config of the first caller.
+
+    Args:
+      cfg (Config, optional): The config providing the breaker threshold and cooldown.
+
+    Returns:
+      CircuitBreaker | None: The shared breaker, or None when the threshold is 0.
+    """
+    global _circuit_breaker
+    threshold = getattr(cfg, "scraper_breaker_threshold", DEFAULT_BREAKER_THRESHOLD)
+    if not threshold:
+        return None
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker(
+            threshold=threshold,
+            cooldown=getattr(cfg, "scraper_breaker_cooldown", DEFAULT_BREAKER_COOLDOWN),
+        )
+    return _circuit_breaker
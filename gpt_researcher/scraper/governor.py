@@ -0,0 +1,197 @@
+import asyncio
+import atexit
+import functools
+import threading
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_THREADS = 8
+
+
+class _SlotQueue:
+    """Connection slots in use and requests waiting for one, in a single event loop"""
+
+    def __init__(self):
+        self.in_use = 0
+        self.waiters = OrderedDict()
+
+
+class ScrapeGovernor:
+    """
+    Process-wide budget of the sockets and threads used for scraping, shared by every
+    research task running in the process.
+
+    Requests wait for one of `max_connections` slots. Waiting requests are queued per
+    research task and slots are handed out round-robin across the tasks, so a research
+    scraping fifty URLs does not starve one that only needs five. Blocking work (parsing,
+    browser scrapes, cache I/O) runs in a single bounded thread pool instead of each caller
+    growing its own. Under load requests queue up rather than exhausting file descriptors,
+    and the queue depth and utilization are exposed through `stats`.
+
+    Futures are bound to an event loop, so the connection slots are counted per running
+    loop, e.g. the server loop and the loop of a synchronous `Scraper.run` in a worker
+    thread each get the budget without resetting the other's.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS, max_threads: int = DEFAULT_MAX_THREADS):
+        """
+        Initialize the governor.
+
+        Args:
+          max_connections (int): Maximum concurrent requests across all research tasks.
+          max_threads (int): Size of the shared thread pool.
+        """
+        self.max_connections = max_connections
+        self.max_threads = max_threads
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="scrape")
+        self._queues = weakref.WeakKeyDictionary()
+        self._threads_busy = 0
+        self._threads_queued = 0
+        self._lock = threading.Lock()
+
+    def _get_queue(self) -> _SlotQueue:
+        """Get the slots of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            queue = self._queues.get(loop)
+            if queue is None:
+                queue = self._queues[loop] = _SlotQueue()
+            return queue
+
+    @asynccontextmanager
+    async def slot(self, tenant=None):
+        """
+        Wait for a connection slot.
+
+        Args:
+          tenant: Hashable key of the research task the request belongs to, slots are shared
+            fairly between tenants.
+        """
+        slots = self._get_queue()
+        if slots.in_use < self.max_connections and not slots.waiters:
+            slots.in_use += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            slots.waiters.setdefault(tenant, deque()).append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over as the request got cancelled, pass it on
+                    self._release(slots)
+                else:
+                    self._discard(slots, tenant, waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._release(slots)
+
+    def _discard(self, slots: _SlotQueue, tenant, waiter) -> None:
+        queue = slots.waiters.get(tenant)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del slots.waiters[tenant]
+
+    def _release(self, slots: _SlotQueue) -> None:
+        """Hand the freed slot to the next waiting tenant in round-robin order"""
+        while slots.waiters:
+            tenant, queue = next(iter(slots.waiters.items()))
+            waiter = queue.popleft()
+            del slots.waiters[tenant]
+            if queue:
+                # The tenant goes to the back of the line for its next request
+                slots.waiters[tenant] = queue
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        slots.in_use -= 1
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking function in the shared thread pool.
+
+        Args:
+          func: The function to run.
+          *args: Its positional arguments.
+          **kwargs: Its keyword arguments.
+
+        Returns:
+          The result of the function.
+        """
+        # Whether the job left the queue, either started by a thread or given up by its caller
+        dequeued = [False]
+        with self._lock:
+            self._threads_queued += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, functools.partial(self._run_counted, dequeued, func, *args, **kwargs)
+            )
+        finally:
+            # A call cancelled while queued never reaches a thread
+            self._dequeue(dequeued)
+
+    def _dequeue(self, dequeued: list) -> None:
+        with self._lock:
+            if not dequeued[0]:
+                dequeued[0] = True
+                self._threads_queued -= 1
+
+    def _run_counted(self, dequeued, func, *args, **kwargs):
+        self._dequeue(dequeued)
+        with self._lock:
+            self._threads_busy += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._threads_busy -= 1
+
+    def stats(self) -> dict:
+        """Get the usage and queue depth of the connection slots and of the thread pool"""
+        with self._lock:
+            threads = {"busy": self._threads_busy, "queued": self._threads_queued, "max": self.max_threads}
+            slots = list(self._queues.values())
+        in_use = sum(queue.in_use for queue in slots)
+        return {
+            "connections": {
+                "in_use": in_use,
+                "queued": sum(len(waiters) for queue in slots for waiters in list(queue.waiters.values())),
+                "waiting_tenants": sum(len(queue.waiters) for queue in slots),
+                "max": self.max_connections,
+            },
+            "threads": threads,
+            "utilization": round(in_use / self.max_connections, 2),
+        }
+
+    def close(self) -> None:
+        """Shut the thread pool down"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_governor = None
+
+
+def get_scrape_governor(cfg=None) -> ScrapeGovernor:
+    """
+    Get the process-wide ScrapeGovernor, creating it on first use. The budgets are read
+    from the config of the first caller since they are shared by all of them.
+
+    Args:
+      cfg (Config, optional): The config providing the connection and thread budgets.
+
+    Returns:
+      ScrapeGovernor: The shared governor.
+    """
+    global _governor
+    if _governor is None:
+        _governor = ScrapeGovernor(
+            max_connections=getattr(cfg, "scraper_max_connections", DEFAULT_MAX_CONNECTIONS),
+            max_threads=getattr(cfg, "scraper_max_threads", DEFAULT_MAX_THREADS),
+        )
+        atexit.register(_governor.close)
+    return _governor
@@ -0,0 +1,227 @@
+import atexit
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict, deque
+
+import aiohttp
+
+from .scheduler import get_host
+
+DEFAULT_TIMEOUT = 5
+DEFAULT_TIMEOUT_FLOOR = 2
+DEFAULT_TIMEOUT_CEILING = 20
+# Slack given to a domain over its 95th percentile response time
+TIMEOUT_MULTIPLIER = 2
+# Bound of a whole download, as a multiple of the connect and read timeout, so that a
+# response trickling in just under the read timeout cannot hang a scrape
+TOTAL_TIMEOUT_MULTIPLIER = 10
+WINDOW_SIZE = 50
+MIN_SAMPLES = 5
+
+logger = logging.getLogger(__name__)
+
+
+def get_client_timeout(timeout: float) -> aiohttp.ClientTimeout:
+    """
+    Get the aiohttp timeout of a request from its connect and read timeout.
+
+    Args:
+      timeout (float): The connect and read timeout in seconds.
+
+    Returns:
+      aiohttp.ClientTimeout: The timeout, the whole request bounded by TOTAL_TIMEOUT_MULTIPLIER times it.
+    """
+    return aiohttp.ClientTimeout(total=timeout * TOTAL_TIMEOUT_MULTIPLIER, sock_connect=timeout, sock_read=timeout)
+
+
+class LatencyProfile:
+    """
+    Rolling profile of the response times of every scraped domain, from which per-request
+    timeouts are derived: fast sites get little slack, slow but working sites are waited for.
+
+    The last WINDOW_SIZE response times of a domain are kept and the timeout of its next
+    request is twice their 95th percentile, clamped between the floor and the ceiling. A
+    timed out request is recorded as taking the whole timeout, so the profile of a domain
+    that got slower adapts upwards. Domains with too few samples get the default timeout.
+    The profile can be persisted to a JSON file to survive restarts.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        floor: float = DEFAULT_TIMEOUT_FLOOR,
+        ceiling: float = DEFAULT_TIMEOUT_CEILING,
+        default: float = DEFAULT_TIMEOUT,
+        max_domains: int = 10000,
+    ):
+        """
+        Initialize the profile, loading it from `path` if the file exists.
+
+        Args:
+          path (str, optional): Path of the JSON file the profile is persisted to.
+          floor (float): Minimum timeout in seconds.
+          ceiling (float): Maximum timeout in seconds.
+          default (float): Timeout in seconds of domains with too few samples.
+          max_domains (int): Maximum number of domains profiled, least recently seen are dropped.
+        """
+        self.path = path
+        self.floor = floor
+        self.ceiling = ceiling
+        self.default = min(max(default, floor), ceiling)
+        self.max_domains = max_domains
+        self._domains = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes the writes of the file, so that concurrent saves do not race on it
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        if path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                domains = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable latency profile {self.path}: {e}")
+            return
+        for domain, samples in domains.items():
+            self._domains[domain] = deque(samples, maxlen=WINDOW_SIZE)
+
+    def record(self, url: str, seconds: float) -> None:
+        """
+        Record the response time of a request.
+
+        Args:
+          url (str): The requested URL.
+          seconds (float): Time until the response headers were received.
+        """
+        domain = get_host(url)
+        with self._lock:
+            samples = self._domains.pop(domain, None) or deque(maxlen=WINDOW_SIZE)
+            samples.append(round(seconds, 3))
+            self._domains[domain] = samples
+            if len(self._domains) > self.max_domains:
+                self._domains.popitem(last=False)
+            self._dirty = True
+
+    def record_timeout(self, url: str, timeout: float) -> None:
+        """
+        Record a request that timed out, as if it had taken the whole timeout.
+
+        Args:
+          url (str): The requested URL.
+          timeout (float): The timeout that expired, in seconds.
+        """
+        self.record(url, timeout)
+
+    def percentiles(self, url: str) -> tuple | None:
+        """
+        Get the median and 95th percentile response times of a URL's domain.
+
+        Args:
+          url (str): A URL of the domain.
+
+        Returns:
+          tuple | None: The p50 and p95 in seconds, or None when the domain has too few samples.
+        """
+        return self._percentiles(get_host(url))
+
+    def _percentiles(self, domain: str) -> tuple | None:
+        with self._lock:
+            samples = self._domains.get(domain)
+            if samples is None or len(samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(samples)
+        last = len(ordered) - 1
+        return ordered[round(0.5 * last)], ordered[round(0.95 * last)]
+
+    def _timeout(self, percentiles: tuple | None) -> float:
+        if percentiles is None:
+            return self.default
+        return min(max(percentiles[1] * TIMEOUT_MULTIPLIER, self.floor), self.ceiling)
+
+    def timeout_for(self, url: str) -> float:
+        """
+        Get the timeout of the next request to a URL.
+
+        Args:
+          url (str): The URL about to be requested.
+
+        Returns:
+          float: The connect and read timeout in seconds.
+        """
+        return self._timeout(self.percentiles(url))
+
+    def stats(self) -> dict:
+        """Get the p50, p95 and timeout of every domain with enough samples"""
+        with self._lock:
+            domains = list(self._domains)
+        stats = {}
+        for domain in domains:
+            percentiles = self._percentiles(domain)
+            if percentiles is not None:
+                stats[domain] = {"p50": percentiles[0], "p95": percentiles[1], "timeout": self._timeout(percentiles)}
+        return stats
+
+    def save(self) -> None:
+        """
+        Write the profile to its file, if it has one and changed since the last save. The file
+        is replaced atomically, and a failed write is logged rather than raised since the
+        profile is only an optimization.
+        """
+        if self.path is None or not self._dirty:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                domains = {domain: list(samples) for domain, samples in self._domains.items()}
+                self._dirty = False
+            directory = os.path.dirname(self.path) or "."
+            tmp_path = None
+            try:
+                os.makedirs(directory, exist_ok=True)
+                with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+                    tmp_path = f.name
+                    json.dump(domains, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save the latency profile to {self.path}: {e}")
+                with self._lock:
+                    self._dirty = True
+                if tmp_path is not None:
+                    with contextlib.suppress(OSError):
+                        os.remove(tmp_path)
+
+
+_profile = None
+
+
+def get_latency_profile(cfg=None) -> LatencyProfile:
+    """
+    Get the process-wide LatencyProfile, creating it on first use. It is persisted in the
+    configured cache directory, if any, and its bounds are read from the config of the first
+    caller since the profile is shared by all of them.
+
+    Args:
+      cfg (Config, optional): The config providing `cache_dir` and the timeout bounds.
+
+    Returns:
+      LatencyProfile: The shared profile.
+    """
+    global _profile
+    if _profile is None:
+        cache_dir = getattr(cfg, "cache_dir", None)
+        _profile = LatencyProfile(
+            path=os.path.join(cache_dir, "latency.json") if cache_dir else None,
+            floor=getattr(cfg, "scraper_timeout_floor", DEFAULT_TIMEOUT_FLOOR),
+            ceiling=getattr(cfg, "scraper_timeout_ceiling", DEFAULT_TIMEOUT_CEILING),
+        )
+        atexit.register(_profile.save)
+    return _profile
@@ -0,0 +1,124 @@
+import re
+
+from lxml import etree, html
+
+from ..latency import get_latency_profile
+from ..utils import read_limited, score_images
+
+# Same tags and classes as `clean_soup`
+REMOVED_TAGS = ["script", "style", "footer", "header", "nav", "menu", "sidebar", "svg"]
+DISALLOWED_CLASSES = ["nav", "menu", "sidebar", "footer"]
+
+# Elements whose strings BeautifulSoup's `get_text` leaves out, though their tail is kept
+SKIPPED_TEXT_TAGS = ["template", "rp", "rt"]
+
+_REMOVED_XPATH = etree.XPath(
+    " | ".join(f"//{tag}" for tag in REMOVED_TAGS + SKIPPED_TEXT_TAGS)
+    + " | //*["
+    + " or ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in DISALLOWED_CLASSES
+    )
+    + "]"
+)
+_IMAGES_XPATH = etree.XPath("//img[@src]")
+_TITLE_XPATH = etree.XPath("//title")
+_WHITESPACE = re.compile(r"\s{2,}")
+
+
+class LxmlScraper:
+    """
+    Fast-path alternative to BeautifulSoupScraper producing the same text, images and title.
+    Elements to clean are selected in a single compiled XPath query, evaluated in C, and the
+    text is collected in one walk over lxml's tree that skips them, instead of the
+    BeautifulSoup tree walks with a Python callback per tag. Text nodes are kept separate as
+    in BeautifulSoup, so the output is identical.
+    """
+
+    def __init__(self, link, session=None):
+        self.link = link
+        self.session = session
+
+    def scrape(self):
+        """
+        Fetches the page with the session and extracts its content.
+
+        Returns:
+          tuple: The cleaned text content, the list of relevant image URLs and the page title.
+        """
+        try:
+            # The body is streamed and cut at DEFAULT_MAX_PAGE_BYTES
+            latency = get_latency_profile()
+            response = self.session.get(self.link, timeout=latency.timeout_for(self.link), stream=True)
+            latency.record(self.link, response.elapsed.total_seconds())
+            content, _ = read_limited(response)
+            return self.parse(content, response.encoding)
+
+        except Exception as e:
+            print("Error! : " + str(e))
+            return "", [], ""
+
+    def parse(self, content, encoding=None) -> tuple:
+        """
+        Parses already fetched HTML into the scraped content.
+
+        Args:
+          content (bytes): The raw HTML of the page.
+          encoding (str, optional): The charset announced by the response, if any.
+
+        Returns:
+          tuple: The cleaned text content, the list of relevant image URLs and the page title.
+        """
+        if not content or not content.strip():
+            return "", [], ""
+        if encoding is None and _is_utf8(content):
+            encoding = "utf-8"
+        parser = html.HTMLParser(encoding=encoding)
+        root = html.document_fromstring(content, parser=parser)
+
+        removed = set(_REMOVED_XPATH(root))
+        strings = []
+        walker = etree.iterwalk(root, events=("start", "end", "comment", "pi"))
+        for event, element in walker:
+            if event in ("comment", "pi"):
+                if element.tail:
+                    strings.append(element.tail)
+            elif event == "end":
+                if element.tail and element not in removed and element is not root:
+                    strings.append(element.tail)
+            elif element in removed:
+                walker.skip_subtree()
+                # Removed elements keep their tail text, like `Tag.decompose`
+                if element.tail:
+                    strings.append(element.tail)
+            elif element.text:
+                strings.append(element.text)
+
+        text = "\n".join(filter(None, (string.strip() for string in strings)))
+        text = _WHITESPACE.sub(" ", text)
+
+        images = [img for img in _IMAGES_XPATH(root) if not _is_removed(img, removed)]
+        image_urls = score_images(
+            [
+                (img.get("src"), (img.get("class") or "").split(), img.get("width"), img.get("height"))
+                for img in images
+            ],
+            self.link,
+        )
+
+        titles = [title for title in _TITLE_XPATH(root) if not _is_removed(title, removed)]
+        title = (titles[0].text or "") if titles else ""
+
+        return text, image_urls, title
+
+
+def _is_removed(element, removed: set) -> bool:
+    """Check whether an element or one of its ancestors was cleaned out of the page"""
+    return element in removed or any(ancestor in removed for ancestor in element.iterancestors())
+
+
+def _is_utf8(content: bytes) -> bool:
+    try:
+        content.decode("utf-8")
+        return True
+    except UnicodeDecodeError:
+        return False
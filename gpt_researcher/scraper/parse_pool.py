@@ -0,0 +1,130 @@
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .governor import ScrapeGovernor, get_scrape_governor
+
+DEFAULT_MAX_MB = 5
+
+
+def _parse_in_worker(scraper_class, link, content, encoding):
+    """
+    Run the parse step of a scraper on fetched content.
+    Runs in worker processes, hence a module level function.
+    """
+    return scraper_class(link).parse(content, encoding)
+
+
+class ParsePool:
+    """
+    Process pool parsing fetched pages off the scraper threads.
+
+    BeautifulSoup and lxml tree walks are CPU-bound pure Python, so parsing in threads
+    serializes on the GIL and competes with the event loop serving the app. The pool ships
+    the raw bytes of a page to a worker process, which runs the scraper's `parse` step and
+    sends back the text, images and title. Pages above the size cap are truncated before
+    being shipped. Pages whose worker crashed are parsed again on the governor threads.
+    """
+
+    def __init__(self, max_workers: int, max_mb: float = DEFAULT_MAX_MB, governor: ScrapeGovernor | None = None):
+        """
+        Initialize the pool. Worker processes are only started on the first parse.
+
+        Args:
+          max_workers (int): Number of worker processes.
+          max_mb (float): Size in megabytes above which a page is truncated before parsing.
+          governor (ScrapeGovernor, optional): The governor whose threads parse pages when a
+            worker crashed, the process-wide one when not set.
+        """
+        self.max_workers = max_workers
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.governor = governor or get_scrape_governor()
+        self.logger = logging.getLogger(__name__)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers do not inherit the threads, locks and sockets of the scraping process
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def parse(self, scraper_class, link: str, content: bytes, encoding: str | None = None) -> tuple:
+        """
+        Parse fetched content in a worker process.
+
+        Args:
+          scraper_class: The scraper class whose `parse` method handles the content.
+          link (str): The URL the content was fetched from.
+          content (bytes): The raw body of the response.
+          encoding (str, optional): The charset announced by the response, if any.
+
+        Returns:
+          tuple: The scraped content, image URLs and title, and whether the content was truncated
+          at the size cap.
+        """
+        truncated = len(content) > self.max_bytes
+        if truncated:
+            self.logger.info(f"Truncating {link} from {len(content)} to {self.max_bytes} bytes before parsing")
+            content = content[:self.max_bytes]
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            content, image_urls, title = await loop.run_in_executor(
+                executor, _parse_in_worker, scraper_class, link, content, encoding
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory), start a fresh pool for the next pages
+            self.logger.warning(f"Parse worker crashed on {link}, parsing it in a thread")
+            self._close(executor)
+            content, image_urls, title = await self.governor.run(
+                _parse_in_worker, scraper_class, link, content, encoding
+            )
+        return content, image_urls, title, truncated
+
+    def _close(self, executor: ProcessPoolExecutor | None = None) -> None:
+        """Shut the given pool down, or the current one, unless it has already been replaced"""
+        with self._lock:
+            if self._executor is None or (executor is not None and executor is not self._executor):
+                return
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def close(self) -> None:
+        """Shut the worker processes down"""
+        self._close()
+
+
+_parse_pool = None
+
+
+def get_parse_pool(cfg=None) -> ParsePool | None:
+    """
+    Get the process-wide ParsePool, creating it on first use.
+
+    Args:
+      cfg (Config, optional): The config providing the parse pool settings.
+
+    Returns:
+      ParsePool | None: The shared pool, or None when pages are parsed in threads.
+    """
+    global _parse_pool
+    workers = getattr(cfg, "scraper_parse_workers", 0)
+    if not workers:
+        return None
+    if _parse_pool is None:
+        _parse_pool = ParsePool(
+            max_workers=workers,
+            max_mb=getattr(cfg, "scraper_parse_max_mb", DEFAULT_MAX_MB),
+            governor=get_scrape_governor(cfg),
+        )
+        atexit.register(_parse_pool.close)
+    return _parse_pool
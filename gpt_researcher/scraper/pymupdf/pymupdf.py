@@ -1,22 +1,111 @@
+import multiprocessing
 import os
+import re
 import requests
-import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlparse
-from langchain_community.document_loaders import PyMuPDFLoader
+
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF < 1.24.3 only ships the `fitz` module
+    import fitz as pymupdf
+
+from ..latency import get_latency_profile
+
+# Default limits of a single document, see SCRAPER_MAX_PDF_BYTES and SCRAPER_MAX_PDF_PAGES.
+# Documents larger than the byte limit are not downloaded or parsed, pages beyond the page
+# budget are not extracted
+MAX_PDF_BYTES = 20 * 1024 * 1024
+MAX_PDF_PAGES = 200
+# Documents with at least this many pages are extracted in parallel across processes
+PARALLEL_MIN_PAGES = 32
+
+_process_pool = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the process pool used to extract large documents, creating it on first use"""
+    global _process_pool
+    if _process_pool is None:
+        # Spawned workers do not inherit the threads, locks and sockets of the scraping process
+        _process_pool = ProcessPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def _extract_page_range(content: bytes, start: int, stop: int) -> list:
+    """
+    Extract the cleaned text of the pages [start, stop) of an in-memory PDF.
+    Runs in worker processes, hence a module level function.
+    """
+    with pymupdf.open(stream=content, filetype="pdf") as doc:
+        return [_clean_page_text(doc[i].get_text("text")) for i in range(start, stop)]
+
+
+def _clean_page_text(text: str) -> str:
+    """Remove trailing spaces and runs of blank lines left by the PDF layout"""
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def extract_pdf_text(content: bytes, max_pages: int = MAX_PDF_PAGES, parallel_min_pages: int = PARALLEL_MIN_PAGES) -> tuple:
+    """
+    Extract the text of an in-memory PDF, page by page.
+
+    Args:
+      content (bytes): The PDF document.
+      max_pages (int): Maximum number of pages to extract, 0 for no limit.
+      parallel_min_pages (int): Page count from which pages are extracted across a process pool.
+
+    Returns:
+      tuple: The concatenated text, the character offset at which each page starts, and the
+      document title from its metadata.
+    """
+    with pymupdf.open(stream=content, filetype="pdf") as doc:
+        page_count = min(doc.page_count, max_pages) if max_pages else doc.page_count
+        title = (doc.metadata or {}).get("title") or ""
+        workers = min(4, os.cpu_count() or 1)
+        if page_count < parallel_min_pages or workers < 2:
+            pages = [_clean_page_text(doc[i].get_text("text")) for i in range(page_count)]
+        else:
+            pages = None
+
+    if pages is None:
+        step = -(-page_count // workers)
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        pool = _get_process_pool()
+        futures = [pool.submit(_extract_page_range, content, start, stop) for start, stop in ranges]
+        pages = [page for future in futures for page in future.result()]
+
+    text = ""
+    page_offsets = []
+    for page in pages:
+        if text:
+            text += "\n\n"
+        page_offsets.append(len(text))
+        text += page
+    return text, page_offsets, title
 
 
 class PyMuPDFScraper:
 
-    def __init__(self, link, session=None):
+    def __init__(self, link, session=None, max_bytes=MAX_PDF_BYTES, max_pages=MAX_PDF_PAGES):
         """
         Initialize the scraper with a link and an optional session.
 
         Args:
           link (str): The URL or local file path of the PDF document.
           session (requests.Session, optional): An optional session for making HTTP requests.
+          max_bytes (int, optional): Size above which the document is skipped, 0 for no limit.
+          max_pages (int, optional): Maximum number of pages extracted, 0 for no limit.
         """
         self.link = link
         self.session = session
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        # Character offset of every extracted page in the scraped content
+        self.page_offsets = []
 
     def is_url(self) -> bool:
         """
@@ -31,35 +120,58 @@ class PyMuPDFScraper:
         except Exception:
             return False
 
-    def scrape(self) -> str:
+    def scrape(self) -> tuple:
         """
-        The `scrape` function uses PyMuPDFLoader to load a document from the provided link (either URL or local file)
-        and returns the document as a string.
+        The `scrape` function downloads the PDF from the provided link (either URL or local file) into
+        memory and extracts its text.
 
         Returns:
-          str: A string representation of the loaded document.
+          tuple: The document text, an empty list of images and the document title.
         """
         try:
             if self.is_url():
-                response = requests.get(self.link, timeout=5, stream=True)
+                latency = get_latency_profile()
+                response = requests.get(self.link, timeout=latency.timeout_for(self.link), stream=True)
+                latency.record(self.link, response.elapsed.total_seconds())
                 response.raise_for_status()
 
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                    temp_filename = temp_file.name  # Get the temporary file name
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)  # Write the downloaded content to the temporary file
-
-                loader = PyMuPDFLoader(temp_filename)
-                doc = loader.load()
-
-                os.remove(temp_filename)
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=65536):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if self.max_bytes and size > self.max_bytes:
+                        response.close()
+                        print(f"PDF larger than {self.max_bytes} bytes, skipping : {self.link}")
+                        return "", [], ""
+                content = b"".join(chunks)
             else:
-                loader = PyMuPDFLoader(self.link)
-                doc = loader.load()
+                with open(self.link, "rb") as f:
+                    content = f.read()
 
-            return str(doc)
+            return self.parse(content)
 
         except requests.exceptions.Timeout:
             print(f"Download timed out. Please check the link : {self.link}")
         except Exception as e:
             print(f"Error loading PDF : {self.link} {e}")
+        return "", [], ""
+
+    def parse(self, content, encoding=None) -> tuple:
+        """
+        Parses an already downloaded PDF from memory. This lets the async ScrapeEngine download the
+        document once and hand the bytes to this scraper as a post-processor.
+
+        Args:
+          content (bytes): The raw bytes of the PDF document.
+          encoding (str, optional): Unused, kept for parity with the HTML scrapers.
+
+        Returns:
+          tuple: The document text, an empty list of images and the document title.
+        """
+        if self.max_bytes and len(content) > self.max_bytes:
+            print(f"PDF larger than {self.max_bytes} bytes, skipping : {self.link}")
+            return "", [], ""
+
+        text, self.page_offsets, title = extract_pdf_text(content, max_pages=self.max_pages)
+        return text, [], title
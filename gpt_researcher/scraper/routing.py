@@ -0,0 +1,104 @@
+# Number of leading bytes of a response inspected to recognise its format
+SNIFF_BYTES = 2048
+
+PDF = "pdf"
+HTML = "html"
+TEXT = "text"
+UNSUPPORTED = "unsupported"
+
+# Signatures of formats the scrapers cannot extract text from
+_BINARY_SIGNATURES = (
+    b"PK\x03\x04",  # zip, docx, xlsx, epub
+    b"\x1f\x8b",  # gzip
+    b"7z\xbc\xaf\x27\x1c",
+    b"Rar!\x1a\x07",
+    b"\x89PNG\r\n\x1a\n",
+    b"\xff\xd8\xff",  # jpeg
+    b"GIF87a",
+    b"GIF89a",
+    b"\x1a\x45\xdf\xa3",  # webm, mkv
+    b"OggS",
+    b"ID3",  # mp3
+    b"fLaC",
+    b"MZ",  # windows executables
+    b"\x7fELF",
+)
+_HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body")
+_SUPPORTED_TEXT_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/javascript",
+)
+
+_UNSUPPORTED_TYPES = (
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-tar",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/vnd.rar",
+)
+
+
+class UnsupportedContentError(Exception):
+    """Raised when a response carries a format no scraper can extract text from"""
+
+    def __init__(self, url: str, content_type: str):
+        super().__init__(f"Unsupported content type {content_type or 'unknown'} for {url}")
+        self.url = url
+        self.content_type = content_type
+
+
+class ContentTooLargeError(UnsupportedContentError):
+    """Raised when a document that cannot be parsed partially, such as a PDF, exceeds its size cap"""
+
+    def __init__(self, url: str, content_type: str, max_bytes: int):
+        Exception.__init__(self, f"{content_type or 'Document'} larger than {max_bytes} bytes for {url}")
+        self.url = url
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+
+
+def sniff_content_kind(content_type: str | None, head: bytes) -> str:
+    """
+    Recognise the format of a response from its Content-Type header and the magic bytes of
+    its first chunk. Magic bytes win over the header, which servers often get wrong
+    (e.g. PDFs served as `application/octet-stream` or `text/html`).
+
+    Args:
+      content_type (str | None): The Content-Type header of the response.
+      head (bytes): The first bytes of the body.
+
+    Returns:
+      str: One of "pdf", "html", "text" or "unsupported".
+    """
+    stripped = head.lstrip()
+    if stripped.startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(_BINARY_SIGNATURES) or _is_riff_or_iso_media(head):
+        return UNSUPPORTED
+    if stripped[:256].lower().startswith(_HTML_MARKERS):
+        return HTML
+
+    mime = (content_type or "").split(";")[0].strip().lower()
+    if mime == "application/pdf":
+        return PDF
+    if mime in ("text/html", "application/xhtml+xml"):
+        return HTML
+    if mime.startswith(("image/", "video/", "audio/", "font/")) or mime in _UNSUPPORTED_TYPES:
+        return UNSUPPORTED
+    if mime.startswith("text/") or mime in _SUPPORTED_TEXT_TYPES or mime.endswith("+xml"):
+        return TEXT
+
+    # Unknown or generic types like application/octet-stream
+    if b"\x00" in head:
+        return UNSUPPORTED
+    return TEXT if head else HTML
+
+
+def _is_riff_or_iso_media(head: bytes) -> bool:
+    """Recognise RIFF (webp, wav, avi) and ISO base media (mp4, mov, heic) containers"""
+    return head.startswith(b"RIFF") or head[4:8] == b"ftyp"
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager
+from itertools import zip_longest
+from urllib.parse import urlparse
+
+from .governor import ScrapeGovernor
+
+DEFAULT_BACKOFF = 5
+MAX_BACKOFF = 30
+
+
+def get_host(url: str) -> str:
+    """Get the lowercased host of a URL"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: str | None, default: float) -> float:
+    """
+    Get the delay in seconds requested by a Retry-After header.
+
+    Args:
+      value (str, optional): The header value, in seconds or as an HTTP date.
+      default (float): The delay when there is no header or it cannot be parsed.
+
+    Returns:
+      float: The non-negative delay in seconds.
+    """
+    if not value:
+        return default
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+def interleave_by_host(urls: list) -> list:
+    """
+    Reorder URLs round-robin across their hosts so that several results from the same
+    domain are not queued back to back in front of the other hosts.
+
+    Args:
+      urls (list): The URLs to reorder.
+
+    Returns:
+      list: The same URLs, interleaved by host.
+    """
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(get_host(url), []).append(url)
+    return [url for group in zip_longest(*by_host.values()) for url in group if url is not None]
+
+
+class HostScheduler:
+    """
+    Politeness scheduler for scraping.
+
+    Caps the number of in-flight requests per host and globally. A request first waits
+    for its host, and only then for a global slot of the ScrapeGovernor, so requests queued
+    behind a slow or throttled host never hold a global slot that a fast host could use.
+    Hosts that answer with 429/503 are backed off before new requests are dispatched to them.
+    asyncio semaphores are bound to an event loop, so the per-host slots are kept per
+    running loop while the backoffs are shared by all of them.
+    """
+
+    def __init__(self, max_per_host: int = 2, max_connections: int = 20, governor: ScrapeGovernor | None = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+          max_per_host (int): Maximum concurrent requests to a single host.
+          max_connections (int): Maximum concurrent requests overall, when no governor is given.
+          governor (ScrapeGovernor, optional): The budget of global slots, shared with other schedulers.
+        """
+        self.max_per_host = max_per_host
+        self.governor = governor or ScrapeGovernor(max_connections=max_connections)
+        self.max_connections = self.governor.max_connections
+        self._loop_hosts = weakref.WeakKeyDictionary()
+        self._not_before = {}
+        self._lock = threading.Lock()
+
+    def _get_hosts(self) -> dict:
+        """Get the semaphore and number of requests of every active host in the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            hosts = self._loop_hosts.get(loop)
+            if hosts is None:
+                hosts = self._loop_hosts[loop] = {}
+            return hosts
+
+    @asynccontextmanager
+    async def slot(self, url: str, tenant=None):
+        """
+        Wait until a request to the host of `url` may be dispatched.
+
+        Args:
+          url (str): The URL about to be fetched.
+          tenant: Key of the research task the request belongs to, global slots are shared
+            fairly between tenants.
+        """
+        hosts = self._get_hosts()
+        host = get_host(url)
+        if host not in hosts:
+            hosts[host] = [asyncio.Semaphore(self.max_per_host), 0]
+        state = hosts[host]
+        state[1] += 1
+        try:
+            async with state[0]:
+                delay = self._not_before.get(host, 0) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                async with self.governor.slot(tenant):
+                    yield
+        finally:
+            state[1] -= 1
+            if not state[1]:
+                # Drop idle hosts so a long-running server does not accumulate semaphores
+                del hosts[host]
+                if self._not_before.get(host, 0) <= time.monotonic():
+                    self._not_before.pop(host, None)
+
+    def backoff(self, url: str, retry_after: str | None = None) -> None:
+        """
+        Hold back new requests to a host that throttled us.
+
+        Args:
+          url (str): The throttled URL.
+          retry_after (str, optional): The Retry-After header value, if any.
+        """
+        delay = min(parse_retry_after(retry_after, DEFAULT_BACKOFF), MAX_BACKOFF)
+        host = get_host(url)
+        self._not_before[host] = max(self._not_before.get(host, 0), time.monotonic() + delay)
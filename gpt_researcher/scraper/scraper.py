@@ -1,7 +1,7 @@
-from concurrent.futures.thread import ThreadPoolExecutor
-from functools import partial
 from colorama import Fore, init
 
+import aiohttp
+import asyncio
 import requests
 import subprocess
 import sys
@@ -11,11 +11,47 @@ import logging
 from . import (
     ArxivScraper,
     BeautifulSoupScraper,
+    LxmlScraper,
     PyMuPDFScraper,
     WebBaseLoaderScraper,
     BrowserScraper,
     TavilyExtract
 )
+from .engine import get_scrape_engine
+from .failures import (
+    DOMAIN_FAILURES,
+    TOO_SHORT,
+    classify_failure,
+    get_circuit_breaker,
+    get_failure_ttl,
+    get_negative_cache,
+)
+from .cache import get_page_cache
+from .parse_pool import get_parse_pool
+from .pymupdf.pymupdf import MAX_PDF_BYTES, MAX_PDF_PAGES
+from .browser.driver_pool import get_driver_pool
+from .routing import PDF, UnsupportedContentError
+from .scheduler import get_host, interleave_by_host
+from .tiered import MIN_CONTENT_LENGTH, get_escalation_tracker, looks_like_js_shell
+from .utils import DEFAULT_MAX_PAGE_BYTES, DEFAULT_MAX_PAGE_CHARS, truncate_text
+
+SCRAPER_CLASSES = {
+    "pdf": PyMuPDFScraper,
+    "arxiv": ArxivScraper,
+    "bs": BeautifulSoupScraper,
+    "lxml": LxmlScraper,
+    "web_base_loader": WebBaseLoaderScraper,
+    "browser": BrowserScraper,
+    "tavily_extract": TavilyExtract,
+    # Cheap HTTP scrape first, escalated to the fallback scraper when the page needs a browser
+    "tiered": BeautifulSoupScraper,
+}
+
+# Engines extracting the content of static HTML pages, selected with SCRAPER_HTML_EXTRACTOR
+HTML_EXTRACTORS = {
+    "bs": BeautifulSoupScraper,
+    "lxml": LxmlScraper,
+}
 
 
 class Scraper:
@@ -23,29 +59,142 @@ class Scraper:
     Scraper class to extract the content from the links
     """
 
-    def __init__(self, urls, user_agent, scraper):
+    def __init__(self, urls, user_agent, scraper, cfg=None, tenant=None):
         """
         Initialize the Scraper class.
         Args:
             urls:
+            user_agent:
+            scraper:
+            cfg: Config providing the scraper limits (optional)
+            tenant: Key of the research task scraping, connection slots are shared fairly
+                between tenants (optional, defaults to this scraper)
         """
         self.urls = urls
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": user_agent})
         self.scraper = scraper
-        if self.scraper == "tavily_extract":
-            self._check_pkg(self.scraper)
+        # Scraper escalated to by the tiered mode when the HTTP tier comes back empty
+        self.fallback_scraper = getattr(cfg, "scraper_fallback", "browser")
+        # Scrapers reading pages differently do not share their failures
+        self.failure_scope = f"tiered:{self.fallback_scraper}" if scraper == "tiered" else scraper
+        self.html_scraper = HTML_EXTRACTORS.get(getattr(cfg, "scraper_html_extractor", "bs"))
+        if self.html_scraper is None:
+            raise Exception("HTML extractor not found.")
+        # Upper bounds on the download and the extracted text of a single page
+        self.max_page_bytes = getattr(cfg, "scraper_max_page_bytes", DEFAULT_MAX_PAGE_BYTES)
+        self.max_page_chars = getattr(cfg, "scraper_max_page_chars", DEFAULT_MAX_PAGE_CHARS)
+        self.max_pdf_bytes = getattr(cfg, "scraper_max_pdf_bytes", MAX_PDF_BYTES)
+        self.max_pdf_pages = getattr(cfg, "scraper_max_pdf_pages", MAX_PDF_PAGES)
+        self.truncated_pages = 0
+        # Links whose scrape was cancelled by the deadline or by the consumer of the last stream
+        self.abandoned_urls = []
+        if "tavily_extract" in self._active_scrapers():
+            self._check_pkg("tavily_extract")
+        self.engine = get_scrape_engine(cfg)
+        self.governor = self.engine.governor
+        self.tenant = id(self) if tenant is None else tenant
+        self.page_cache = get_page_cache(cfg)
+        self.parse_pool = get_parse_pool(cfg)
+        self.escalations = get_escalation_tracker()
+        self.negative_cache = get_negative_cache(cfg)
+        self.breaker = get_circuit_breaker(cfg)
+        if "browser" in self._active_scrapers():
+            # Size the shared webdriver pool from the config before the first browser scrape
+            get_driver_pool(cfg)
         self.logger = logging.getLogger(__name__)
 
     def run(self):
         """
-        Extracts the content from the links
+        Extracts the content from the links. Synchronous wrapper around `scrape` for callers
+        that are not running inside an event loop. The engine is shared with the other
+        callers, its session of the short-lived loop created by asyncio.run is closed when
+        that loop shuts down.
+        """
+        return asyncio.run(self.scrape())
+
+    async def scrape(self, urls=None, deadline=None, min_pages=0):
+        """
+        Extracts the content from the links concurrently on the running event loop. The links
+        are interleaved by host and dispatched through the engine's HostScheduler.
+
+        Args:
+          urls: The links to scrape, defaults to the links the Scraper was created with.
+          deadline: Seconds after which the scrapes still in flight are abandoned (optional).
+          min_pages: Pages to scrape before the deadline may abandon the others.
+
+        Returns:
+          list: The scraped pages, excluding those without content, in completion order.
+        """
+        return [page async for page in self.stream(urls, deadline, min_pages)]
+
+    async def stream(self, urls=None, deadline=None, min_pages=0):
+        """
+        Extracts the content from the links concurrently, yielding every page as soon as it is
+        scraped so that consumers can process it while slower sites are still loading. Closing
+        the generator early cancels the scrapes still in flight.
+        Once the deadline has passed and at least `min_pages` pages were scraped, the stream
+        ends and the remaining scrapes are cancelled. Their links are kept in `abandoned_urls`.
+
+        Args:
+          urls: The links to scrape, defaults to the links the Scraper was created with.
+          deadline: Seconds after which the scrapes still in flight are abandoned (optional).
+          min_pages: Pages to scrape before the deadline may abandon the others.
+
+        Yields:
+          dict: The scraped pages, excluding those without content, in completion order.
+        """
+        urls = interleave_by_host(self.urls if urls is None else urls)
+        tasks = {
+            asyncio.ensure_future(self.extract_data_from_url(url, self.session)): url for url in urls
+        }
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + deadline if deadline else None
+        pending = set(tasks)
+        scraped_pages = 0
+        try:
+            while pending:
+                timeout = None
+                if expires_at is not None and scraped_pages >= min_pages:
+                    timeout = max(0, expires_at - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.logger.info(f"Scraping deadline of {deadline}s reached with {scraped_pages} pages")
+                    break
+                for task in done:
+                    content = task.result()
+                    if content["raw_content"] is not None:
+                        scraped_pages += 1
+                        yield content
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            self.abandoned_urls = [tasks[task] for task in pending]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if pending:
+                self.logger.info(f"Cancelled {len(pending)} scrapes no longer needed")
+            if self.page_cache is not None:
+                self.logger.info(f"Page cache stats: {self.page_cache.stats()}")
+            if self.scraper == "tiered":
+                self.logger.info(f"Tiered scraping escalations: {self.escalations.stats()}")
+            if self.truncated_pages:
+                self.logger.info(f"Truncated {self.truncated_pages} pages over the page size limits")
+            if self.negative_cache is not None:
+                self.logger.info(f"Negative cache stats: {self.negative_cache.stats()}")
+            if self.breaker is not None:
+                self.logger.info(f"Circuit breaker stats: {self.breaker.stats()}")
+            self.logger.info(f"Scrape budget stats: {self.governor.stats()}")
+            if self.engine.latency is not None:
+                await self.governor.run(self.engine.latency.save)
+
+    def _active_scrapers(self):
+        """
+        Names of the configured scrapers, including the fallback of the tiered mode
         """
-        partial_extract = partial(self.extract_data_from_url, session=self.session)
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            contents = executor.map(partial_extract, self.urls)
-        res = [content for content in contents if content["raw_content"] is not None]
-        return res
+        if self.scraper == "tiered":
+            return [self.scraper, self.fallback_scraper]
+        return [self.scraper]
 
     def _check_pkg(self, scrapper_name : str) -> None:
         """
@@ -71,23 +220,67 @@ class Scraper:
                                f"`pip install -U {pkg_inst_name}`"
                 )
 
-    def extract_data_from_url(self, link, session):
+    async def extract_data_from_url(self, link, session):
         """
-        Extracts the data from the link with logging
+        Extracts the data from the link with logging. Scrapers exposing a `parse` method are
+        used as post-processors of a single fetch made through the shared ScrapeEngine, the
+        others run their blocking `scrape` in a worker thread.
+        Pages are served from the PageCache when it is enabled, stale cached pages are
+        revalidated with a conditional GET. Downloads and extracted text are cut at the
+        page size limits, and the truncated pages counted.
+        Failed links are remembered in the NegativeCache and skipped until their failure
+        expires, and links of domains whose circuit breaker is open are not dispatched.
+        Pages parsed from a PDF carry the `page_offsets` at which each of their pages starts.
         """
         try:
-            Scraper = self.get_scraper(link)
-            scraper = Scraper(link, session)
-            
-            # Get scraper name
-            scraper_name = scraper.__class__.__name__
-            self.logger.info(f"\n=== Using {scraper_name} ===")
-            
-            # Get content
-            content, image_urls, title = scraper.scrape()
+            cached = await self._get_cached_page(link)
+            if cached is not None and cached["fresh"]:
+                self.logger.info(f"Page cache hit for {link}")
+                return self._cached_result(link, cached)
+
+            failure = self.negative_cache.get(link, self.failure_scope) if self.negative_cache is not None else None
+            if failure is not None:
+                self.logger.info(f"Skipping {link}, it failed recently ({failure})")
+                return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
+            if self.breaker is not None and not self.breaker.allow(link):
+                self.logger.info(f"Skipping {link}, too many recent failures on {get_host(link)}")
+                return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
+
+            scraper_class = self.get_scraper(link)
+            tiered = self.scraper == "tiered" and scraper_class is self.html_scraper
+            if tiered and self.escalations.should_skip_http(link):
+                self.logger.info(f"Known JavaScript-rendered domain, skipping the HTTP tier for {link}")
+                scraper_class = self.get_fallback_scraper()
+                tiered = False
+
+            content, image_urls, title, response, page_offsets = await self._scrape_with(
+                scraper_class, link, session, cached
+            )
+            if self.breaker is not None:
+                self.breaker.record_success(link)
+            if response is not None and response.status_code == 304:
+                self.logger.info(f"Page not modified, using cache for {link}")
+                await self.governor.run(self.page_cache.refresh, link)
+                return self._cached_result(link, cached)
+
+            if tiered and response.kind != PDF:
+                escalate = looks_like_js_shell(response.content, content)
+                self.escalations.record(link, escalate)
+                if escalate:
+                    scraper_class = self.get_fallback_scraper()
+                    self.logger.info(f"Escalating {link} to {scraper_class.__name__}")
+                    content, image_urls, title, response, page_offsets = await self._scrape_with(
+                        scraper_class, link, session
+                    )
 
-            if len(content) < 100:
+            content, chars_truncated = truncate_text(content or "", self.max_page_chars)
+            if chars_truncated or (response is not None and response.truncated):
+                self.truncated_pages += 1
+                self.logger.info(f"Truncated {link} to the page size limits")
+
+            if len(content) < MIN_CONTENT_LENGTH:
                 self.logger.warning(f"Content too short or empty for {link}")
+                self._record_failure(link, TOO_SHORT)
                 return {"url": link, "raw_content": None, "image_urls": [], "title": title}
             
             # Log results
@@ -97,21 +290,136 @@ class Scraper:
             self.logger.info(f"URL: {link}")
             self.logger.info("=" * 50)
             
-            if not content or len(content) < 100:
+            if not content or len(content) < MIN_CONTENT_LENGTH:
                 self.logger.warning(f"Content too short or empty for {link}")
                 return {"url": link, "raw_content": None, "image_urls": [], "title": title}
             
-            return {
+            result = {
                 "url": link,
                 "raw_content": content,
                 "image_urls": image_urls,
                 "title": title
             }
+            if page_offsets is not None:
+                # Pages starting beyond the truncated text are gone
+                result["page_offsets"] = [offset for offset in page_offsets if offset < len(content)]
+            if self.page_cache is not None:
+                await self.governor.run(
+                    self.page_cache.put,
+                    link,
+                    result,
+                    etag=response.headers.get("ETag") if response is not None else None,
+                    last_modified=response.headers.get("Last-Modified") if response is not None else None,
+                )
+            return result
             
+        except UnsupportedContentError as e:
+            self.logger.info(f"Skipping {link}: {str(e)}")
+            self._record_failure(link, classify_failure(e))
+            return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
+        except aiohttp.ClientResponseError as e:
+            if e.status in (429, 503):
+                retry_after = e.headers.get("Retry-After") if e.headers else None
+                self.engine.scheduler.backoff(link, retry_after)
+            self.logger.error(f"Error processing {link}: {str(e)}")
+            self._record_failure(link, classify_failure(e), get_failure_ttl(e))
+            return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
         except Exception as e:
             self.logger.error(f"Error processing {link}: {str(e)}")
+            self._record_failure(link, classify_failure(e))
             return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
 
+    def _record_failure(self, link, failure, ttl=None):
+        """
+        Remembers a failed link in the negative cache, for `ttl` seconds when given, and
+        reports domain-level failures to the circuit breaker while the others count as an
+        answer of the domain
+        """
+        if self.negative_cache is not None:
+            self.negative_cache.add(link, failure, ttl=ttl, scraper=self.failure_scope)
+        if self.breaker is None:
+            return
+        if failure in DOMAIN_FAILURES:
+            self.breaker.record_failure(link)
+        else:
+            self.breaker.record_success(link)
+
+    async def _scrape_with(self, scraper_class, link, session, cached=None):
+        """
+        Scrapes the link with the given scraper class. Scrapers exposing a `parse` method get
+        the body of a single engine fetch, revalidating the cached page if there is one. The
+        body is handed to the parser matching its sniffed format, so a PDF served from a URL
+        without a `.pdf` suffix is still parsed as a PDF, without downloading it again.
+
+        Returns:
+          tuple: The content, image URLs, title, the engine response (None for scrapers that
+          fetch on their own) and the page offsets of PDFs (None for other formats). The content
+          fields are None when the response is a 304.
+        """
+        if scraper_class is PyMuPDFScraper:
+            scraper = self._pdf_scraper(link, session)
+        else:
+            scraper = scraper_class(link, session)
+
+        # Get scraper name
+        scraper_name = scraper.__class__.__name__
+        self.logger.info(f"\n=== Using {scraper_name} ===")
+
+        # Get content
+        async with self.engine.scheduler.slot(link, self.tenant):
+            if not hasattr(scraper, "parse"):
+                content, image_urls, title = await self.governor.run(scraper.scrape)
+                return content, image_urls, title, None, getattr(scraper, "page_offsets", None)
+
+            headers = {"User-Agent": session.headers.get("User-Agent")}
+            if cached is not None and cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached is not None and cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+            response = await self.engine.fetch(
+                link, headers=headers, max_bytes=self.max_page_bytes, max_pdf_bytes=self.max_pdf_bytes
+            )
+
+        if response.status_code == 304:
+            return None, None, None, response, None
+        parser = self.get_parser(scraper, response.kind, link, session)
+        if parser is not scraper:
+            self.logger.info(f"Routing {link} ({response.kind}) to {parser.__class__.__name__}")
+        if self.parse_pool is not None and response.kind != PDF:
+            # PDFs are already extracted across processes by PyMuPDFScraper
+            content, image_urls, title, parse_truncated = await self.parse_pool.parse(
+                parser.__class__, link, response.content, response.encoding
+            )
+            # Pages cut at the parse size cap are counted with those cut while downloading
+            response.truncated = response.truncated or parse_truncated
+        else:
+            content, image_urls, title = await self.governor.run(
+                parser.parse, response.content, response.encoding
+            )
+        return content, image_urls, title, response, getattr(parser, "page_offsets", None)
+
+    async def _get_cached_page(self, link):
+        """
+        Looks up the link in the page cache, if enabled
+        """
+        if self.page_cache is None:
+            return None
+        return await self.governor.run(self.page_cache.get, link)
+
+    def _cached_result(self, link, cached):
+        """
+        Builds the scraped page of the link from its cache entry
+        """
+        result = {
+            "url": link,
+            "raw_content": cached["raw_content"],
+            "image_urls": cached["image_urls"],
+            "title": cached["title"]
+        }
+        if cached.get("page_offsets") is not None:
+            result["page_offsets"] = cached["page_offsets"]
+        return result
+
     def get_scraper(self, link):
         """
         The function `get_scraper` determines the appropriate scraper class based on the provided link
@@ -125,24 +433,18 @@ class Scraper:
         Returns:
           The `get_scraper` method returns the scraper class based on the provided link. The method
         checks the link to determine the appropriate scraper class to use based on predefined mappings
-        in the `SCRAPER_CLASSES` dictionary. If the link ends with ".pdf", it selects the
-        `PyMuPDFScraper` class. If the link contains "arxiv.org", it selects the `ArxivScraper
+        in the module level `SCRAPER_CLASSES` dictionary. If the link ends with ".pdf", it selects the
+        `PyMuPDFScraper` class. If the link is hosted on arxiv.org, it selects the `ArxivScraper`.
+        Scrapers fetching through the ScrapeEngine are re-routed by `get_parser` once the format
+        of the response is known.
         """
 
-        SCRAPER_CLASSES = {
-            "pdf": PyMuPDFScraper,
-            "arxiv": ArxivScraper,
-            "bs": BeautifulSoupScraper,
-            "web_base_loader": WebBaseLoaderScraper,
-            "browser": BrowserScraper,
-            "tavily_extract": TavilyExtract
-        }
-
         scraper_key = None
+        host = get_host(link)
 
         if link.endswith(".pdf"):
             scraper_key = "pdf"
-        elif "arxiv.org" in link:
+        elif host == "arxiv.org" or host.endswith(".arxiv.org"):
             scraper_key = "arxiv"
         else:
             scraper_key = self.scraper
@@ -150,5 +452,50 @@ class Scraper:
         scraper_class = SCRAPER_CLASSES.get(scraper_key)
         if scraper_class is None:
             raise Exception("Scraper not found.")
+        if scraper_class is BeautifulSoupScraper:
+            scraper_class = self.html_scraper
+
+        return scraper_class
+
+    def get_parser(self, scraper, kind, link, session):
+        """
+        Returns the scraper parsing a response of the given sniffed format: PDFs go to
+        `PyMuPDFScraper` whatever their URL, and pages behind a `.pdf` URL that turn out to be
+        HTML or text go to the configured scraper.
+
+        Args:
+          scraper: The scraper selected from the link.
+          kind: The format of the response, "pdf", "html" or "text".
+          link: The scraped URL.
+          session: The requests session of the scrapers.
+
+        Returns:
+          The scraper whose `parse` method handles the response.
+        """
+        if kind == PDF:
+            if isinstance(scraper, PyMuPDFScraper):
+                return scraper
+            return self._pdf_scraper(link, session)
+
+        if not isinstance(scraper, PyMuPDFScraper):
+            return scraper
+        scraper_class = SCRAPER_CLASSES.get(self.scraper)
+        if scraper_class is BeautifulSoupScraper or not hasattr(scraper_class, "parse"):
+            scraper_class = self.html_scraper
+        return scraper_class(link, session)
+
+    def _pdf_scraper(self, link, session):
+        """
+        Creates a PyMuPDFScraper bound by the configured PDF limits
+        """
+        return PyMuPDFScraper(link, session, max_bytes=self.max_pdf_bytes, max_pages=self.max_pdf_pages)
+
+    def get_fallback_scraper(self):
+        """
+        Returns the scraper class the tiered mode escalates to when the HTTP tier fails
+        """
+        scraper_class = SCRAPER_CLASSES.get(self.fallback_scraper)
+        if scraper_class is None or self.fallback_scraper == "tiered":
+            raise Exception("Fallback scraper not found.")
 
         return scraper_class
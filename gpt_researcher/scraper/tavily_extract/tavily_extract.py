@@ -1,6 +1,4 @@
-from bs4 import BeautifulSoup
 import os
-from ..utils import get_relevant_images, extract_title
 
 class TavilyExtract:
 
@@ -25,8 +23,8 @@ class TavilyExtract:
 
     def scrape(self) -> tuple:
         """
-        This function extracts content from a specified link using the Tavily Python SDK, the title and
-        images from the link are extracted using the functions from `gpt_researcher/scraper/utils.py`.
+        This function extracts content from a specified link using the Tavily Python SDK. The images
+        come from the same Tavily response, so the page itself is never downloaded a second time.
 
         Returns:
           The `scrape` method returns a tuple containing the extracted content, a list of image URLs, and
@@ -36,27 +34,36 @@ class TavilyExtract:
         """
 
         try:
-            response = self.tavily_client.extract(urls=self.link)
+            try:
+                response = self.tavily_client.extract(urls=self.link, include_images=True)
+            except TypeError:
+                # Older versions of tavily-python do not support returning images
+                response = self.tavily_client.extract(urls=self.link)
             if response['failed_results']:
                 return "", [], ""
 
-            # Parse the HTML content of the response to create a BeautifulSoup object for the utility functions
-            response_bs = self.session.get(self.link, timeout=4)
-            soup = BeautifulSoup(
-                response_bs.content, "lxml", from_encoding=response_bs.encoding
-            )
-
             # Since only a single link is provided to tavily_client, the results will contain only one entry.
-            content = response['results'][0]['raw_content']
+            result = response['results'][0]
+            content = result['raw_content']
 
-            # Get relevant images using the utility function
-            image_urls = get_relevant_images(soup, self.link)
+            # Tavily does not report image sizes, keep them all at the lowest relevance score
+            image_urls = [{'url': url, 'score': 1} for url in result.get('images', [])[:10]]
 
-            # Extract the title using the utility function
-            title = extract_title(soup)
+            title = self.extract_title(content)
 
             return content, image_urls, title
 
         except Exception as e:
             print("Error! : " + str(e))
-            return "", [], ""
\ No newline at end of file
+            return "", [], ""
+
+    @staticmethod
+    def extract_title(content: str) -> str:
+        """
+        Gets the title from the leading Markdown heading of the extracted content, if any
+        """
+        for line in (content or "").splitlines():
+            line = line.strip()
+            if line:
+                return line.lstrip("#").strip() if line.startswith("#") else ""
+        return ""
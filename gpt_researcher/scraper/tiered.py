@@ -0,0 +1,116 @@
+import re
+import threading
+from collections import OrderedDict
+
+from .scheduler import get_host
+
+MIN_CONTENT_LENGTH = 100
+
+# Markup of client-side rendered apps: an empty mount point or a "please enable JavaScript" notice
+_EMPTY_MOUNT_POINT = re.compile(
+    rb"<div[^>]+id=[\"'](?:root|app|__next|__nuxt|main)[\"'][^>]*>\s*</div>", re.IGNORECASE
+)
+_JS_REQUIRED_NOTICES = (
+    b"enable javascript",
+    b"javascript is required",
+    b"javascript is disabled",
+    b"requires javascript",
+    b"javascript to run this app",
+)
+
+
+def looks_like_js_shell(html: bytes, text: str) -> bool:
+    """
+    Guess whether a page is a JavaScript shell whose content is only rendered in a browser.
+
+    Args:
+      html (bytes): The raw HTML of the page.
+      text (str): The text extracted from it.
+
+    Returns:
+      bool: True if the page needs a browser to render its content.
+    """
+    if not html:
+        return False
+    if len(text) < MIN_CONTENT_LENGTH:
+        return True
+    if len(text) > 2000:
+        return False
+    lowered = html.lower()
+    if _EMPTY_MOUNT_POINT.search(lowered):
+        return True
+    if any(notice in lowered for notice in _JS_REQUIRED_NOTICES):
+        return True
+    # Markup dominated by scripts, with next to no visible text
+    return lowered.count(b"<script") >= 5 and len(text) < 0.01 * len(html)
+
+
+class EscalationTracker:
+    """
+    Tracks, per domain, how often the cheap HTTP tier had to be escalated to the browser tier.
+    Domains that almost always need the browser skip the HTTP tier altogether.
+    """
+
+    def __init__(self, min_attempts: int = 3, skip_ratio: float = 0.8, max_domains: int = 10000):
+        """
+        Initialize the tracker.
+
+        Args:
+          min_attempts (int): Attempts needed before a domain may skip the HTTP tier.
+          skip_ratio (float): Escalation rate above which a domain skips the HTTP tier.
+          max_domains (int): Maximum number of domains remembered, least recently seen are dropped.
+        """
+        self.min_attempts = min_attempts
+        self.skip_ratio = skip_ratio
+        self.max_domains = max_domains
+        self._domains = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, url: str, escalated: bool) -> None:
+        """
+        Record the outcome of an HTTP tier attempt.
+
+        Args:
+          url (str): The scraped URL.
+          escalated (bool): Whether the page had to be escalated to the browser tier.
+        """
+        domain = get_host(url)
+        with self._lock:
+            counts = self._domains.pop(domain, {"attempts": 0, "escalations": 0})
+            counts["attempts"] += 1
+            counts["escalations"] += int(escalated)
+            self._domains[domain] = counts
+            if len(self._domains) > self.max_domains:
+                self._domains.popitem(last=False)
+
+    def should_skip_http(self, url: str) -> bool:
+        """
+        Check whether a URL's domain is known to need the browser tier.
+
+        Args:
+          url (str): The URL about to be scraped.
+
+        Returns:
+          bool: True if the HTTP tier should be skipped.
+        """
+        with self._lock:
+            counts = self._domains.get(get_host(url))
+        if counts is None or counts["attempts"] < self.min_attempts:
+            return False
+        return counts["escalations"] / counts["attempts"] >= self.skip_ratio
+
+    def stats(self) -> dict:
+        """Get the attempts, escalations and escalation rate of every tracked domain"""
+        with self._lock:
+            return {
+                domain: {**counts, "rate": round(counts["escalations"] / counts["attempts"], 2)}
+                for domain, counts in self._domains.items()
+            }
+
+
+_tracker = EscalationTracker()
+
+
+def get_escalation_tracker() -> EscalationTracker:
+    """Get the process-wide EscalationTracker"""
+    return _tracker
@@ -5,53 +5,72 @@ import hashlib
 import re
 import bs4
 
+# Default caps on the size of a single scraped page, see SCRAPER_MAX_PAGE_BYTES and SCRAPER_MAX_PAGE_CHARS
+DEFAULT_MAX_PAGE_BYTES = 5 * 1024 * 1024
+DEFAULT_MAX_PAGE_CHARS = 100_000
+
 def get_relevant_images(soup: BeautifulSoup, url: str) -> list:
     """Extract relevant images from the page"""
-    image_urls = []
-    
     try:
         # Find all img tags with src attribute
         all_images = soup.find_all('img', src=True)
-        
-        for img in all_images:
-            img_src = urljoin(url, img['src'])
-            if img_src.startswith(('http://', 'https://')):
-                score = 0
-                # Check for relevant classes
-                if any(cls in img.get('class', []) for cls in ['header', 'featured', 'hero', 'thumbnail', 'main', 'content']):
-                    score = 4  # Higher score
-                # Check for size attributes
-                elif img.get('width') and img.get('height'):
-                    width = parse_dimension(img['width'])
-                    height = parse_dimension(img['height'])
-                    if width and height:
-                        if width >= 2000 and height >= 1000:
-                            score = 3  # Medium score (very large images)
-                        elif width >= 1600 or height >= 800:
-                            score = 2  # Lower score
-                        elif width >= 800 or height >= 500:
-                            score = 1  # Lowest score
-                        elif width >= 500 or height >= 300:
-                            score = 0  # Lowest score
-                        else:
-                            continue  # Skip small images
-                
-                image_urls.append({'url': img_src, 'score': score})
-        
-        # Sort images by score (highest first)
-        sorted_images = sorted(image_urls, key=lambda x: x['score'], reverse=True)
-        
-        # Select all images with score 3 and 2, then add score 1 images up to a total of 10
-        high_score_images = [img for img in sorted_images if img['score'] in [3, 2]]
-        low_score_images = [img for img in sorted_images if img['score'] == 1]
-        
-        result = high_score_images + low_score_images[:max(0, 10 - len(high_score_images))]
-        return result[:10]  # Ensure we don't return more than 10 images in total
-    
+        return score_images(
+            [(img['src'], img.get('class', []), img.get('width'), img.get('height')) for img in all_images],
+            url,
+        )
+
     except Exception as e:
         logging.error(f"Error in get_relevant_images: {e}")
         return []
 
+def score_images(images: list, url: str) -> list:
+    """
+    Score and select the relevant images of a page, independently of the HTML parser
+
+    Args:
+        images (list): The (src, classes, width, height) attributes of the img tags of the page
+        url (str): The page URL, to resolve relative image sources
+
+    Returns:
+        list: Up to 10 images as {'url', 'score'} dicts, highest score first
+    """
+    image_urls = []
+
+    for src, classes, width, height in images:
+        img_src = urljoin(url, src)
+        if img_src.startswith(('http://', 'https://')):
+            score = 0
+            # Check for relevant classes
+            if any(cls in classes for cls in ['header', 'featured', 'hero', 'thumbnail', 'main', 'content']):
+                score = 4  # Higher score
+            # Check for size attributes
+            elif width and height:
+                width = parse_dimension(width)
+                height = parse_dimension(height)
+                if width and height:
+                    if width >= 2000 and height >= 1000:
+                        score = 3  # Medium score (very large images)
+                    elif width >= 1600 or height >= 800:
+                        score = 2  # Lower score
+                    elif width >= 800 or height >= 500:
+                        score = 1  # Lowest score
+                    elif width >= 500 or height >= 300:
+                        score = 0  # Lowest score
+                    else:
+                        continue  # Skip small images
+
+            image_urls.append({'url': img_src, 'score': score})
+
+    # Sort images by score (highest first)
+    sorted_images = sorted(image_urls, key=lambda x: x['score'], reverse=True)
+
+    # Select all images with score 3 and 2, then add score 1 images up to a total of 10
+    high_score_images = [img for img in sorted_images if img['score'] in [3, 2]]
+    low_score_images = [img for img in sorted_images if img['score'] == 1]
+
+    result = high_score_images + low_score_images[:max(0, 10 - len(high_score_images))]
+    return result[:10]  # Ensure we don't return more than 10 images in total
+
 def parse_dimension(value: str) -> int:
     """Parse dimension value, handling px units"""
     if value.lower().endswith('px'):
@@ -64,7 +83,8 @@ def parse_dimension(value: str) -> int:
 
 def extract_title(soup: BeautifulSoup) -> str:
     """Extract the title from the BeautifulSoup object"""
-    return soup.title.string if soup.title else ""
+    # NavigableString keeps a reference to the whole tree, return a plain string
+    return str(soup.title.string) if soup.title and soup.title.string else ""
 
 def get_image_hash(image_url: str) -> str:
     """Calculate a simple hash based on the image filename and essential query parameters"""
@@ -126,4 +146,47 @@ def get_text_from_soup(soup: BeautifulSoup) -> str:
     text = soup.get_text(strip=True, separator="\n")
     # Remove excess whitespace
     text = re.sub(r"\s{2,}", " ", text)
-    return text
\ No newline at end of file
+    return text
+
+
+def read_limited(response, max_bytes: int = DEFAULT_MAX_PAGE_BYTES) -> tuple:
+    """
+    Read the body of a streamed `requests` response, stopping at the byte limit so that
+    giant pages are never fully downloaded.
+
+    Args:
+      response: The response, requested with `stream=True`.
+      max_bytes (int): Number of bytes after which the body is cut, 0 for no limit.
+
+    Returns:
+      tuple: The body and whether it was truncated.
+    """
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=65536):
+        chunks.append(chunk)
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            # Closing the response drops the connection instead of draining the body
+            response.close()
+            return b"".join(chunks)[:max_bytes], True
+    return b"".join(chunks), False
+
+
+def truncate_text(text: str, max_chars: int = DEFAULT_MAX_PAGE_CHARS) -> tuple:
+    """
+    Cut extracted text to a maximum number of characters, on a word boundary when there is
+    one close to the limit.
+
+    Args:
+      text (str): The extracted text.
+      max_chars (int): Maximum number of characters, 0 for no limit.
+
+    Returns:
+      tuple: The text and whether it was truncated.
+    """
+    if not max_chars or len(text) <= max_chars:
+        return text, False
+    start = max(0, max_chars - 100)
+    cut = max(text.rfind(" ", start, max_chars + 1), text.rfind("\n", start, max_chars + 1))
+    return text[:cut if cut > 0 else max_chars].rstrip(), True
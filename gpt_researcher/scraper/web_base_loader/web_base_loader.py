@@ -1,6 +1,7 @@
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import requests
+from ..latency import get_latency_profile
 from ..utils import get_relevant_images, extract_title
 
 class WebBaseLoaderScraper:
@@ -21,23 +22,39 @@ class WebBaseLoaderScraper:
         """
         try:
             from langchain_community.document_loaders import WebBaseLoader
-            loader = WebBaseLoader(self.link)
-            loader.requests_kwargs = {"verify": False}
-            docs = loader.load()
-            content = ""
-
-            for doc in docs:
-                content += doc.page_content
-
-            response = self.session.get(self.link)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            image_urls = get_relevant_images(soup, self.link)
-            
-            # Extract the title using the utility function
-            title = extract_title(soup)
-
-            return content, image_urls, title
+            loader = WebBaseLoader(self.link, session=self.session)
+            loader.requests_kwargs = {"verify": False, "timeout": get_latency_profile().timeout_for(self.link)}
+            # A single request: the parsed page feeds the text, the images and the title
+            soup = loader.scrape()
+            return self._extract(soup)
 
         except Exception as e:
             print("Error! : " + str(e))
             return "", [], ""
+
+    def parse(self, content, encoding=None) -> tuple:
+        """
+        Parses already fetched HTML the way `WebBaseLoader` does, so the async ScrapeEngine can
+        download the page once and hand the body to this scraper as a post-processor.
+
+        Args:
+          content (bytes): The raw HTML of the page.
+          encoding (str, optional): The charset announced by the response, if any.
+
+        Returns:
+          tuple: The page text, the list of relevant image URLs and the page title.
+        """
+        soup = BeautifulSoup(content, "html.parser", from_encoding=encoding)
+        return self._extract(soup)
+
+    def _extract(self, soup: BeautifulSoup) -> tuple:
+        """
+        Extracts the text, as `WebBaseLoader` documents do, the images and the title from the page
+        """
+        content = soup.get_text()
+        image_urls = get_relevant_images(soup, self.link)
+
+        # Extract the title using the utility function
+        title = extract_title(soup)
+
+        return content, image_urls, title
@@ -1,7 +1,9 @@
-from typing import List, Dict
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Optional
 
 from ..actions.utils import stream_output
-from ..actions.web_scraping import scrape_urls
+from ..actions.web_scraping import stream_scrape_urls
+from ..scraper.latency import get_latency_profile
 from ..scraper.utils import get_image_hash  # Add this import
 
 
@@ -10,53 +12,108 @@ class BrowserManager:
 
     def __init__(self, researcher):
         self.researcher = researcher
-
-    async def browse_urls(self, urls: List[str]) -> List[Dict]:
+        # The latency profile is shared by the whole process and built by its first caller:
+        # build it from the config before a document loader or scraper times a request
+        get_latency_profile(researcher.cfg)
+        # URLs whose scrape was cancelled by the scraping deadline
+        self.abandoned_urls = []
+
+    async def browse_urls(
+        self, urls: List[str], deadline: Optional[float] = None, min_pages: Optional[int] = None
+    ) -> List[Dict]:
         """
         Scrape content from a list of URLs.
 
         Args:
             urls (List[str]): List of URLs to scrape.
+            deadline (Optional[float]): Seconds after which the scrapes still in flight are
+                abandoned, defaults to SCRAPE_DEADLINE_SECONDS.
+            min_pages (Optional[int]): Pages to scrape before the deadline may abandon the
+                others, defaults to SCRAPE_MIN_PAGES.
 
         Returns:
             List[Dict]: List of scraped content results.
         """
-        if self.researcher.verbose:
-            await stream_output(
-                "logs",
-                "scraping_urls",
-                f"🌐 Scraping content from {len(urls)} URLs...",
-                self.researcher.websocket,
-            )
+        return [page async for page in self.stream_urls(urls, deadline, min_pages)]
+
+    async def stream_urls(
+        self, urls: List[str], deadline: Optional[float] = None, min_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Scrape content from a list of URLs, yielding every page as soon as it is scraped.
+        Images are selected once the stream ends, including when the consumer stops early.
+        When the deadline passes with at least `min_pages` pages scraped, the remaining
+        scrapes are abandoned and reported.
+
+        Args:
+            urls (List[str]): List of URLs to scrape.
+            deadline (Optional[float]): Seconds after which the scrapes still in flight are
+                abandoned, defaults to SCRAPE_DEADLINE_SECONDS.
+            min_pages (Optional[int]): Pages to scrape before the deadline may abandon the
+                others, defaults to SCRAPE_MIN_PAGES.
 
-        scraped_content, images = scrape_urls(urls, self.researcher.cfg)
-        self.researcher.add_research_sources(scraped_content)
-        new_images = self.select_top_images(images, k=4)  # Select top 2 images
-        self.researcher.add_research_images(new_images)
+        Yields:
+            Dict: The scraped content of a page.
+        """
+        cfg = self.researcher.cfg
+        deadline = cfg.scrape_deadline_seconds if deadline is None else deadline
+        min_pages = cfg.scrape_min_pages if min_pages is None else min_pages
+        abandoned_urls = []
 
         if self.researcher.verbose:
             await stream_output(
                 "logs",
-                "scraping_content",
-                f"📄 Scraped {len(scraped_content)} pages of content",
-                self.researcher.websocket,
-            )
-            await stream_output(
-                "logs",
-                "scraping_images",
-                f"🖼️ Selected {len(new_images)} new images from {len(images)} total images",
-                self.researcher.websocket,
-                True,
-                new_images
-            )
-            await stream_output(
-                "logs",
-                "scraping_complete",
-                f"🌐 Scraping complete",
+                "scraping_urls",
+                f"🌐 Scraping content from {len(urls)} URLs...",
                 self.researcher.websocket,
             )
 
-        return scraped_content
+        scraped_pages = 0
+        images = []
+        try:
+            async with aclosing(
+                # Sub-queries of the same research share its fair share of the scrape budget
+                stream_scrape_urls(urls, cfg, deadline, min_pages, abandoned_urls.extend, id(self.researcher))
+            ) as pages:
+                async for page in pages:
+                    scraped_pages += 1
+                    images.extend(page.get("image_urls", []))
+                    self.researcher.add_research_sources([page])
+                    yield page
+        finally:
+            new_images = self.select_top_images(images, k=4)  # Select top 2 images
+            self.researcher.add_research_images(new_images)
+            self.abandoned_urls.extend(abandoned_urls)
+
+            if abandoned_urls:
+                await stream_output(
+                    "logs",
+                    "scraping_deadline",
+                    f"⏱️ Scraping deadline of {deadline}s reached, abandoned {len(abandoned_urls)} URLs: {abandoned_urls}",
+                    self.researcher.websocket,
+                )
+
+            if self.researcher.verbose:
+                await stream_output(
+                    "logs",
+                    "scraping_content",
+                    f"📄 Scraped {scraped_pages} pages of content",
+                    self.researcher.websocket,
+                )
+                await stream_output(
+                    "logs",
+                    "scraping_images",
+                    f"🖼️ Selected {len(new_images)} new images from {len(images)} total images",
+                    self.researcher.websocket,
+                    True,
+                    new_images
+                )
+                await stream_output(
+                    "logs",
+                    "scraping_complete",
+                    f"🌐 Scraping complete",
+                    self.researcher.websocket,
+                )
 
     def select_top_images(self, images: List[Dict], k: int = 2) -> List[str]:
         """
@@ -1,8 +1,16 @@
 import asyncio
+import logging
 from typing import List, Dict, Optional, Set
 
-from ..context.compression import ContextCompressor, WrittenContentCompressor, VectorstoreCompressor
+from ..context.compression import (
+    ContextCompressor,
+    StreamingContextCompressor,
+    WrittenContentCompressor,
+    VectorstoreCompressor,
+)
+from ..context.deduplication import near_duplicate_filter
 from ..actions.utils import stream_output
+from ..utils.logging_config import get_json_handler
 
 
 class ContextManager:
@@ -10,6 +18,10 @@ class ContextManager:
 
     def __init__(self, researcher):
         self.researcher = researcher
+        self.logger = logging.getLogger('research')
+        # Pages seen by every sub-query of the research, so that a page syndicated across the
+        # results of several sub-queries is only embedded once
+        self.page_duplicates = near_duplicate_filter(researcher.cfg.dedup_similarity_threshold)
 
     async def get_similar_content_by_query(self, query, pages):
         if self.researcher.verbose:
@@ -21,12 +33,62 @@ class ContextManager:
             )
 
         context_compressor = ContextCompressor(
-            documents=pages, embeddings=self.researcher.memory.get_embeddings()
+            documents=pages,
+            embeddings=self.researcher.memory.get_embeddings(),
+            dedup_threshold=self.researcher.cfg.dedup_similarity_threshold,
+            page_duplicates=self.page_duplicates,
         )
-        return await context_compressor.async_get_context(
+        context = await context_compressor.async_get_context(
             query=query, max_results=10, cost_callback=self.researcher.add_costs
         )
+        self._log_dedup_stats(query, context_compressor.dedup_stats())
+        return context
         
+    async def get_similar_content_by_query_from_stream(self, query, pages, embedded_query=None):
+        """
+        Same as `get_similar_content_by_query`, but compresses the pages while they are being
+        scraped. Scraping stops early once `ENOUGH_CONTENT_CHUNKS` relevant chunks are found.
+        `embedded_query` is the task embedding the query when it is shared with the snippet prefilter.
+        """
+        if self.researcher.verbose:
+            await stream_output(
+                "logs",
+                "fetching_query_content",
+                f"📚 Getting relevant content based on query: {query}...",
+                self.researcher.websocket,
+            )
+
+        context_compressor = StreamingContextCompressor(
+            embeddings=self.researcher.memory.get_embeddings(),
+            enough_chunks=self.researcher.cfg.enough_content_chunks,
+            dedup_threshold=self.researcher.cfg.dedup_similarity_threshold,
+            page_duplicates=self.page_duplicates,
+        )
+        context = await context_compressor.async_get_context(
+            query=query,
+            pages=pages,
+            max_results=10,
+            cost_callback=self.researcher.add_costs,
+            embedded_query=embedded_query,
+        )
+        self._log_dedup_stats(query, context_compressor.dedup_stats())
+        return context
+
+    def _log_dedup_stats(self, query, stats):
+        """
+        Reports the near-duplicate chunks dropped before embedding for a query, and the pages
+        dropped so far in the research, in the research log
+        """
+        if stats is None:
+            return
+        self.logger.info(
+            f"Dropped {stats['chunks']['dropped']}/{stats['chunks']['seen']} near-duplicate chunks for query: {query} "
+            f"({stats['pages']['dropped']}/{stats['pages']['seen']} pages so far in the research)"
+        )
+        json_handler = get_json_handler()
+        if json_handler:
+            json_handler.log_event("deduplication", {"query": query, **stats})
+
     async def get_similar_content_by_query_with_vectorstore(self, query, filter): 
         if self.researcher.verbose:
             await stream_output(
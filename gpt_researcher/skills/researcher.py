@@ -1,11 +1,20 @@
 import asyncio
-import random
 import json
+from contextlib import aclosing
 from typing import Dict, Optional
 import logging
 
 from ..actions.utils import stream_output
-from ..actions.query_processing import plan_research_outline, get_search_results
+from ..actions.query_processing import (
+    plan_research_outline,
+    get_search_results,
+    search_retrievers,
+    fuse_search_results,
+    fuse_snippet_scores,
+)
+from ..actions.retriever import get_retriever_weights
+from ..retrievers.cache import get_search_cache
+from ..context.prefilter import SnippetPrefilter
 from ..document import DocumentLoader, OnlineDocumentLoader, LangChainDocumentLoader
 from ..utils.enum import ReportSource, ReportType, Tone
 from ..utils.logging_config import get_json_handler, get_research_logger
@@ -18,6 +27,8 @@ class ResearchConductor:
         self.researcher = researcher
         self.logger = logging.getLogger('research')
         self.json_handler = get_json_handler()
+        # Parsed once so that an invalid RETRIEVER_WEIGHTS fails when the researcher is created
+        self.retriever_weights = get_retriever_weights(researcher.cfg)
 
     async def plan_research(self, query):
         self.logger.info(f"Planning research for query: {query}")
@@ -29,7 +40,13 @@ class ResearchConductor:
             self.researcher.websocket,
         )
 
-        search_results = await get_search_results(query, self.researcher.retrievers[0])
+        # Same max_results as the sub-query searches, so that the search of the original query is reused
+        search_results = await get_search_results(
+            query,
+            self.researcher.retrievers[0],
+            max_results=self.researcher.cfg.max_search_results_per_query,
+            cache=get_search_cache(self.researcher.cfg),
+        )
         self.logger.info(f"Initial search results obtained: {len(search_results)} results")
 
         await stream_output(
@@ -106,7 +123,7 @@ class ResearchConductor:
         # Hybrid search including both local documents and web sources
         elif self.researcher.report_source == ReportSource.Hybrid.value:
             if self.researcher.document_urls:
-                document_data = await OnlineDocumentLoader(self.researcher.document_urls).load()
+                document_data = await OnlineDocumentLoader(self.researcher.document_urls, self.researcher.cfg).load()
             else:
                 document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
             if self.researcher.vector_store:
@@ -145,6 +162,13 @@ class ResearchConductor:
                 self.json_handler.update_content("costs", self.researcher.get_costs())
                 self.json_handler.update_content("context", self.researcher.context)
 
+        search_cache = get_search_cache(self.researcher.cfg)
+        if search_cache:
+            search_cache_stats = search_cache.stats()
+            self.logger.info(f"Search cache: {search_cache_stats}")
+            if self.json_handler:
+                self.json_handler.log_event("search_cache", search_cache_stats)
+
         self.logger.info(f"Research completed. Context size: {len(str(self.researcher.context))}")
         return self.researcher.context
 
@@ -265,11 +289,20 @@ class ResearchConductor:
             )
 
         try:
-            if not scraped_data:
-                scraped_data = await self._scrape_data_by_urls(sub_query)
-                self.logger.info(f"Scraped data size: {len(scraped_data)}")
-
-            content = await self.researcher.context_manager.get_similar_content_by_query(sub_query, scraped_data)
+            if scraped_data:
+                content = await self.researcher.context_manager.get_similar_content_by_query(sub_query, scraped_data)
+            else:
+                # Compress the pages as they are scraped instead of waiting for the slowest site.
+                # The sub-query is embedded once, for both the snippet prefilter and the compression
+                embedded_query = asyncio.create_task(
+                    asyncio.to_thread(self.researcher.memory.get_embeddings().embed_query, sub_query)
+                )
+                try:
+                    content = await self.researcher.context_manager.get_similar_content_by_query_from_stream(
+                        sub_query, self._stream_data_by_urls(sub_query, embedded_query), embedded_query=embedded_query
+                    )
+                finally:
+                    embedded_query.cancel()
             self.logger.info(f"Content found for sub-query: {len(str(content)) if content else 0} chars")
 
             if content and self.researcher.verbose:
@@ -327,14 +360,16 @@ class ResearchConductor:
         return content
 
     async def _get_new_urls(self, url_set_input):
-        """Gets the new urls from the given url set.
+        """Gets the new urls from the given url set. URLs are compared by their canonical form,
+        so variants of an already visited page (scheme, www., trailing slash, tracking
+        parameters...) are skipped and only the first one seen is kept.
         Args: url_set_input (set[str]): The url set to get the new urls from
         Returns: list[str]: The new urls from the given url set
         """
 
         new_urls = []
         for url in url_set_input:
-            if url not in self.researcher.visited_urls:
+            if url and url not in self.researcher.visited_urls:
                 self.researcher.visited_urls.add(url)
                 new_urls.append(url)
                 if self.researcher.verbose:
@@ -349,28 +384,63 @@ class ResearchConductor:
 
         return new_urls
 
-    async def _search_relevant_source_urls(self, query):
-        new_search_urls = []
+    async def _search_relevant_source_urls(self, query, embedded_query=None):
+        """
+        Searches a sub-query on all retrievers and selects the URLs to scrape: the results are
+        fused into one ranking, results whose snippet is not relevant to the sub-query are
+        dropped, the similarity of the remaining snippets joins the ranking, and only the best
+        `max_scrape_per_query` new URLs are kept.
 
-        # Iterate through all retrievers
-        for retriever_class in self.researcher.retrievers:
-            # Instantiate the retriever with the sub-query
-            retriever = retriever_class(query)
+        Args:
+            query (str): The sub-query to search for.
+            embedded_query (Awaitable, optional): The embedding of the sub-query, when it is
+                already being computed.
 
-            # Perform the search using the current retriever
-            search_results = await asyncio.to_thread(
-                retriever.search, max_results=self.researcher.cfg.max_search_results_per_query
+        Returns:
+            list: The URLs to scrape, best first.
+        """
+        # Search all retrievers concurrently
+        searches = await search_retrievers(
+            query,
+            self.researcher.retrievers,
+            max_results=self.researcher.cfg.max_search_results_per_query,
+            timeout=self.researcher.cfg.retriever_timeout,
+            cache=get_search_cache(self.researcher.cfg),
+        )
+        for search in searches:
+            if self.json_handler:
+                self.json_handler.log_event("retriever_search", {
+                    "query": query,
+                    "retriever": search["retriever"],
+                    "status": search["status"],
+                    "latency": search["latency"],
+                    "results": len(search["results"]),
+                })
+
+        # Rank the results of all retrievers together, keeping the URLs not visited yet
+        results = fuse_search_results(searches, self.retriever_weights)
+        candidates = [result for result in results if result["href"] not in self.researcher.visited_urls]
+        relevant = candidates
+        threshold = self.researcher.cfg.snippet_similarity_threshold
+        top_k = self.researcher.cfg.snippet_top_k
+        if threshold or top_k:
+            prefilter = SnippetPrefilter(self.researcher.memory.get_embeddings(), threshold, top_k)
+            relevant = await prefilter.filter(
+                query, candidates, embedded_query, cost_callback=self.researcher.add_costs
             )
+            # The snippet scores also rank the results, before the best of them are selected
+            relevant = fuse_snippet_scores(relevant)
+        max_scrape = self.researcher.cfg.max_scrape_per_query
+        selected = relevant[:max_scrape] if max_scrape else relevant
+        if self.json_handler:
+            self.json_handler.log_event("source_fusion", {
+                "query": query,
+                "results": len(results),
+                "relevant": len(relevant),
+                "selected": len(selected),
+            })
 
-            # Collect new URLs from search results
-            search_urls = [url.get("href") for url in search_results]
-            new_search_urls.extend(search_urls)
-
-        # Get unique URLs
-        new_search_urls = await self._get_new_urls(new_search_urls)
-        random.shuffle(new_search_urls)
-
-        return new_search_urls
+        return await self._get_new_urls([result["href"] for result in selected])
 
     async def _scrape_data_by_urls(self, sub_query):
         """
@@ -382,7 +452,22 @@ class ResearchConductor:
         Returns:
             list: A list of scraped content results.
         """
-        new_search_urls = await self._search_relevant_source_urls(sub_query)
+        return [page async for page in self._stream_data_by_urls(sub_query)]
+
+    async def _stream_data_by_urls(self, sub_query, embedded_query=None):
+        """
+        Runs a sub-query across multiple retrievers and scrapes the resulting URLs, yielding
+        every page as soon as it is scraped.
+
+        Args:
+            sub_query (str): The sub-query to search for.
+            embedded_query (Awaitable, optional): The embedding of the sub-query, when it is
+                already being computed.
+
+        Yields:
+            dict: The scraped content of a page.
+        """
+        new_search_urls = await self._search_relevant_source_urls(sub_query, embedded_query)
 
         # Log the research process if verbose mode is on
         if self.researcher.verbose:
@@ -394,9 +479,13 @@ class ResearchConductor:
             )
 
         # Scrape the new URLs
-        scraped_content = await self.researcher.scraper_manager.browse_urls(new_search_urls)
-
-        if self.researcher.vector_store:
-            self.researcher.vector_store.load(scraped_content)
-
-        return scraped_content
+        scraped_content = []
+        try:
+            async with aclosing(self.researcher.scraper_manager.stream_urls(new_search_urls)) as pages:
+                async for page in pages:
+                    scraped_content.append(page)
+                    yield page
+        finally:
+            self.logger.info(f"Scraped data size: {len(scraped_content)}")
+            if self.researcher.vector_store:
+                self.researcher.vector_store.load(scraped_content)
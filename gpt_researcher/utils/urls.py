@@ -0,0 +1,101 @@
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "ref_src", "ref_url",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Get the canonical form of a URL, under which variants of the same page compare equal:
+    http and https, `www.` and bare hosts, default ports, trailing slashes, fragments,
+    tracking parameters and the order of the query parameters are all ignored.
+    Values that are not absolute URLs, such as local document paths, are returned as is.
+
+    Args:
+      url (str): The URL to canonicalize.
+
+    Returns:
+      str: The canonical URL.
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return url
+
+    host = (parts.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if ":" in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https", host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+class VisitedUrls(set):
+    """
+    Set of visited URLs stored in their canonical form, so that variants of an already
+    visited page are recognised. The first original URL seen for every page is remembered
+    and used for references.
+    """
+
+    def __init__(self, urls: Iterable[str] = ()):
+        super().__init__()
+        self._originals = {}
+        self.update(urls)
+
+    def add(self, url: str) -> None:
+        canonical = canonicalize_url(url)
+        self._originals.setdefault(canonical, url)
+        super().add(canonical)
+
+    def update(self, *iterables: Iterable[str]) -> None:
+        for urls in iterables:
+            if isinstance(urls, VisitedUrls):
+                for canonical in list(urls):
+                    self._originals.setdefault(canonical, urls.original(canonical))
+                    super().add(canonical)
+            else:
+                for url in list(urls):
+                    self.add(url)
+
+    def __contains__(self, url) -> bool:
+        return isinstance(url, str) and super().__contains__(canonicalize_url(url))
+
+    def discard(self, url: str) -> None:
+        canonical = canonicalize_url(url)
+        super().discard(canonical)
+        self._originals.pop(canonical, None)
+
+    def remove(self, url: str) -> None:
+        if url not in self:
+            raise KeyError(url)
+        self.discard(url)
+
+    def clear(self) -> None:
+        super().clear()
+        self._originals.clear()
+
+    def original(self, url: str) -> str:
+        """Get the first original URL seen for a page"""
+        canonical = canonicalize_url(url)
+        return self._originals.get(canonical, canonical)
+
+    def originals(self) -> list:
+        """Get the first original URL seen for every visited page, in the order they were visited"""
+        return [url for canonical, url in self._originals.items() if set.__contains__(self, canonical)]
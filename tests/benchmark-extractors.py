@@ -0,0 +1,66 @@
+"""
+Benchmark the HTML extractors selectable with SCRAPER_HTML_EXTRACTOR.
+
+Every engine parses a corpus of saved HTML pages in a fresh process, so that the reported
+peak memory (growth of the resident set size, which also covers lxml's C allocations) is not
+skewed by the other engine. The outputs of the engines are compared page by page.
+
+Usage:
+    python tests/benchmark-extractors.py [--corpus tests/docs/html] [--repeat 50]
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+from pathlib import Path
+
+DEFAULT_CORPUS = Path(__file__).parent / "docs" / "html"
+
+
+def load_corpus(corpus: Path) -> list:
+    return [(f"https://example.com/{path.name}", path.read_bytes()) for path in sorted(corpus.glob("*.html"))]
+
+
+def run_engine(engine: str, corpus: Path, repeat: int) -> tuple:
+    from gpt_researcher.scraper.scraper import HTML_EXTRACTORS
+
+    scraper_class = HTML_EXTRACTORS[engine]
+    pages = load_corpus(corpus)
+    # Warm up imports and compiled queries
+    scraper_class(pages[0][0]).parse(pages[0][1])
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = [scraper_class(link).parse(content) for link, content in pages]
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    return len(pages) * repeat / elapsed, peak_kb / 1024, outputs
+
+
+def main(corpus: Path, repeat: int):
+    pages = load_corpus(corpus)
+    total_kb = sum(len(content) for _, content in pages) / 1024
+    print(f"Corpus: {len(pages)} pages, {total_kb:.0f} KB, parsed {repeat} times\n")
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for engine in ("bs", "lxml"):
+            results[engine] = pool.apply(run_engine, (engine, corpus, repeat))
+
+    print(f"{'engine':<8}{'pages/s':>10}{'peak memory (MB)':>20}")
+    for engine, (pages_per_second, peak_mb, _) in results.items():
+        print(f"{engine:<8}{pages_per_second:>10.1f}{peak_mb:>20.1f}")
+
+    speedup = results["lxml"][0] / results["bs"][0]
+    identical = sum(a == b for a, b in zip(results["bs"][2], results["lxml"][2]))
+    print(f"\nlxml speedup: {speedup:.1f}x, identical output on {identical}/{len(pages)} pages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=50, help="Times the corpus is parsed")
+    args = parser.parse_args()
+    main(args.corpus, args.repeat)
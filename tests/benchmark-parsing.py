@@ -0,0 +1,79 @@
+"""
+Benchmark parsing fetched pages in scraper threads vs in the ParsePool worker processes.
+
+Parses a corpus of saved HTML pages with both strategies and reports the throughput, as well
+as the worst delay seen by a ticker running on the event loop, which shows how much parsing
+in threads starves the loop serving the app.
+
+Usage:
+    python tests/benchmark-parsing.py [--corpus tests/docs/html] [--repeat 20] [--workers 4]
+"""
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+
+from gpt_researcher.scraper import BeautifulSoupScraper
+from gpt_researcher.scraper.parse_pool import ParsePool
+
+DEFAULT_CORPUS = Path(__file__).parent / "docs" / "html"
+
+
+def load_corpus(corpus: Path, repeat: int) -> list:
+    pages = [(f"https://example.com/{path.name}", path.read_bytes()) for path in sorted(corpus.glob("*.html"))]
+    return pages * repeat
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: list, interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(pages: list, parse) -> tuple:
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(measure_loop_lag(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*[parse(link, content) for link, content in pages])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return elapsed, max(lags, default=0.0)
+
+
+async def main(corpus: Path, repeat: int, workers: int):
+    pages = load_corpus(corpus, repeat)
+    total_mb = sum(len(content) for _, content in pages) / 1024 / 1024
+    print(f"Corpus: {len(pages)} pages, {total_mb:.1f} MB, {workers} workers, {os.cpu_count()} CPUs\n")
+
+    semaphore = asyncio.Semaphore(workers)
+
+    async def parse_in_thread(link, content):
+        async with semaphore:
+            return await asyncio.to_thread(BeautifulSoupScraper(link).parse, content)
+
+    pool = ParsePool(max_workers=workers)
+
+    async def parse_in_process(link, content):
+        return await pool.parse(BeautifulSoupScraper, link, content)
+
+    # Start the workers before timing
+    await asyncio.gather(*[parse_in_process(*pages[0]) for _ in range(workers)])
+
+    print(f"{'strategy':<10}{'seconds':>10}{'pages/s':>10}{'max loop lag (ms)':>20}")
+    for name, parse in (("threads", parse_in_thread), ("processes", parse_in_process)):
+        elapsed, lag = await run(pages, parse)
+        print(f"{name:<10}{elapsed:>10.2f}{len(pages) / elapsed:>10.1f}{lag * 1000:>20.1f}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=20, help="Times the corpus is parsed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parsing threads and processes")
+    args = parser.parse_args()
+    asyncio.run(main(args.corpus, args.repeat, args.workers))
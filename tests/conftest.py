@@ -0,0 +1,27 @@
+import pytest_asyncio
+from aiohttp import web
+
+
+@pytest_asyncio.fixture
+async def serve():
+    """
+    Start local HTTP servers for a test. `await serve(routes)` serves the GET handlers of
+    `routes`, a dict of path to handler, and returns the base URL of the server. The servers
+    are stopped when the test ends.
+    """
+    runners = []
+
+    async def start(routes: dict) -> str:
+        app = web.Application()
+        for path, handler in routes.items():
+            app.router.add_get(path, handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        runners.append(runner)
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
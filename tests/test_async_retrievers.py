@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.actions.query_processing import get_search_results
+from gpt_researcher.retrievers import CustomRetriever, SearxSearch, SemanticScholarSearch
+from gpt_researcher.retrievers import client
+from gpt_researcher.retrievers.client import close_http_client, get_http_client
+
+
+@pytest_asyncio.fixture
+async def search_api(serve, monkeypatch):
+    peers = set()
+
+    async def searx(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        results = [{"url": f"https://example.com/{i}", "content": request.query["q"]} for i in range(5)]
+        return web.json_response({"results": results})
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.json_response({"data": []})
+
+    async def custom(request):
+        return web.json_response([{"url": "https://example.com/custom", "raw_content": request.query["query"]}])
+
+    base = await serve({"/search": searx, "/custom": custom, "/slow": slow})
+    monkeypatch.setenv("SEARX_URL", base)
+    monkeypatch.setenv("RETRIEVER_ENDPOINT", f"{base}/custom")
+    monkeypatch.setattr(SemanticScholarSearch, "BASE_URL", f"{base}/slow")
+    yield peers
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_asearch_reuses_the_pooled_client(search_api):
+    first = await SearxSearch("solar panels").asearch(max_results=3)
+    second = await get_search_results("wind turbines", SearxSearch)
+
+    assert first == [{"href": f"https://example.com/{i}", "body": "solar panels"} for i in range(3)]
+    assert len(second) == 5 and second[0]["body"] == "wind turbines"
+    assert get_http_client() is get_http_client()
+    # Both searches went through the same kept-alive connection
+    assert len(search_api) == 1
+
+    custom = await CustomRetriever("tides").asearch()
+    assert custom == [{"url": "https://example.com/custom", "raw_content": "tides"}]
+
+
+@pytest.mark.asyncio
+async def test_sync_search_wraps_asearch(search_api):
+    results = await asyncio.to_thread(SearxSearch("geothermal").search, max_results=2)
+    assert results == [{"href": f"https://example.com/{i}", "body": "geothermal"} for i in range(2)]
+
+
+@pytest.mark.asyncio
+async def test_requests_time_out_by_default(search_api, monkeypatch):
+    monkeypatch.setattr(client, "DEFAULT_TIMEOUT", 0.2)
+    assert get_http_client().timeout.total == 0.2
+
+    assert await SemanticScholarSearch("slow").asearch() == []
+
+
+def test_client_is_closed_when_the_loop_shuts_down():
+    async def open_client():
+        return get_http_client()
+
+    http_client = asyncio.run(open_client())
+    assert http_client.closed
+    assert not any(session is http_client for session, _ in client._clients.values())
@@ -0,0 +1,52 @@
+import pytest
+
+from gpt_researcher.scraper import BeautifulSoupScraper, PyMuPDFScraper
+from gpt_researcher.scraper.routing import sniff_content_kind
+from gpt_researcher.scraper.scraper import Scraper
+
+
+@pytest.mark.parametrize(
+    "content_type, head, kind",
+    [
+        ("application/pdf", b"%PDF-1.7\n", "pdf"),
+        # Magic bytes win over a wrong or generic header
+        ("application/octet-stream", b"%PDF-1.4\n", "pdf"),
+        ("text/html; charset=utf-8", b"%PDF-1.4\n", "pdf"),
+        ("application/pdf", b"<!DOCTYPE html><html>", "html"),
+        ("text/html", b"PK\x03\x04rest", "unsupported"),
+        (None, b"\x00\x00\x00\x18ftypmp42", "unsupported"),
+        ("application/octet-stream", b"\x89PNG\r\n\x1a\n", "unsupported"),
+        # Header alone, before any bytes are read
+        ("video/mp4", b"", "unsupported"),
+        ("application/zip", b"", "unsupported"),
+        ("image/svg+xml", b"", "unsupported"),
+        ("text/html", b"", "html"),
+        ("text/plain", b"plain text", "text"),
+        ("application/json", b'{"a": 1}', "text"),
+        (None, b"<html><body>hi</body></html>", "html"),
+        ("application/octet-stream", b"\x01\x00\x02binary", "unsupported"),
+    ],
+)
+def test_sniff_content_kind(content_type, head, kind):
+    assert sniff_content_kind(content_type, head) == kind
+
+
+def test_get_parser_routes_by_sniffed_format():
+    scraper = Scraper([], "ua", "bs")
+    link = "https://example.com/download?id=1"
+
+    html_scraper = BeautifulSoupScraper(link)
+    assert isinstance(scraper.get_parser(html_scraper, "pdf", link, None), PyMuPDFScraper)
+    assert scraper.get_parser(html_scraper, "html", link, None) is html_scraper
+
+    pdf_scraper = PyMuPDFScraper("https://example.com/paper.pdf")
+    assert scraper.get_parser(pdf_scraper, "pdf", link, None) is pdf_scraper
+    assert isinstance(scraper.get_parser(pdf_scraper, "html", link, None), BeautifulSoupScraper)
+
+
+def test_get_scraper_matches_arxiv_by_host():
+    scraper = Scraper([], "ua", "bs")
+    assert scraper.get_scraper("https://arxiv.org/abs/2401.00001").__name__ == "ArxivScraper"
+    assert scraper.get_scraper("https://export.arxiv.org/abs/2401.00001").__name__ == "ArxivScraper"
+    assert scraper.get_scraper("https://blog.com/why-arxiv.org-matters") is BeautifulSoupScraper
+    assert scraper.get_scraper("https://notarxiv.org/abs/2401.00001") is BeautifulSoupScraper
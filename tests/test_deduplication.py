@@ -0,0 +1,123 @@
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.context import compression
+from gpt_researcher.context.compression import ContextCompressor, StreamingContextCompressor
+from gpt_researcher.context.deduplication import NearDuplicateFilter
+from gpt_researcher.skills.context_manager import ContextManager
+
+CORPUS = Path(__file__).parent / "docs" / "html"
+
+
+def article(seed, words=400):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def edit(text, fraction, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(fraction * len(words))):
+        words[i] = "edited"
+    return " ".join(words)
+
+
+class ConstantEmbeddings(Embeddings):
+    def embed_documents(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+
+def test_near_duplicate_filter():
+    near_duplicates = NearDuplicateFilter(threshold=0.8)
+    original = article(1)
+
+    assert not near_duplicates.is_duplicate(original)
+    # Syndicated copy with a different header and footer, and a lightly edited one
+    assert near_duplicates.is_duplicate(f"Published by Example Wire. {original} All rights reserved.")
+    assert near_duplicates.is_duplicate(edit(original, 0.02))
+    # Heavily rewritten and unrelated texts are kept
+    assert not near_duplicates.is_duplicate(edit(original, 0.3))
+    assert not near_duplicates.is_duplicate(article(2))
+    assert near_duplicates.stats()["seen"] == 5
+    assert near_duplicates.stats()["dropped"] == 2
+
+
+def test_near_duplicate_filter_keeps_distinct_corpus_pages():
+    near_duplicates = NearDuplicateFilter(threshold=0.8)
+    assert not any(near_duplicates.is_duplicate(path.read_text()) for path in CORPUS.glob("*.html"))
+
+
+@pytest.mark.asyncio
+async def test_context_compressor_drops_duplicate_pages():
+    text = article(3, words=1000)
+    pages = [
+        {"url": "https://origin.com", "title": "Origin", "raw_content": text},
+        {"url": "https://mirror.com", "title": "Mirror", "raw_content": text + " Mirrored."},
+        {"url": "https://other.com", "title": "Other", "raw_content": article(4, words=1000)},
+    ]
+    compressor = ContextCompressor(documents=pages, embeddings=ConstantEmbeddings(), dedup_threshold=0.8)
+
+    context = await compressor.async_get_context("query", max_results=100)
+
+    assert "https://mirror.com" not in context
+    assert "https://origin.com" in context and "https://other.com" in context
+    assert compressor.dedup_stats()["pages"]["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_compressor_drops_duplicate_chunks():
+    shared = article(5, words=300)
+
+    async def pages():
+        yield {"url": "https://a.com", "title": "A", "raw_content": shared}
+        yield {"url": "https://b.com", "title": "B", "raw_content": article(6, words=1000) + "\n\n" + shared}
+
+    compressor = StreamingContextCompressor(embeddings=ConstantEmbeddings(), dedup_threshold=0.8)
+    context = await compressor.async_get_context("query", pages(), max_results=100)
+
+    stats = compressor.dedup_stats()
+    assert stats["pages"]["dropped"] == 0
+    assert stats["chunks"]["dropped"] >= 1
+    assert context.count(shared[:200]) == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_pages_dropped_across_sub_queries(monkeypatch):
+    # The embedding cost estimate needs the tokenizer files, which are not needed here
+    monkeypatch.setattr(compression, "estimate_embedding_cost", lambda model, docs: 0)
+    text = article(7, words=1000)
+    researcher = SimpleNamespace(
+        cfg=SimpleNamespace(dedup_similarity_threshold=0.8, enough_content_chunks=0),
+        memory=SimpleNamespace(get_embeddings=ConstantEmbeddings),
+        verbose=False,
+        add_costs=lambda cost: None,
+    )
+    context_manager = ContextManager(researcher)
+
+    async def pages(url, content):
+        yield {"url": url, "title": url, "raw_content": content}
+
+    # The sub-queries of a research each build their own compressor
+    first = await context_manager.get_similar_content_by_query(
+        "first", [{"url": "https://origin.com", "title": "Origin", "raw_content": text}]
+    )
+    second = await context_manager.get_similar_content_by_query_from_stream(
+        "second", pages("https://mirror.com", f"Syndicated by Example Wire. {text}")
+    )
+
+    assert "https://origin.com" in first
+    assert second == ""
+    assert context_manager.page_duplicates.stats()["dropped"] == 1
+
+
+def test_dedup_disabled():
+    compressor = ContextCompressor(documents=[], embeddings=ConstantEmbeddings(), dedup_threshold=0)
+    assert compressor.dedup_stats() is None
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from gpt_researcher.scraper.browser.driver_pool import DriverPool, PooledDriver
+
+
+class FakeDriver:
+    started = 0
+
+    def __init__(self):
+        FakeDriver.started += 1
+        self.quitted = False
+
+    def quit(self):
+        self.quitted = True
+
+
+def _factory():
+    return PooledDriver(FakeDriver())
+
+
+def test_driver_pool_reuses_and_bounds_drivers():
+    FakeDriver.started = 0
+    pool = DriverPool(max_size=2, max_pages=10)
+    first, second = pool.acquire("chrome", _factory), pool.acquire("chrome", _factory)
+    assert first is not second
+
+    waiting = []
+    thread = threading.Thread(target=lambda: waiting.append(pool.acquire("chrome", _factory)))
+    thread.start()
+    time.sleep(0.05)
+    assert not waiting
+
+    pool.release("chrome", first)
+    thread.join(timeout=1)
+    assert waiting == [first]
+
+    # Released drivers are reused instead of starting new ones
+    pool.release("chrome", second)
+    assert pool.acquire("chrome", _factory) is second
+    assert FakeDriver.started == 2
+
+
+def test_driver_pool_recycles_crashed_and_worn_out_drivers():
+    pool = DriverPool(max_size=1, max_pages=2)
+    member = pool.acquire("chrome", _factory)
+    pool.release("chrome", member, crashed=True)
+    assert member.driver.quitted
+
+    member = pool.acquire("chrome", _factory)
+    pool.release("chrome", member)
+    assert pool.acquire("chrome", _factory) is member
+    pool.release("chrome", member)
+    assert member.driver.quitted
+    assert pool.acquire("chrome", _factory) is not member
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.scraper import latency
+from gpt_researcher.scraper.engine import ScrapeEngine
+from gpt_researcher.scraper.latency import DEFAULT_TIMEOUT, LatencyProfile, get_client_timeout
+from gpt_researcher.skills.browser import BrowserManager
+
+
+def test_timeout_derived_from_p95_within_bounds():
+    profile = LatencyProfile(floor=1, ceiling=10)
+    fast, slow = "https://fast.example.com/a", "https://slow.example.com/a"
+    assert profile.timeout_for(fast) == DEFAULT_TIMEOUT
+
+    for _ in range(20):
+        profile.record(fast, 0.1)
+        profile.record(slow, 4.0)
+    profile.record(slow, 3.0)
+
+    assert profile.percentiles(slow) == (4.0, 4.0)
+    assert profile.timeout_for(fast) == 1
+    assert profile.timeout_for(slow) == 8.0
+
+    for _ in range(5):
+        profile.record_timeout(slow, 8.0)
+    assert profile.timeout_for(slow) == 10
+
+
+def test_profile_persisted(tmp_path):
+    path = str(tmp_path / "latency.json")
+    profile = LatencyProfile(path=path)
+    for seconds in (0.5, 1.0, 1.5, 2.0, 2.5):
+        profile.record("https://example.com/page", seconds)
+    profile.save()
+
+    restored = LatencyProfile(path=path)
+    assert restored.stats() == profile.stats()
+    assert restored.timeout_for("https://example.com/other") == 5.0
+
+
+def test_concurrent_saves(tmp_path):
+    path = str(tmp_path / "latency.json")
+    profile = LatencyProfile(path=path)
+    errors = []
+
+    def record_and_save(worker):
+        try:
+            for i in range(100):
+                profile.record(f"https://site{worker}.example.com/{i}", 0.1)
+                profile.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=record_and_save, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == ["latency.json"]
+    assert len(LatencyProfile(path=path).stats()) == 4
+
+
+def test_failed_save_is_logged(tmp_path, caplog):
+    # The parent of the profile is a file, so its directory cannot be created
+    (tmp_path / "file").write_text("")
+    profile = LatencyProfile(path=str(tmp_path / "file" / "latency.json"))
+    profile.record("https://example.com/page", 0.1)
+    profile.save()
+
+    assert "Could not save the latency profile" in caplog.text
+
+
+def test_request_timeout_bounds_the_whole_download():
+    timeout = get_client_timeout(3)
+    assert (timeout.sock_connect, timeout.sock_read) == (3, 3)
+    assert timeout.total == 3 * latency.TOTAL_TIMEOUT_MULTIPLIER
+
+
+def test_profile_is_built_from_the_research_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(latency, "_profile", None)
+    cfg = SimpleNamespace(cache_dir=str(tmp_path), scraper_timeout_floor=3, scraper_timeout_ceiling=12)
+    BrowserManager(SimpleNamespace(cfg=cfg))
+
+    # Later callers without a config, such as the synchronous scrapers, share that profile
+    profile = latency.get_latency_profile()
+    assert (profile.floor, profile.ceiling) == (3, 12)
+    assert profile.path == str(tmp_path / "latency.json")
+
+
+@pytest_asyncio.fixture
+async def server(serve):
+    async def slow(request):
+        await asyncio.sleep(0.3)
+        return web.Response(text="late")
+
+    return await serve({"/slow": slow})
+
+
+@pytest.mark.asyncio
+async def test_engine_uses_and_feeds_the_profile(server):
+    profile = LatencyProfile(floor=0.1, ceiling=10)
+    url = f"{server}/slow"
+    for _ in range(5):
+        profile.record(url, 0.05)
+    engine = ScrapeEngine(latency=profile)
+    try:
+        # The domain looked fast, so its 0.1s timeout expires and is recorded
+        with pytest.raises(asyncio.TimeoutError):
+            await engine.fetch(url)
+        for _ in range(5):
+            profile.record_timeout(url, 0.5)
+        response = await engine.fetch(url)
+    finally:
+        await engine.close()
+
+    assert response.content == b"late"
+    assert profile.percentiles(url)[1] >= 0.3
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from gpt_researcher.scraper import BeautifulSoupScraper, LxmlScraper
+from gpt_researcher.scraper.scraper import Scraper
+
+CORPUS = Path(__file__).parent / "docs" / "html"
+
+
+@pytest.mark.parametrize("path", sorted(CORPUS.glob("*.html")), ids=lambda path: path.name)
+def test_lxml_matches_beautiful_soup_on_corpus(path):
+    link = f"https://example.com/{path.name}"
+    content = path.read_bytes()
+    assert LxmlScraper(link).parse(content) == BeautifulSoupScraper(link).parse(content)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"<p>no title</p><!-- comment --> tail <div class='x nav'>gone<div class='menu'>x</div></div>after",
+        b"<header>h</header>x<nav>n</nav>y<svg><title>svg</title></svg>z<template>t</template>",
+        b"<div class='sidebar'>s<img src='x.png' class='hero'></div><div class='footer-links'>keep</div>",
+        b"<p>a<ruby>k<rp>(</rp><rt>kan</rt><rp>)</rp></ruby>b<script>s</script>c</p>",
+        "<html><head><meta charset='iso-8859-1'><title>Caf\xe9</title></head><body>na\xefve</body></html>".encode("latin-1"),
+        b"<p><img src='/a.png' class='hero'><img src='b.png' width='2400px' height='1200'><img src='c.png' width='10' height='10'></p>",
+        b"",
+    ],
+)
+def test_lxml_matches_beautiful_soup_on_edge_cases(content):
+    link = "https://example.com/page"
+    assert LxmlScraper(link).parse(content) == BeautifulSoupScraper(link).parse(content)
+
+
+def test_html_extractor_selected_from_config():
+    class Cfg:
+        scraper_html_extractor = "lxml"
+
+    scraper = Scraper([], "ua", "bs", Cfg())
+    assert scraper.get_scraper("https://example.com/page") is LxmlScraper
+    assert Scraper([], "ua", "bs").get_scraper("https://example.com/page") is BeautifulSoupScraper
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+from gpt_researcher.scraper.cache import PageCache, get_cache_key
+
+
+def _page(content):
+    return {"raw_content": content, "title": "Title", "image_urls": []}
+
+
+def test_cache_key_ignores_host_case_and_fragment():
+    assert get_cache_key("HTTPS://Example.com/a?b=1#top") == "https://example.com/a?b=1"
+
+
+def test_cache_key_is_the_canonical_url(tmp_path):
+    variants = [
+        "https://example.com/a?b=1",
+        "http://www.example.com/a/?b=1",
+        "https://example.com/a?utm_source=feed&b=1",
+    ]
+    assert len({get_cache_key(url) for url in variants}) == 1
+
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    cache.put(variants[1], _page("hello"))
+    assert cache.get(variants[2])["raw_content"] == "hello"
+
+
+def test_page_cache_hit_and_revalidation(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite"), ttl=60)
+    assert cache.get("https://example.com/") is None
+
+    cache.put("https://example.com/", _page("hello"), etag='"abc"')
+    page = cache.get("https://example.com/")
+    assert page["fresh"] and page["raw_content"] == "hello" and page["etag"] == '"abc"'
+
+    cache.ttl = 0
+    assert not cache.get("https://example.com/")["fresh"]
+    cache.refresh("https://example.com/")
+    assert cache.stats() == {"hits": 1, "misses": 2, "revalidated": 1, "hit_ratio": 0.333}
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    # Random hex compresses to ~1.2KB per page, leaving room for three pages
+    cache.max_bytes = 4000
+    for i in range(3):
+        cache.put(f"https://example.com/{i}", _page(os.urandom(1000).hex()))
+        time.sleep(0.01)
+    cache.get("https://example.com/0")
+    cache.put("https://example.com/3", _page(os.urandom(1000).hex()))
+
+    assert cache.get("https://example.com/0") is not None
+    assert cache.get("https://example.com/1") is None
+    assert cache.get("https://example.com/3") is not None
+
+
+def test_page_cache_tracks_its_size(tmp_path):
+    path = str(tmp_path / "pages.sqlite")
+    cache = PageCache(path)
+    cache.put("https://example.com/a", _page("a" * 1000))
+    cache.put("https://example.com/b", _page(os.urandom(500).hex()))
+    # Replacing a page does not count its previous version
+    cache.put("https://example.com/a", _page(os.urandom(500).hex()))
+
+    stored = cache._conn.execute("SELECT SUM(size) FROM pages").fetchone()[0]
+    assert cache._size == stored
+    assert PageCache(path)._size == stored
+
+
+def test_page_cache_size_unchanged_by_failed_writes(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    cache.put("https://example.com/a", _page(os.urandom(1000).hex()))
+    size = cache._size
+    # The eviction needed by the next page fails, which rolls the whole write back
+    cache._conn.execute("CREATE TRIGGER no_delete BEFORE DELETE ON pages BEGIN SELECT RAISE(ABORT, 'read only'); END")
+    cache.max_bytes = size
+
+    with pytest.raises(sqlite3.DatabaseError):
+        cache.put("https://example.com/b", _page(os.urandom(1000).hex()))
+
+    assert cache._size == size == cache._conn.execute("SELECT SUM(size) FROM pages").fetchone()[0]
@@ -0,0 +1,91 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.scraper.engine import ScrapeEngine
+from gpt_researcher.scraper.parse_pool import ParsePool
+from gpt_researcher.scraper.routing import ContentTooLargeError
+from gpt_researcher.scraper.scraper import Scraper
+from gpt_researcher.scraper.utils import truncate_text
+
+BIG_PAGE = b"<html><head><title>Dump</title></head><body>" + b"<p>lorem ipsum dolor</p>" * 50_000 + b"</body></html>"
+BIG_PDF = b"%PDF-1.7\n" + b"0" * 200_000
+
+
+async def page(request):
+    return web.Response(body=BIG_PAGE, content_type="text/html")
+
+
+async def document(request):
+    return web.Response(body=BIG_PDF, content_type="application/pdf")
+
+
+@pytest_asyncio.fixture
+async def server(serve):
+    return await serve({"/page": page, "/doc": document})
+
+
+def test_truncate_text_cuts_on_word_boundary():
+    text = "word " * 100
+    assert truncate_text(text, 0) == (text, False)
+    assert truncate_text(text, 1000) == (text, False)
+    truncated, was_truncated = truncate_text(text, 42)
+    assert was_truncated
+    assert truncated == "word " * 7 + "word"
+
+
+@pytest.mark.asyncio
+async def test_fetch_stops_at_byte_limit(server):
+    engine = ScrapeEngine()
+    try:
+        response = await engine.fetch(f"{server}/page", max_bytes=100_000)
+        assert response.truncated
+        assert len(response.content) == 100_000
+
+        response = await engine.fetch(f"{server}/page")
+        assert not response.truncated
+        assert response.content == BIG_PAGE
+
+        # A partial PDF cannot be parsed, so it is dropped instead
+        with pytest.raises(ContentTooLargeError):
+            await engine.fetch(f"{server}/doc", max_bytes=100_000, max_pdf_bytes=100_000)
+        response = await engine.fetch(f"{server}/doc", max_bytes=100_000)
+        assert response.content == BIG_PDF
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_scraper_counts_truncated_pages(server):
+    class Cfg:
+        scraper_max_page_bytes = 100_000
+        scraper_max_page_chars = 5_000
+
+    scraper = Scraper([f"{server}/page", f"{server}/doc"], "ua", "bs", Cfg())
+    try:
+        pages = await scraper.scrape()
+    finally:
+        await scraper.engine.close()
+
+    assert [page["url"] for page in pages] == [f"{server}/page"]
+    assert len(pages[0]["raw_content"]) <= 5_000
+    assert pages[0]["title"] == "Dump"
+    assert scraper.truncated_pages == 1
+
+
+@pytest.mark.asyncio
+async def test_scraper_counts_pages_truncated_before_parsing(server, monkeypatch):
+    class Cfg:
+        scraper_max_page_bytes = 0
+        scraper_max_page_chars = 0
+
+    scraper = Scraper([f"{server}/page"], "ua", "bs", Cfg())
+    monkeypatch.setattr(scraper, "parse_pool", ParsePool(max_workers=1, max_mb=0.5))
+    try:
+        pages = await scraper.scrape()
+    finally:
+        scraper.parse_pool.close()
+        await scraper.engine.close()
+
+    assert len(pages) == 1
+    assert scraper.truncated_pages == 1
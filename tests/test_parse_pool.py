@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from gpt_researcher.scraper import BeautifulSoupScraper
+from gpt_researcher.scraper.parse_pool import ParsePool, get_parse_pool
+
+CORPUS = Path(__file__).parent / "docs" / "html"
+
+
+class CrashingScraper(BeautifulSoupScraper):
+    """Kills the parse worker it runs in, as an out of memory kill would"""
+
+    def parse(self, content, encoding=None):
+        if multiprocessing.parent_process() is not None:
+            os._exit(1)
+        return super().parse(content, encoding)
+
+
+class RecordingGovernor:
+    def __init__(self):
+        self.calls = []
+
+    async def run(self, func, *args):
+        self.calls.append(func)
+        return func(*args)
+
+
+@pytest.mark.asyncio
+async def test_parse_pool_matches_thread_parsing():
+    link = "https://news.example.com/article"
+    content = (CORPUS / "news_article.html").read_bytes()
+    pool = ParsePool(max_workers=1)
+    try:
+        text, image_urls, title, truncated = await pool.parse(BeautifulSoupScraper, link, content)
+    finally:
+        pool.close()
+
+    assert (text, image_urls, title) == BeautifulSoupScraper(link).parse(content)
+    assert not truncated
+    assert type(title) is str
+    assert title == "Grid operators brace for record demand"
+
+
+@pytest.mark.asyncio
+async def test_parse_pool_truncates_large_pages():
+    link = "https://example.com/big"
+    content = b"<html><body><p>" + b"word " * 100_000 + b"</p></body></html>"
+    pool = ParsePool(max_workers=1, max_mb=0.01)
+    try:
+        text, _, _, truncated = await pool.parse(BeautifulSoupScraper, link, content)
+    finally:
+        pool.close()
+
+    assert truncated
+    assert len(text) <= pool.max_bytes
+
+
+def test_parse_pool_disabled_by_default():
+    class Cfg:
+        scraper_parse_workers = 0
+
+    assert get_parse_pool(Cfg()) is None
+
+
+@pytest.mark.asyncio
+async def test_parse_pool_falls_back_on_governor_threads_when_a_worker_crashes():
+    link = "https://news.example.com/article"
+    content = (CORPUS / "news_article.html").read_bytes()
+    governor = RecordingGovernor()
+    pool = ParsePool(max_workers=1, governor=governor)
+    try:
+        text, _, title, _ = await pool.parse(CrashingScraper, link, content)
+        assert pool._executor is None
+        assert len(governor.calls) == 1
+        assert title == "Grid operators brace for record demand"
+
+        # The next page gets a fresh pool
+        assert (await pool.parse(BeautifulSoupScraper, link, content))[0] == text
+        assert pool._executor is not None
+    finally:
+        pool.close()
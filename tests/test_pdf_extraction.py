@@ -0,0 +1,81 @@
+import pymupdf
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.scraper.pymupdf.pymupdf import PyMuPDFScraper, extract_pdf_text
+from gpt_researcher.scraper.scraper import Scraper
+
+
+def make_pdf(pages, title=""):
+    doc = pymupdf.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.set_metadata({"title": title})
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def test_extract_pdf_text_page_offsets():
+    content = make_pdf(["First page", "Second page", "Third page"], title="Report")
+    text, page_offsets, title = extract_pdf_text(content)
+
+    assert title == "Report"
+    assert len(page_offsets) == 3
+    assert text[page_offsets[1]:].startswith("Second page")
+    assert text[page_offsets[2]:].startswith("Third page")
+
+
+def test_extract_pdf_text_page_budget():
+    content = make_pdf([f"Page {i}" for i in range(10)])
+    text, page_offsets, _ = extract_pdf_text(content, max_pages=4)
+
+    assert len(page_offsets) == 4
+    assert "Page 3" in text
+    assert "Page 4" not in text
+
+
+def test_scraper_parse_from_memory():
+    scraper = PyMuPDFScraper("https://example.com/report.pdf")
+    content, image_urls, title = scraper.parse(make_pdf(["Hello PDF"], title="Hello"))
+
+    assert content == "Hello PDF"
+    assert image_urls == []
+    assert title == "Hello"
+    assert scraper.page_offsets == [0]
+
+
+REPORT_PAGES = [f"Page {i} of the annual report on renewable energy capacity." for i in range(3)]
+
+
+async def report(request):
+    return web.Response(body=make_pdf(REPORT_PAGES, title="Annual report"), content_type="application/pdf")
+
+
+@pytest_asyncio.fixture
+async def server(serve):
+    return await serve({"/report": report})
+
+
+@pytest.mark.asyncio
+async def test_scraped_pdf_keeps_page_offsets(server, tmp_path):
+    class Cfg:
+        cache_dir = str(tmp_path)
+        scraper_max_pdf_pages = 2
+
+    for _ in range(2):
+        # The second scrape is served from the page cache
+        scraper = Scraper([f"{server}/report"], "ua", "bs", Cfg())
+        try:
+            pages = await scraper.scrape()
+        finally:
+            await scraper.engine.close()
+
+        assert len(pages) == 1
+        page = pages[0]
+        assert page["title"] == "Annual report"
+        assert len(page["page_offsets"]) == 2
+        assert page["raw_content"][page["page_offsets"][1]:].startswith("Page 1 of")
+        assert "Page 2 of" not in page["raw_content"]
+    assert scraper.page_cache.hits == 1
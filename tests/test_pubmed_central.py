@@ -0,0 +1,91 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.retrievers import PubMedCentralSearch
+from gpt_researcher.retrievers.client import close_http_client
+from gpt_researcher.retrievers.pubmed_central import pubmed_central
+
+
+def article_xml(article_id, structured_abstract=None):
+    if structured_abstract is None:
+        structured_abstract = article_id not in ("3", "4")
+    if structured_abstract:
+        abstract = f"<abstract><sec><title>Background</title><p>Abstract <italic>of</italic> {article_id}.</p></sec></abstract>"
+    else:
+        abstract = f"<abstract><p>Abstract <italic>of</italic> {article_id}.</p></abstract>"
+    if article_id == "3":
+        # Metadata only, no full text
+        body = ""
+    elif article_id == "4":
+        # No <body>, paragraphs in back matter sections
+        body = "<back><sec><p>Supplementary findings.</p></sec></back>"
+    else:
+        paragraphs = "".join(f"<p>Paragraph {i} of article {article_id}.</p>" for i in range(200))
+        body = f"<body><sec><title>Results</title>{paragraphs}</sec></body>"
+    return f"""
+    <article xmlns:xlink="http://www.w3.org/1999/xlink">
+      <front><article-meta>
+        <article-id pub-id-type="pmid">9{article_id}</article-id>
+        <article-id pub-id-type="pmc">PMC{article_id}</article-id>
+        <title-group><article-title>Title {article_id}</article-title></title-group>
+        {abstract}
+      </article-meta></front>
+      {body}
+    </article>"""
+
+
+@pytest_asyncio.fixture
+async def eutils(serve, monkeypatch):
+    efetch_batches = []
+
+    async def esearch(request):
+        return web.json_response({"esearchresult": {"idlist": [str(i) for i in range(1, 13)]}})
+
+    async def efetch(request):
+        ids = request.query["id"].split(",")
+        efetch_batches.append(ids)
+        # Articles are not necessarily returned in the requested order
+        articles = "".join(article_xml(article_id) for article_id in reversed(ids))
+        return web.Response(text=f"<pmc-articleset>{articles}</pmc-articleset>", content_type="text/xml")
+
+    base = await serve({"/esearch": esearch, "/efetch": efetch})
+    monkeypatch.setenv("NCBI_API_KEY", "test")
+    monkeypatch.setattr(PubMedCentralSearch, "ESEARCH_URL", f"{base}/esearch")
+    monkeypatch.setattr(PubMedCentralSearch, "EFETCH_URL", f"{base}/efetch")
+    yield efetch_batches
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_articles_are_fetched_in_batches(eutils):
+    results = await PubMedCentralSearch("crispr").asearch(max_results=12)
+
+    assert sorted(len(batch) for batch in eutils) == [2, 10]
+    # Article 3 has no full text and is skipped, the others keep the relevance order
+    assert [r["href"] for r in results] == [
+        f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{i}/" for i in range(1, 13) if i != 3
+    ]
+    first = results[0]["body"]
+    assert first.startswith("Title 1\n\nBackgroundAbstract of 1.\n\nParagraph 0 of article 1.\nParagraph 1")
+    assert len(first) < 600
+    assert results[2]["body"] == "Title 4\n\nAbstract of 4.\n\nSupplementary findings...."
+
+
+def test_parse_articles_falls_back_on_requested_ids():
+    xml = article_xml("7").replace('<article-id pub-id-type="pmc">PMC7</article-id>', "")
+    articles = PubMedCentralSearch.__new__(PubMedCentralSearch).parse_articles(f"<pmc-articleset>{xml}</pmc-articleset>", ["7"])
+
+    assert list(articles) == ["7"]
+    assert articles["7"]["has_body"]
+    assert len(articles["7"]["body"]) <= pubmed_central.SNIPPET_CHARS
+
+
+def test_structured_abstract_counts_as_body_without_full_text():
+    # Without a <body>, paragraphs of any section count, the sections of the abstract included
+    xml = article_xml("3", structured_abstract=True)
+    articles = PubMedCentralSearch.__new__(PubMedCentralSearch).parse_articles(f"<pmc-articleset>{xml}</pmc-articleset>")
+
+    assert articles["3"]["has_body"]
+    assert articles["3"]["abstract"] == "BackgroundAbstract of 3."
+    assert articles["3"]["body"] == "Abstract"
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import pytest
+
+from gpt_researcher.actions.query_processing import search_retrievers
+
+
+def make_retriever(name, delay=0.0, error=None):
+    class FakeRetriever:
+        def __init__(self, query):
+            self.query = query
+
+        async def asearch(self, max_results=5):
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            return [{"href": f"https://{name}.com/{i}", "body": self.query} for i in range(max_results)]
+
+    FakeRetriever.__name__ = name
+    return FakeRetriever
+
+
+@pytest.mark.asyncio
+async def test_retrievers_are_searched_concurrently():
+    retrievers = [make_retriever(name, delay=0.2) for name in ("tavily", "bing", "arxiv")]
+    start = time.perf_counter()
+    searches = await search_retrievers("query", retrievers, max_results=2, timeout=5)
+
+    assert time.perf_counter() - start < 0.5
+    assert [search["retriever"] for search in searches] == ["tavily", "bing", "arxiv"]
+    assert all(search["status"] == "ok" and len(search["results"]) == 2 for search in searches)
+    assert all(search["latency"] >= 0.2 for search in searches)
+
+
+@pytest.mark.asyncio
+async def test_hung_or_failing_retriever_returns_no_results():
+    retrievers = [
+        make_retriever("fast"),
+        make_retriever("hung", delay=5),
+        make_retriever("broken", error=ValueError("missing API key")),
+    ]
+    start = time.perf_counter()
+    fast, hung, broken = await search_retrievers("query", retrievers, max_results=3, timeout=0.2)
+
+    assert time.perf_counter() - start < 0.5
+    assert fast["status"] == "ok" and len(fast["results"]) == 3
+    assert hung["status"] == "timeout" and hung["results"] == []
+    assert broken["status"] == "error" and broken["results"] == []
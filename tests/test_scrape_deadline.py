@@ -0,0 +1,109 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.actions.web_scraping import stream_scrape_urls
+from gpt_researcher.scraper.scraper import Scraper
+from gpt_researcher.skills.browser import BrowserManager
+
+PAGE = "<html><head><title>{0}</title></head><body><p>" + "Some content about {0}. " * 20 + "</p></body></html>"
+
+
+@pytest_asyncio.fixture
+async def server(serve):
+    async def page(request):
+        delay = float(request.query.get("delay", 0))
+        await asyncio.sleep(delay)
+        return web.Response(text=PAGE.format(request.match_info["name"]), content_type="text/html")
+
+    return await serve({"/{name}": page})
+
+
+class FakeResearcher:
+    class cfg:
+        user_agent = "ua"
+        scraper = "bs"
+        scrape_deadline_seconds = 0.5
+        scrape_min_pages = 1
+
+    verbose = False
+    websocket = None
+
+    def __init__(self):
+        self.sources = []
+
+    def add_research_sources(self, pages):
+        self.sources.extend(pages)
+
+    def add_research_images(self, images):
+        pass
+
+    def get_research_images(self):
+        return []
+
+
+@pytest.mark.asyncio
+async def test_stream_abandons_slow_pages_at_deadline(server):
+    # Different hosts, so that the host scheduler does not serialize the requests
+    fast = f"{server}/fast"
+    slow = f"{server.replace('127.0.0.1', 'localhost')}/slow?delay=1.5"
+    scraper = Scraper([fast, slow], "ua", "bs")
+    start = asyncio.get_running_loop().time()
+    try:
+        pages = await scraper.scrape(deadline=0.5)
+    finally:
+        await scraper.engine.close()
+
+    assert asyncio.get_running_loop().time() - start < 1.2
+    assert [page["url"] for page in pages] == [fast]
+    assert scraper.abandoned_urls == [slow]
+
+
+@pytest.mark.asyncio
+async def test_deadline_waits_for_min_pages(server):
+    slow = f"{server}/slow?delay=0.6"
+    scraper = Scraper([slow], "ua", "bs")
+    try:
+        pages = await scraper.scrape(deadline=0.1, min_pages=1)
+    finally:
+        await scraper.engine.close()
+
+    assert [page["url"] for page in pages] == [slow]
+    assert scraper.abandoned_urls == []
+
+
+@pytest.mark.asyncio
+async def test_browse_urls_reports_abandoned_urls(server):
+    fast = f"{server}/fast"
+    slow = f"{server.replace('127.0.0.1', 'localhost')}/slow?delay=1.5"
+    researcher = FakeResearcher()
+    manager = BrowserManager(researcher)
+    try:
+        pages = await manager.browse_urls([fast, slow])
+    finally:
+        await Scraper([], "ua", "bs").engine.close()
+
+    assert [page["url"] for page in pages] == [fast]
+    assert researcher.sources == pages
+    assert manager.abandoned_urls == [slow]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_urls_abandoned_by_the_consumer(server):
+    fast = f"{server}/fast"
+    slow = f"{server.replace('127.0.0.1', 'localhost')}/slow?delay=1.5"
+    abandoned = []
+    try:
+        stream = stream_scrape_urls([fast, slow], FakeResearcher.cfg, abandoned_callback=abandoned.extend)
+        async with aclosing(stream) as pages:
+            async for page in pages:
+                # Enough content, the consumer stops before the slow page is scraped
+                break
+    finally:
+        await Scraper([], "ua", "bs").engine.close()
+
+    assert page["url"] == fast
+    assert abandoned == [slow]
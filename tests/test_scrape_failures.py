@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.scraper.failures import (
+    BLOCKED,
+    NOT_FOUND,
+    RATE_LIMITED,
+    SERVER_ERROR,
+    TIMEOUT,
+    TOO_SHORT,
+    CircuitBreaker,
+    NegativeCache,
+    classify_failure,
+    get_failure_ttl,
+)
+from gpt_researcher.scraper.scraper import Scraper
+
+
+def response_error(status, headers=None):
+    return aiohttp.ClientResponseError(None, (), status=status, headers=headers)
+
+
+def test_classify_failure():
+    assert classify_failure(asyncio.TimeoutError()) == TIMEOUT
+    assert classify_failure(response_error(404)) == NOT_FOUND
+    assert classify_failure(response_error(403)) == BLOCKED
+    assert classify_failure(response_error(429)) == RATE_LIMITED
+    assert classify_failure(response_error(503)) == RATE_LIMITED
+    assert classify_failure(response_error(502)) == SERVER_ERROR
+
+
+def test_negative_cache_expires_per_failure_class():
+    cache = NegativeCache(ttls={TIMEOUT: 0.05})
+    cache.add("https://Example.com/slow#section", TIMEOUT)
+    cache.add("https://example.com/gone", NOT_FOUND)
+
+    assert cache.get("https://example.com/slow") == TIMEOUT
+    time.sleep(0.06)
+    assert cache.get("https://example.com/slow") is None
+    assert cache.get("https://example.com/gone") == NOT_FOUND
+
+
+def test_rate_limited_urls_expire_after_retry_after():
+    assert get_failure_ttl(response_error(429, {"Retry-After": "0.05"})) == 0.05
+    assert get_failure_ttl(response_error(503)) == 60
+    assert get_failure_ttl(response_error(429, {"Retry-After": "86400"})) == 60 * 60
+    assert get_failure_ttl(response_error(404)) is None
+
+    cache = NegativeCache()
+    cache.add("https://example.com/busy", RATE_LIMITED, ttl=0.05)
+    assert cache.get("https://example.com/busy") == RATE_LIMITED
+    time.sleep(0.06)
+    assert cache.get("https://example.com/busy") is None
+
+
+def test_negative_cache_is_scoped_per_scraper():
+    cache = NegativeCache()
+    cache.add("https://example.com/app", TOO_SHORT, scraper="bs")
+
+    assert cache.get("https://example.com/app", "bs") == TOO_SHORT
+    assert cache.get("https://example.com/app", "browser") is None
+    assert cache.get("https://example.com/app", "tiered:browser") is None
+
+
+def test_negative_cache_matches_url_variants():
+    cache = NegativeCache()
+    cache.add("http://www.example.com/gone/?utm_campaign=launch", NOT_FOUND)
+
+    assert cache.get("https://example.com/gone") == NOT_FOUND
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    url = "https://down.example.com/page"
+
+    breaker.record_failure(url)
+    assert breaker.allow(url)
+    breaker.record_failure(url)
+    assert not breaker.allow(url)
+    assert breaker.allow("https://up.example.com/page")
+
+    time.sleep(0.06)
+    # A single probe is let through, and its failure doubles the cooldown
+    assert breaker.allow(url)
+    assert not breaker.allow(url)
+    breaker.record_failure(url)
+    time.sleep(0.06)
+    assert not breaker.allow(url)
+    time.sleep(0.05)
+    assert breaker.allow(url)
+    breaker.record_success(url)
+    assert breaker.allow(url)
+    assert breaker.stats()["open"] == {}
+
+
+@pytest_asyncio.fixture
+async def server(serve):
+    requests_by_path = {}
+
+    async def handler(request):
+        requests_by_path[request.path] = requests_by_path.get(request.path, 0) + 1
+        if request.path == "/short":
+            return web.Response(text="<p>hi</p>", content_type="text/html")
+        raise web.HTTPServiceUnavailable()
+
+    return await serve({"/{path}": handler}), requests_by_path
+
+
+@pytest.mark.asyncio
+async def test_scraper_skips_failed_urls_and_open_domains(server, monkeypatch):
+    url, requests_by_path = server
+    scraper = Scraper([], "ua", "bs")
+    monkeypatch.setattr(scraper, "negative_cache", NegativeCache())
+    monkeypatch.setattr(scraper, "breaker", CircuitBreaker(threshold=2, cooldown=60))
+    # No Retry-After backoff between the failing requests of the test
+    monkeypatch.setattr(scraper.engine.scheduler, "backoff", lambda link, retry_after=None: None)
+    try:
+        await scraper.scrape([f"{url}/short"])
+        await scraper.scrape([f"{url}/a", f"{url}/b"])
+        await scraper.scrape([f"{url}/short", f"{url}/a", f"{url}/c"])
+    finally:
+        await scraper.engine.close()
+
+    assert requests_by_path == {"/short": 1, "/a": 1, "/b": 1}
+    assert scraper.negative_cache.stats()["hits"] == 2
+    assert scraper.negative_cache.get(f"{url}/short", "bs") == TOO_SHORT
+    assert scraper.negative_cache.get(f"{url}/a", "bs") == RATE_LIMITED
+    assert scraper.breaker.stats()["rejected"] == 1
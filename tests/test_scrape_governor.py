@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from gpt_researcher.scraper.governor import ScrapeGovernor
+
+
+@pytest.mark.asyncio
+async def test_slots_are_shared_fairly_between_tenants():
+    governor = ScrapeGovernor(max_connections=1)
+    order = []
+
+    async def fetch(tenant, i):
+        async with governor.slot(tenant):
+            order.append(tenant)
+            await asyncio.sleep(0.01)
+
+    # A large research queues up first, a small one arrives just after
+    tasks = [asyncio.create_task(fetch("large", i)) for i in range(6)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(fetch("small", i)) for i in range(2)]
+    await asyncio.sleep(0)
+
+    stats = governor.stats()
+    assert stats["connections"]["in_use"] == 1
+    assert stats["connections"]["queued"] == 7
+    assert stats["connections"]["waiting_tenants"] == 2
+    assert stats["utilization"] == 1
+
+    await asyncio.gather(*tasks)
+    assert order[:5] == ["large", "large", "small", "large", "small"]
+    assert governor.stats()["connections"]["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_release_their_slot():
+    governor = ScrapeGovernor(max_connections=1)
+    holder_entered = asyncio.Event()
+
+    async def hold():
+        async with governor.slot("a"):
+            holder_entered.set()
+            await asyncio.sleep(0.05)
+
+    holder = asyncio.create_task(hold())
+    await holder_entered.wait()
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(holder, waiter, return_exceptions=True)
+
+    assert governor.stats()["connections"] == {"in_use": 0, "queued": 0, "waiting_tenants": 0, "max": 1}
+    async with governor.slot("b"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_shared_thread_pool_is_bounded():
+    governor = ScrapeGovernor(max_threads=2)
+    peak = {"busy": 0}
+
+    def work():
+        time.sleep(0.02)
+        peak["busy"] = max(peak["busy"], governor.stats()["threads"]["busy"])
+        return 1
+
+    try:
+        results = await asyncio.gather(*[governor.run(work) for _ in range(6)])
+    finally:
+        governor.close()
+
+    assert results == [1] * 6
+    assert peak["busy"] == 2
+    assert governor.stats()["threads"] == {"busy": 0, "queued": 0, "max": 2}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_jobs_leave_the_queue():
+    governor = ScrapeGovernor(max_threads=1)
+    try:
+        running = asyncio.ensure_future(governor.run(time.sleep, 0.1))
+        queued = asyncio.ensure_future(governor.run(time.sleep, 0.1))
+        await asyncio.sleep(0.02)
+        assert governor.stats()["threads"]["queued"] == 1
+        queued.cancel()
+        await asyncio.gather(running, queued, return_exceptions=True)
+    finally:
+        governor.close()
+
+    assert governor.stats()["threads"] == {"busy": 0, "queued": 0, "max": 1}
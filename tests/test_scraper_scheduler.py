@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from gpt_researcher.scraper.scheduler import HostScheduler, interleave_by_host
+from gpt_researcher.scraper.scraper import Scraper
+
+PAGE = "<html><head><title>Page</title></head><body><p>" + "Scheduled content. " * 20 + "</p></body></html>"
+
+
+def test_interleave_by_host():
+    urls = [
+        "https://a.com/1",
+        "https://a.com/2",
+        "https://a.com/3",
+        "https://b.com/1",
+        "https://c.com/1",
+        "https://b.com/2",
+    ]
+    assert interleave_by_host(urls) == [
+        "https://a.com/1",
+        "https://b.com/1",
+        "https://c.com/1",
+        "https://a.com/2",
+        "https://b.com/2",
+        "https://a.com/3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_host_scheduler_limits():
+    scheduler = HostScheduler(max_per_host=1, max_connections=2)
+    active = {"total": 0}
+    peak = {"total": 0}
+
+    async def fetch(url):
+        host = url.split("/")[2]
+        async with scheduler.slot(url):
+            for key in (host, "total"):
+                active[key] = active.get(key, 0) + 1
+                peak[key] = max(peak.get(key, 0), active[key])
+            await asyncio.sleep(0.01)
+            for key in (host, "total"):
+                active[key] -= 1
+
+    await asyncio.gather(*[fetch(f"https://host{i % 3}.com/{i}") for i in range(9)])
+
+    assert peak["total"] == 2
+    assert all(peak[f"host{i}.com"] == 1 for i in range(3))
+    # Idle hosts are released
+    assert scheduler._get_hosts() == {}
+
+
+@pytest.mark.asyncio
+async def test_host_scheduler_backoff():
+    scheduler = HostScheduler()
+    scheduler.backoff("https://slow.com/page", retry_after="0.1")
+
+    start = time.monotonic()
+    async with scheduler.slot("https://fast.com/page"):
+        pass
+    assert time.monotonic() - start < 0.1
+
+    async with scheduler.slot("https://slow.com/other"):
+        pass
+    assert time.monotonic() - start >= 0.1
+
+
+@pytest_asyncio.fixture
+async def server(serve):
+    async def page(request):
+        await asyncio.sleep(0.05)
+        return web.Response(text=PAGE, content_type="text/html")
+
+    return await serve({"/{path}": page})
+
+
+@pytest.mark.asyncio
+async def test_sync_run_in_a_thread_leaves_the_running_loop_alone(server):
+    urls = [f"{server}/{i}" for i in range(6)]
+    scraper = Scraper(urls, "ua", "bs")
+    try:
+        session = scraper.engine._get_session()
+        # The worker thread scrapes through the same process-wide engine, on its own loop
+        pages, sync_pages = await asyncio.gather(
+            scraper.scrape(), asyncio.to_thread(Scraper(urls, "ua", "bs").run)
+        )
+        assert len(pages) == len(sync_pages) == 6
+        assert scraper.engine._get_session() is session and not session.closed
+        assert scraper.governor.stats()["connections"]["in_use"] == 0
+    finally:
+        await scraper.engine.close()
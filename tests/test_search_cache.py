@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from gpt_researcher.retrievers.cache import SearchCache
+
+
+def make_retriever(delay=0.0, results=None):
+    calls = []
+
+    class FakeRetriever:
+        def __init__(self, query):
+            self.query = query
+
+        async def asearch(self, max_results=7):
+            calls.append((self.query, max_results))
+            await asyncio.sleep(delay)
+            if results is not None:
+                return results
+            return [{"href": f"https://example.com/{i}", "body": self.query} for i in range(max_results)]
+
+    return FakeRetriever, calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_searches_are_served_from_memory():
+    cache = SearchCache()
+    retriever, calls = make_retriever()
+
+    first = await cache.search(retriever, "Solar  Panels", 3)
+    assert await cache.search(retriever, "solar panels ", 3) == first
+    await cache.search(retriever, "solar panels", 5)
+    assert await cache.search(retriever, "solar panels") == await cache.search(retriever, "solar panels")
+
+    assert calls == [("Solar  Panels", 3), ("solar panels", 5), ("solar panels", 7)]
+    assert cache.stats() == {"hits": 2, "misses": 3, "coalesced": 0, "hit_ratio": 0.4}
+
+    empty, empty_calls = make_retriever(results=[])
+    await cache.search(empty, "nothing", 3)
+    await cache.search(empty, "nothing", 3)
+    assert len(empty_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_call():
+    cache = SearchCache()
+    retriever, calls = make_retriever(delay=0.05)
+
+    results = await asyncio.gather(*[cache.search(retriever, "wind turbines", 3) for _ in range(5)])
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    assert cache.stats()["coalesced"] == 4
+
+    # A follower runs the search itself when the search it joined is cancelled
+    retriever, calls = make_retriever(delay=0.05)
+    leader = asyncio.create_task(cache.search(retriever, "tides", 2))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.search(retriever, "tides", 2))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    assert len(await follower) == 2
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_searches_persist_on_disk_until_they_expire(tmp_path):
+    path = str(tmp_path / "searches.sqlite")
+    retriever, calls = make_retriever()
+    await SearchCache(path=path).search(retriever, "geothermal", 2)
+
+    restarted = SearchCache(path=path)
+    assert len(await restarted.search(retriever, "geothermal", 2)) == 2
+    assert restarted.stats()["hits"] == 1
+    assert len(calls) == 1
+
+    expired = SearchCache(ttl=-1, path=path)
+    await expired.search(retriever, "geothermal", 2)
+    assert len(calls) == 2
@@ -0,0 +1,138 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.actions.query_processing import fuse_snippet_scores
+from gpt_researcher.context.compression import StreamingContextCompressor
+from gpt_researcher.context.prefilter import SnippetPrefilter
+from gpt_researcher.skills.researcher import ResearchConductor
+from gpt_researcher.utils.urls import VisitedUrls
+
+TOPICS = ("solar", "wind", "cooking")
+
+
+class TopicEmbeddings(Embeddings):
+    """Embeds a text as the counts of a few topic words"""
+
+    def __init__(self):
+        self.queries = []
+        self.batches = []
+
+    def _embed(self, text):
+        words = text.lower().split()
+        return [float(words.count(topic)) for topic in TOPICS] + [0.1]
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return self._embed(text)
+
+
+def result(url, body):
+    return {"href": url, "body": body}
+
+
+@pytest.mark.asyncio
+async def test_irrelevant_snippets_are_dropped():
+    embeddings = TopicEmbeddings()
+    results = [
+        result("https://a.com", "solar panels on roofs"),
+        result("https://b.com", "cooking pasta at home"),
+        result("https://c.com", ""),
+        result("https://d.com", "solar and wind farms"),
+    ]
+    kept = await SnippetPrefilter(embeddings, 0.5).filter("solar energy", results)
+
+    assert [r["href"] for r in kept] == ["https://a.com", "https://c.com", "https://d.com"]
+    assert kept[0]["snippet_score"] > kept[2]["snippet_score"]
+    assert "snippet_score" not in kept[1]
+    # All snippets are embedded in a single batch
+    assert len(embeddings.batches) == 1 and len(embeddings.batches[0]) == 3
+
+
+@pytest.mark.asyncio
+async def test_top_k_keeps_the_best_snippets():
+    results = [
+        result("https://a.com", "wind and solar"),
+        result("https://b.com", "cooking pasta at home"),
+        result("https://c.com", ""),
+        result("https://d.com", "solar panels on roofs"),
+    ]
+    kept = await SnippetPrefilter(TopicEmbeddings(), top_k=1).filter("solar energy", results)
+
+    assert [r["href"] for r in kept] == ["https://c.com", "https://d.com"]
+
+
+def test_snippet_scores_join_the_fused_ranking():
+    results = [
+        {"href": "https://a.com", "score": 1 / 61, "snippet_score": 0.2},
+        {"href": "https://b.com", "score": 1 / 62},
+        {"href": "https://c.com", "score": 1 / 63 + 1 / 64, "snippet_score": 0.9},
+    ]
+    ranked = fuse_snippet_scores(results)
+
+    assert [r["href"] for r in ranked] == ["https://c.com", "https://a.com", "https://b.com"]
+    assert ranked[0]["score"] == pytest.approx(1 / 63 + 1 / 64 + 1 / 61)
+    assert ranked[1]["score"] == pytest.approx(1 / 61 + 1 / 62)
+    assert ranked[2] is results[1]
+
+
+@pytest.mark.asyncio
+async def test_sub_query_embedding_is_shared_with_the_compression():
+    embeddings = TopicEmbeddings()
+
+    def make_retriever():
+        class FakeRetriever:
+            def __init__(self, query):
+                self.query = query
+
+            async def asearch(self, max_results=5):
+                return [
+                    result("https://a.com", "cooking recipes"),
+                    result("https://b.com", "solar wind turbines"),
+                    result("https://c.com", "solar cells and solar wind"),
+                ]
+
+        return FakeRetriever
+
+    scraped = []
+
+    async def stream_urls(urls):
+        scraped.extend(urls)
+        for url in urls:
+            yield {"url": url, "raw_content": "solar power " * 20, "title": url}
+
+    researcher = SimpleNamespace(
+        cfg=SimpleNamespace(
+            max_search_results_per_query=5,
+            retriever_timeout=5,
+            search_cache_ttl=0,
+            retriever_weights="",
+            max_scrape_per_query=0,
+            snippet_similarity_threshold=0.5,
+            snippet_top_k=0,
+        ),
+        retrievers=[make_retriever()],
+        visited_urls=VisitedUrls(),
+        verbose=False,
+        add_costs=None,
+        memory=SimpleNamespace(get_embeddings=lambda: embeddings),
+        scraper_manager=SimpleNamespace(stream_urls=stream_urls),
+        vector_store=None,
+    )
+    conductor = ResearchConductor(researcher)
+
+    embedded_query = asyncio.create_task(asyncio.to_thread(embeddings.embed_query, "solar"))
+    context = await StreamingContextCompressor(embeddings).async_get_context(
+        "solar", conductor._stream_data_by_urls("solar", embedded_query), embedded_query=embedded_query
+    )
+
+    # The most relevant snippet is scraped first, the unrelated ones are never scraped
+    assert scraped == ["https://c.com", "https://b.com"]
+    assert "Source: https://c.com" in context
+    assert embeddings.queries == ["solar"]
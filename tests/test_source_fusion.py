@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+from gpt_researcher.actions.query_processing import fuse_search_results
+from gpt_researcher.actions.retriever import get_retriever_weights
+from gpt_researcher.skills.researcher import ResearchConductor
+from gpt_researcher.utils.urls import VisitedUrls
+
+
+def search(retriever, *urls):
+    return {"retriever": retriever, "results": [{"href": url, "body": url} for url in urls]}
+
+
+def test_results_found_by_several_retrievers_rank_first():
+    searches = [
+        search("TavilySearch", "https://a.com", "https://b.com", "https://c.com"),
+        search("BingSearch", "https://c.com/", "https://d.com"),
+    ]
+    fused = fuse_search_results(searches)
+
+    assert [r["href"] for r in fused] == ["https://c.com", "https://a.com", "https://b.com", "https://d.com"]
+    assert fused[0]["retrievers"] == ["TavilySearch", "BingSearch"]
+    assert fused[0]["score"] == pytest.approx(1 / 63 + 1 / 61)
+
+    weighted = fuse_search_results(searches, {"TavilySearch": 0.1})
+    assert [r["href"] for r in weighted][:2] == ["https://c.com", "https://d.com"]
+
+
+def test_retriever_weights_are_parsed_by_name():
+    cfg = SimpleNamespace(retriever_weights="tavily:1, arxiv:0.5")
+    assert get_retriever_weights(cfg) == {"TavilySearch": 1.0, "ArxivSearch": 0.5}
+    assert get_retriever_weights(SimpleNamespace(retriever_weights="")) == {}
+    with pytest.raises(ValueError):
+        get_retriever_weights(SimpleNamespace(retriever_weights="tavily:high"))
+
+
+def test_invalid_retriever_weights_fail_when_the_researcher_is_created():
+    for weights in ("tavly:1", "tavily:high"):
+        researcher = SimpleNamespace(cfg=SimpleNamespace(retriever_weights=weights))
+        with pytest.raises(ValueError):
+            ResearchConductor(researcher)
+
+
+def make_retriever(name, urls):
+    class FakeRetriever:
+        def __init__(self, query):
+            self.query = query
+
+        async def asearch(self, max_results=5):
+            return [{"href": url, "body": self.query} for url in urls[:max_results]]
+
+    FakeRetriever.__name__ = name
+    return FakeRetriever
+
+
+@pytest.mark.asyncio
+async def test_only_the_best_new_urls_are_scraped():
+    cfg = SimpleNamespace(
+        max_search_results_per_query=5,
+        retriever_timeout=5,
+        search_cache_ttl=0,
+        retriever_weights="",
+        max_scrape_per_query=3,
+        snippet_similarity_threshold=0,
+        snippet_top_k=0,
+    )
+    researcher = SimpleNamespace(
+        cfg=cfg,
+        retrievers=[
+            make_retriever("TavilySearch", ["https://a.com", "https://b.com", "https://c.com", "https://e.com"]),
+            make_retriever("BingSearch", ["https://c.com", "https://a.com", "https://d.com"]),
+        ],
+        visited_urls=VisitedUrls(["http://www.a.com/"]),
+        verbose=False,
+    )
+    urls = await ResearchConductor(researcher)._search_relevant_source_urls("query")
+
+    assert urls == ["https://c.com", "https://b.com", "https://d.com"]
+    # URLs beyond the cap are left for other sub-queries
+    assert "https://e.com" not in researcher.visited_urls
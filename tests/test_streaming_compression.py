@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from gpt_researcher.context.compression import StreamingContextCompressor
+from gpt_researcher.scraper.scraper import Scraper
+
+
+class KeywordEmbeddings:
+    """Embeds texts on whether they mention the research topic"""
+
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0] if "solar" in text else [0.0, 1.0] for text in texts]
+
+
+def make_page(i, text):
+    return {"url": f"https://site{i}.com", "title": f"Page {i}", "raw_content": text}
+
+
+async def page_stream(pages, consumed):
+    try:
+        for page in pages:
+            await asyncio.sleep(0)
+            consumed.append(page["url"])
+            yield page
+    finally:
+        consumed.append("closed")
+
+
+@pytest.mark.asyncio
+async def test_streaming_compressor_filters_relevant_chunks():
+    consumed = []
+    pages = [make_page(0, "solar panels are efficient"), make_page(1, "cooking recipes"), make_page(2, "solar farms")]
+    compressor = StreamingContextCompressor(embeddings=KeywordEmbeddings())
+
+    context = await compressor.async_get_context("solar", page_stream(pages, consumed), max_results=10)
+
+    assert "Source: https://site0.com" in context
+    assert "Source: https://site2.com" in context
+    assert "site1.com" not in context
+    assert len(compressor.documents) == 3
+
+
+@pytest.mark.asyncio
+async def test_streaming_compressor_stops_with_enough_content():
+    consumed = []
+    pages = [make_page(i, f"solar fact {i}") for i in range(5)]
+    compressor = StreamingContextCompressor(embeddings=KeywordEmbeddings(), enough_chunks=2)
+
+    context = await compressor.async_get_context("solar", page_stream(pages, consumed), max_results=10)
+
+    assert consumed == ["https://site0.com", "https://site1.com", "closed"]
+    assert context.count("Source:") == 2
+
+
+@pytest.mark.asyncio
+async def test_scraper_stream_yields_in_completion_order_and_cancels():
+    delays = {"https://slow.com": 10, "https://fast.com": 0, "https://medium.com": 0.01}
+    cancelled = []
+
+    async def extract_data_from_url(link, session):
+        try:
+            await asyncio.sleep(delays[link])
+        except asyncio.CancelledError:
+            cancelled.append(link)
+            raise
+        return {"url": link, "raw_content": "content", "image_urls": [], "title": ""}
+
+    scraper = Scraper(list(delays), "ua", "bs")
+    scraper.extract_data_from_url = extract_data_from_url
+
+    seen = []
+    stream = scraper.stream()
+    async for page in stream:
+        seen.append(page["url"])
+        if len(seen) == 2:
+            break
+    await stream.aclose()
+
+    assert seen == ["https://fast.com", "https://medium.com"]
+    assert cancelled == ["https://slow.com"]
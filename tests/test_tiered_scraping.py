@@ -0,0 +1,22 @@
+from gpt_researcher.scraper.tiered import EscalationTracker, looks_like_js_shell
+
+
+def test_looks_like_js_shell():
+    shell = b'<html><body><noscript>Please enable JavaScript</noscript><div id="root"></div></body></html>'
+    assert looks_like_js_shell(shell, "Please enable JavaScript")
+    assert looks_like_js_shell(b'<html><body><div id="__next"> </div></body></html>', "x" * 200)
+
+    article = b"<html><body><article>" + b"Plain server rendered text. " * 100 + b"</article></body></html>"
+    assert not looks_like_js_shell(article, "Plain server rendered text. " * 100)
+
+
+def test_escalation_tracker_skips_js_only_domains():
+    tracker = EscalationTracker(min_attempts=3, skip_ratio=0.8)
+    for _ in range(3):
+        tracker.record("https://spa.example.com/page", escalated=True)
+        tracker.record("https://static.example.com/page", escalated=False)
+
+    assert tracker.should_skip_http("https://spa.example.com/other")
+    assert not tracker.should_skip_http("https://static.example.com/other")
+    assert not tracker.should_skip_http("https://new.example.com/")
+    assert tracker.stats()["spa.example.com"] == {"attempts": 3, "escalations": 3, "rate": 1.0}
@@ -0,0 +1,45 @@
+import pytest
+
+from gpt_researcher.actions.markdown_processing import add_references
+from gpt_researcher.utils.urls import VisitedUrls, canonicalize_url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://example.com/article",
+        "https://www.example.com/article/",
+        "https://EXAMPLE.com:443/article#comments",
+        "https://example.com/article?utm_source=newsletter&utm_medium=email",
+        "https://example.com/article?fbclid=abc123",
+    ],
+)
+def test_variants_share_a_canonical_form(url):
+    assert canonicalize_url(url) == "https://example.com/article"
+
+
+def test_meaningful_differences_are_kept():
+    assert canonicalize_url("https://example.com/search?b=2&a=1") == canonicalize_url("https://example.com/search?a=1&b=2")
+    assert canonicalize_url("https://example.com/search?q=1") != canonicalize_url("https://example.com/search?q=2")
+    assert canonicalize_url("https://example.com/Article") != canonicalize_url("https://example.com/article")
+    assert canonicalize_url("https://example.com:8080/") == "https://example.com:8080/"
+    assert canonicalize_url("http://[::1]:8000/a/") == "https://[::1]:8000/a"
+    assert canonicalize_url("./my-docs/report.pdf") == "./my-docs/report.pdf"
+
+
+def test_visited_urls_keep_the_first_original():
+    visited = VisitedUrls(["https://www.example.com/article?utm_source=x"])
+    assert "http://example.com/article/" in visited
+    visited.add("https://example.com/article")
+    visited.add("https://other.com/page")
+
+    assert len(visited) == 2
+    assert visited.originals() == ["https://www.example.com/article?utm_source=x", "https://other.com/page"]
+
+    merged = VisitedUrls(["https://other.com/page#top"])
+    merged.update(visited)
+    assert merged.originals() == ["https://other.com/page#top", "https://www.example.com/article?utm_source=x"]
+
+    report = add_references("Report", visited)
+    assert "- [https://www.example.com/article?utm_source=x](https://www.example.com/article?utm_source=x)" in report
+    assert "https://example.com/article)" not in report